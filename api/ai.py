@@ -1,31 +1,39 @@
 # ai.py
-import openai
-import os
-from dotenv import load_dotenv
+from django.conf import settings
 
-load_dotenv()
 
-openai.api_key = os.getenv("OPENAI_API_KEY")  # Make sure your env var is set
+def ai_configured():
+    return bool(settings.OPENAI_API_KEY)
 
-def suggest_task_for_user(user):
-    prompt = [
-        {"role": "system", "content": "You are a helpful productivity assistant."},
-        {
-            "role": "user",
-            "content": f"Suggest a short, meaningful productivity task for a user named {user.username}."
-        }
-    ]
 
-    try:
-        response = openai.ChatCompletion.create(
-            model="gpt-3.5-turbo",  # or "gpt-4" if you have access
-            messages=prompt,
-            max_tokens=60,
-            temperature=0.7,
-        )
-        suggestion = response.choices[0].message.content.strip()
-        return suggestion
+def request_suggestion(user):
+    """
+    Ask the LLM for a short productivity task for `user`. Raises on any error;
+    the call gives up after AI_SUGGESTION_TIMEOUT seconds and is never retried
+    here, callers decide what to do instead.
+    """
+    # The SDK takes about half a second to import; only Celery workers pay for it.
+    from openai import OpenAI
 
-    except Exception as e:
-        # You can log the error here if you want
-        return "Plan your day wisely."
+    client = OpenAI(
+        api_key=settings.OPENAI_API_KEY,
+        base_url=settings.OPENAI_BASE_URL,
+        timeout=settings.AI_SUGGESTION_TIMEOUT,
+        max_retries=0,
+    )
+    response = client.chat.completions.create(
+        model=settings.AI_SUGGESTION_MODEL,
+        messages=[
+            {"role": "system", "content": "You are a helpful productivity assistant."},
+            {
+                "role": "user",
+                "content": f"Suggest a short, meaningful productivity task for a user named {user.username}."
+            },
+        ],
+        max_tokens=60,
+        temperature=0.7,
+    )
+    suggestion = (response.choices[0].message.content or '').strip()
+    if not suggestion:
+        raise ValueError("Empty AI suggestion")
+    return suggestion
@@ -0,0 +1,103 @@
+# api/authentication.py
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+USER_KEY = 'auth:user:{user_id}'
+
+
+def _cached_fields():
+    # The password hash stays out of the cache unless tokens are checked against
+    # it; otherwise it is deferred and loaded on the rare request that needs it.
+    return [
+        field.attname for field in get_user_model()._meta.concrete_fields
+        if field.attname != 'password' or api_settings.CHECK_REVOKE_TOKEN
+    ]
+
+
+def cached_user(user_id):
+    """The cached user for a token's user id claim, or None."""
+    if settings.AUTH_USER_CACHE_TTL <= 0:
+        return None
+    values = cache.get(USER_KEY.format(user_id=user_id))
+    if values is None:
+        return None
+    fields = _cached_fields()
+    if len(values) != len(fields):
+        return None
+    return get_user_model().from_db(DEFAULT_DB_ALIAS, fields, values)
+
+
+def cache_user(user):
+    if settings.AUTH_USER_CACHE_TTL <= 0:
+        return
+    cache.set(
+        USER_KEY.format(user_id=getattr(user, api_settings.USER_ID_FIELD)),
+        tuple(getattr(user, attname) for attname in _cached_fields()),
+        timeout=settings.AUTH_USER_CACHE_TTL,
+    )
+
+
+def invalidate_user(user):
+    """Forget a user's cached row, now and again once the current transaction commits."""
+    key = USER_KEY.format(user_id=getattr(user, api_settings.USER_ID_FIELD))
+    cache.delete(key)
+    # A request may re-cache the old row before the write commits.
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(lambda: cache.delete(key))
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that resolves the token's user from the cache, so an
+    authenticated request costs no query until the view needs one. Entries live
+    AUTH_USER_CACHE_TTL seconds and are dropped whenever the user row is saved
+    or deleted (password changes and resets, profile updates, deactivation).
+    That drop only reaches other workers through a shared cache, so the TTL
+    defaults to 0, meaning no caching, without one.
+    """
+
+    def get_user(self, validated_token):
+        user_id = self.user_id(validated_token)
+        user = cached_user(user_id)
+        if user is None:
+            user = super().get_user(validated_token)
+            cache_user(user)
+            return user
+        self.check_user(user, validated_token)
+        return user
+
+    async def aget_user(self, validated_token):
+        """get_user() for async views; a cache miss is read through the async ORM."""
+        user_id = self.user_id(validated_token)
+        user = cached_user(user_id)
+        if user is None:
+            try:
+                user = await self.user_model.objects.aget(**{api_settings.USER_ID_FIELD: user_id})
+            except self.user_model.DoesNotExist:
+                raise AuthenticationFailed(_("User not found"), code="user_not_found")
+            self.check_user(user, validated_token)
+            cache_user(user)
+            return user
+        self.check_user(user, validated_token)
+        return user
+
+    def user_id(self, validated_token):
+        try:
+            return validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+    def check_user(self, user, validated_token):
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        if api_settings.CHECK_REVOKE_TOKEN and validated_token.get(
+            api_settings.REVOKE_TOKEN_CLAIM
+        ) != get_md5_hash_password(user.password):
+            raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
@@ -0,0 +1,123 @@
+# api/bulk.py
+from django.db import transaction
+from django.db.models import prefetch_related_objects
+from django.utils import timezone
+from rest_framework import status
+
+from . import dashboard_cache, events, rollups, watermarks
+from .models import AppWebsite, Category, Project, Task
+from .serializers import TaskSerializer
+
+BULK_BATCH_SIZE = 500
+
+RELATED_MODELS = {
+    'category': Category,
+    'app_website': AppWebsite,
+    'project': Project,
+}
+
+
+def preload_related_objects(user, items):
+    """{model: {pk: obj}} of the user's objects referenced by `items`, one query per model."""
+    related_objects = {}
+    for field, model in RELATED_MODELS.items():
+        ids = set()
+        for item in items:
+            try:
+                ids.add(int(item[field]))
+            except (KeyError, TypeError, ValueError):
+                continue
+        related_objects[model] = model.objects.filter(user=user).in_bulk(ids) if ids else {}
+    return related_objects
+
+
+def apply_task_operations(user, operations, context):
+    """
+    Validate every create, update and delete of a batch together and, if all
+    are valid, apply them in one transaction with bulk_create/bulk_update.
+
+    Returns (results, None) on success or (None, errors), where errors mirrors
+    the request with one entry per item ({} for items without errors).
+    """
+    creates, updates, deletes = operations['create'], operations['update'], operations['delete']
+    context = dict(context, related_objects=preload_related_objects(user, creates + updates))
+
+    tasks = Task.objects.filter(user=user).prefetch_related('subtasks').in_bulk(
+        [item['id'] for item in updates] + deletes
+    )
+
+    create_serializer = TaskSerializer(data=creates, many=True, context=context)
+    create_serializer.is_valid()
+    errors = {'create': create_serializer.errors or [{} for _ in creates], 'update': [], 'delete': []}
+
+    update_serializers = []
+    for item in updates:
+        instance = tasks.get(item['id'])
+        if instance is None:
+            errors['update'].append({'id': ['Not found.']})
+            continue
+        data = {key: value for key, value in item.items() if key != 'id'}
+        serializer = TaskSerializer(instance, data=data, partial=True, context=context)
+        errors['update'].append({} if serializer.is_valid() else serializer.errors)
+        update_serializers.append(serializer)
+
+    errors['delete'] = [{} if pk in tasks else {'id': ['Not found.']} for pk in deletes]
+
+    if any(any(item_errors) for item_errors in errors.values()):
+        return None, errors
+
+    with transaction.atomic(), rollups.deferred():
+        created = Task.objects.bulk_create(
+            [Task(user=user, **validated_data) for validated_data in create_serializer.validated_data],
+            batch_size=BULK_BATCH_SIZE,
+        )
+
+        # Signals do not fire for bulk writes, so the rollups are updated from
+        # snapshots of every task before and after the batch.
+        changes = [(None, rollups.snapshot(task)) for task in created]
+
+        updated = []
+        update_fields = {'updated_at'}
+        now = timezone.now()
+        for serializer in update_serializers:
+            instance = serializer.instance
+            before = rollups.snapshot(instance)
+            for attr, value in serializer.validated_data.items():
+                setattr(instance, attr, value)
+                update_fields.add(attr)
+            # bulk_update() skips auto_now, so stamp updated_at ourselves.
+            instance.updated_at = now
+            updated.append(instance)
+            changes.append((before, rollups.snapshot(instance)))
+        if updated:
+            Task.objects.bulk_update(updated, sorted(update_fields), batch_size=BULK_BATCH_SIZE)
+
+        if deletes:
+            changes += [(rollups.snapshot(tasks[pk]), None) for pk in set(deletes)]
+            Task.objects.filter(user=user, pk__in=deletes).delete()
+
+        rollups.apply_changes(user.pk, changes)
+        dashboard_cache.invalidate([user.pk])
+        watermarks.bump([user.pk], watermarks.TASKS)
+        events.publish(user.pk, 'tasks.changed', {
+            'created': [task.pk for task in created],
+            'updated': [task.pk for task in updated],
+            'deleted': deletes,
+        })
+
+    prefetch_related_objects(created, 'subtasks')
+    results = [
+        {'op': 'create', 'index': index, 'id': task.pk, 'status': status.HTTP_201_CREATED,
+         'data': TaskSerializer(task, context=context).data}
+        for index, task in enumerate(created)
+    ]
+    results += [
+        {'op': 'update', 'index': index, 'id': task.pk, 'status': status.HTTP_200_OK,
+         'data': TaskSerializer(task, context=context).data}
+        for index, task in enumerate(updated)
+    ]
+    results += [
+        {'op': 'delete', 'index': index, 'id': pk, 'status': status.HTTP_204_NO_CONTENT}
+        for index, pk in enumerate(deletes)
+    ]
+    return results, None
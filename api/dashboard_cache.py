@@ -0,0 +1,167 @@
+# api/dashboard_cache.py
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+# A user's cached dashboards are keyed by their version counter (and a global
+# one for all-user rebuilds), so bumping a counter orphans every old entry
+# without having to find and delete it.
+VERSION_KEY = 'dashboard:version:{user_id}'
+GLOBAL_VERSION_KEY = 'dashboard:version:all'
+PAYLOAD_KEY = 'dashboard:payload:{user_id}:{day}:{global_version}:{version}'
+AI_INSIGHT_KEY = 'dashboard:ai:{user_id}:{day}'
+# Past days' metric buckets have their own counters, moved only by writes that
+# reach back before today, so everyday task edits leave them cached.
+HISTORY_VERSION_KEY = 'dashboard:history-version:{user_id}'
+GLOBAL_HISTORY_VERSION_KEY = 'dashboard:history-version:all'
+HISTORY_KEY = 'dashboard:history:{user_id}:{start}:{end}:{granularity}:{global_version}:{version}'
+STATS_KEY = 'dashboard:stats:{name}'
+
+
+def _incr(key):
+    # A counter evicted from the cache restarts from the clock rather than 1,
+    # so it can never come back to a version that old entries were stored under.
+    try:
+        return cache.incr(key)
+    except ValueError:
+        cache.add(key, time.time_ns(), timeout=None)
+        return cache.incr(key)
+
+
+def _version(key):
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def invalidate(user_ids=None):
+    """Drop the cached dashboards of `user_ids`, or of every user if None."""
+    if user_ids is None:
+        _incr(GLOBAL_VERSION_KEY)
+        return
+    for user_id in user_ids:
+        _incr(VERSION_KEY.format(user_id=user_id))
+
+
+def _record(name):
+    try:
+        cache.incr(STATS_KEY.format(name=name))
+    except ValueError:
+        if not cache.add(STATS_KEY.format(name=name), 1, timeout=None):
+            cache.incr(STATS_KEY.format(name=name))
+
+
+def stats():
+    """Hit and miss counts of the dashboard payload cache."""
+    return {
+        name: cache.get(STATS_KEY.format(name=name), 0)
+        for name in ('hits', 'misses', 'ai_hits', 'ai_misses', 'history_hits', 'history_misses')
+    }
+
+
+def _payload_key(user_id, day):
+    return PAYLOAD_KEY.format(
+        user_id=user_id,
+        day=day.isoformat(),
+        global_version=_version(GLOBAL_VERSION_KEY),
+        version=_version(VERSION_KEY.format(user_id=user_id)),
+    )
+
+
+def _cached(key, hit, miss):
+    value = cache.get(key)
+    _record(hit if value is not None else miss)
+    return value
+
+
+def cached_payload(user_id, day, build):
+    """The dashboard payload of a user and day, from cache or from build()."""
+    key = _payload_key(user_id, day)
+    payload = _cached(key, 'hits', 'misses')
+    if payload is None:
+        payload = build()
+        cache.set(key, payload, timeout=settings.DASHBOARD_CACHE_TTL)
+    return payload
+
+
+async def acached_payload(user_id, day, build):
+    """cached_payload() for async views, where build() is a coroutine function."""
+    key = _payload_key(user_id, day)
+    payload = _cached(key, 'hits', 'misses')
+    if payload is None:
+        payload = await build()
+        cache.set(key, payload, timeout=settings.DASHBOARD_CACHE_TTL)
+    return payload
+
+
+def cached_ai_insight(user_id, day, build):
+    """
+    The AI insight of a user and day. It is not tied to the user's version, so
+    task edits refresh the numbers without asking the AI again; it only expires
+    after DASHBOARD_AI_CACHE_TTL.
+    """
+    key = AI_INSIGHT_KEY.format(user_id=user_id, day=day.isoformat())
+    insight = _cached(key, 'ai_hits', 'ai_misses')
+    if insight is None:
+        insight, cacheable = build()
+        if cacheable:
+            cache.set(key, insight, timeout=settings.DASHBOARD_AI_CACHE_TTL)
+    return insight
+
+
+async def acached_ai_insight(user_id, day, build):
+    key = AI_INSIGHT_KEY.format(user_id=user_id, day=day.isoformat())
+    insight = _cached(key, 'ai_hits', 'ai_misses')
+    if insight is None:
+        insight, cacheable = await build()
+        if cacheable:
+            cache.set(key, insight, timeout=settings.DASHBOARD_AI_CACHE_TTL)
+    return insight
+
+
+def invalidate_ai_insight(user_id, day):
+    """Drop a user's cached AI insight for `day`, e.g. once a fresh suggestion is ready."""
+    cache.delete(AI_INSIGHT_KEY.format(user_id=user_id, day=day.isoformat()))
+
+
+def invalidate_history(user_ids=None):
+    """
+    Drop the cached past-day buckets of `user_ids` (every user if None), now and
+    again once the current transaction commits.
+    """
+    keys = [GLOBAL_HISTORY_VERSION_KEY] if user_ids is None else [
+        HISTORY_VERSION_KEY.format(user_id=user_id) for user_id in user_ids
+    ]
+
+    def bump():
+        for key in keys:
+            _incr(key)
+
+    bump()
+    # A request may rebuild the buckets from the old rows before the commit.
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(bump)
+
+
+def cached_history(user_id, start, end, granularity, build):
+    """
+    Metric buckets of days before today, from cache or from build(). They are
+    kept DASHBOARD_HISTORY_CACHE_TTL seconds unless invalidate_history() runs.
+    """
+    key = HISTORY_KEY.format(
+        user_id=user_id,
+        start=start.isoformat(),
+        end=end.isoformat(),
+        granularity=granularity,
+        global_version=_version(GLOBAL_HISTORY_VERSION_KEY),
+        version=_version(HISTORY_VERSION_KEY.format(user_id=user_id)),
+    )
+    rows = _cached(key, 'history_hits', 'history_misses')
+    if rows is None:
+        rows = build()
+        cache.set(key, rows, timeout=settings.DASHBOARD_HISTORY_CACHE_TTL)
+    return rows
@@ -0,0 +1,34 @@
+# api/db_pool.py
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# psycopg_pool counter names, as reported by pool_stats().
+STAT_NAMES = {
+    'requests_num': 'requests',
+    'requests_queued': 'waits',
+    'requests_wait_ms': 'wait_ms',
+    'requests_errors': 'timeouts',
+    'connections_num': 'connections_opened',
+    'connections_errors': 'connection_errors',
+    'connections_lost': 'connections_lost',
+    'returns_bad': 'returned_bad',
+}
+
+
+def pool_stats(alias=DEFAULT_DB_ALIAS):
+    """
+    Connection pool metrics of this process for `alias`, or None when the
+    database is not pooled. Counters run from the pool's start.
+    """
+    pool = getattr(connections[alias], 'pool', None)
+    if pool is None:
+        return None
+    stats = pool.get_stats()
+    return {
+        'min_size': stats['pool_min'],
+        'max_size': stats['pool_max'],
+        'size': stats['pool_size'],
+        'idle': stats['pool_available'],
+        'in_use': stats['pool_size'] - stats['pool_available'],
+        'waiting': stats['requests_waiting'],
+        **{name: stats.get(key, 0) for key, name in STAT_NAMES.items()},
+    }
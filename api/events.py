@@ -0,0 +1,156 @@
+# api/events.py
+import asyncio
+import json
+import logging
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+from . import renderers
+
+logger = logging.getLogger(__name__)
+
+
+class InProcessEventBus:
+    """
+    Per-user pub/sub inside one process. Subscribers are asyncio queues read by
+    the event stream; publish() may be called from any thread (sync views,
+    signal handlers) and hands events to each subscriber's loop.
+    """
+
+    def __init__(self, queue_size=100):
+        self.queue_size = queue_size
+        self._subscribers = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def publish(self, user_id, event):
+        with self._lock:
+            subscribers = list(self._subscribers.get(user_id, ()))
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(self._deliver, queue, event)
+            except RuntimeError:
+                # The subscriber's loop has closed; its subscription is going away.
+                pass
+
+    def _deliver(self, queue, event):
+        try:
+            queue.put_nowait(event)
+        except asyncio.QueueFull:
+            logger.warning("Dropping event for a slow event stream subscriber")
+
+    async def subscribe(self, user_id):
+        """Async iterator of the user's events until the consumer stops."""
+        subscriber = (asyncio.get_running_loop(), asyncio.Queue(maxsize=self.queue_size))
+        with self._lock:
+            self._subscribers[user_id].add(subscriber)
+        try:
+            while True:
+                yield await subscriber[1].get()
+        finally:
+            with self._lock:
+                self._subscribers[user_id].discard(subscriber)
+                if not self._subscribers[user_id]:
+                    del self._subscribers[user_id]
+
+
+class RedisEventBus:
+    """Pub/sub over Redis channels, so events reach streams in every worker process."""
+
+    channel = 'events:user:{user_id}'
+
+    def __init__(self, url=None):
+        import redis
+
+        self.url = url or settings.EVENT_BUS_REDIS_URL
+        self.client = redis.Redis.from_url(self.url)
+
+    def publish(self, user_id, event):
+        self.client.publish(self.channel.format(user_id=user_id), renderers.dumps(event))
+
+    async def subscribe(self, user_id):
+        import redis.asyncio
+
+        client = redis.asyncio.Redis.from_url(self.url)
+        pubsub = client.pubsub()
+        await pubsub.subscribe(self.channel.format(user_id=user_id))
+        try:
+            async for message in pubsub.listen():
+                if message['type'] == 'message':
+                    yield json.loads(message['data'])
+        finally:
+            await pubsub.unsubscribe()
+            await pubsub.aclose()
+            await client.aclose()
+
+
+_bus = None
+_bus_lock = threading.Lock()
+
+
+def get_bus():
+    """The EVENT_BUS_BACKEND instance of this process."""
+    global _bus
+    with _bus_lock:
+        if _bus is None:
+            _bus = import_string(settings.EVENT_BUS_BACKEND)()
+        return _bus
+
+
+def set_bus(bus):
+    """Replace the bus (e.g. with a local stand-in in tests); returns the previous one."""
+    global _bus
+    with _bus_lock:
+        previous, _bus = _bus, bus
+    return previous
+
+
+def publish(user_id, event_type, data):
+    """Publish an event to `user_id`'s streams once the current transaction commits."""
+    event = {'type': event_type, 'data': data}
+
+    def send():
+        try:
+            get_bus().publish(user_id, event)
+        except Exception as e:
+            # Push is best effort; clients still catch up through the REST endpoints.
+            logger.error(f"Error publishing {event_type} event: {e}", exc_info=True)
+
+    transaction.on_commit(send)
+
+
+def format_sse(event):
+    return f"event: {event['type']}\ndata: {renderers.dumps(event['data']).decode()}\n\n"
+
+
+async def stream(user_id, keepalive=None):
+    """
+    Server-sent events for one user: every published event, plus a comment
+    line after `keepalive` idle seconds so proxies keep the connection open.
+    """
+    keepalive = keepalive or settings.EVENT_STREAM_KEEPALIVE
+    subscription = get_bus().subscribe(user_id).__aiter__()
+    # The pending read survives keep-alive timeouts; cancelling it would end the subscription.
+    next_event = None
+    try:
+        yield 'retry: 5000\n\n'
+        while True:
+            if next_event is None:
+                next_event = asyncio.ensure_future(subscription.__anext__())
+            done, _ = await asyncio.wait({next_event}, timeout=keepalive)
+            if not done:
+                yield ': keep-alive\n\n'
+                continue
+            event, next_event = next_event.result(), None
+            yield format_sse(event)
+    finally:
+        if next_event is not None:
+            next_event.cancel()
+            try:
+                await next_event
+            except (asyncio.CancelledError, StopAsyncIteration):
+                pass
+        await subscription.aclose()
@@ -0,0 +1,69 @@
+# api/fieldsets.py
+from django.core.exceptions import FieldDoesNotExist
+
+FIELDS_PARAM = 'fields'
+OMIT_PARAM = 'omit'
+
+
+def _names(value):
+    return frozenset(name.strip() for name in value.split(',') if name.strip()) if value else frozenset()
+
+
+def keeps(context, name):
+    """Whether serializer field `name` is in the fieldset recorded in `context`."""
+    fields = context.get('fields')
+    return (fields is None or name in fields) and name not in context.get('omit', ())
+
+
+class SparseFieldsetSerializerMixin:
+    """Serializes only the fields kept by the view's ?fields= / ?omit= (see SparseFieldsetMixin)."""
+
+    def get_fields(self):
+        return {name: field for name, field in super().get_fields().items() if keeps(self.context, name)}
+
+
+class SparseFieldsetMixin:
+    """
+    ?fields=id,title keeps only those fields in list and retrieve responses and
+    ?omit=description drops some. The queryset then loads only the columns
+    behind the kept fields; views skip prefetches of dropped relations via
+    serializes().
+    """
+    sparse_actions = ('list', 'retrieve')
+
+    def get_fieldset(self):
+        """(fields, omit) of the request; fields is None when every field is wanted."""
+        if self.action not in self.sparse_actions:
+            return None, frozenset()
+        fields = _names(self.request.query_params.get(FIELDS_PARAM))
+        return fields or None, _names(self.request.query_params.get(OMIT_PARAM))
+
+    def serializes(self, name):
+        fields, omit = self.get_fieldset()
+        return keeps({'fields': fields, 'omit': omit}, name)
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['fields'], context['omit'] = self.get_fieldset()
+        return context
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.get_fieldset() == (None, frozenset()):
+            return queryset
+        columns = self.get_columns(queryset.model)
+        return queryset if columns is None else queryset.only(*columns)
+
+    def get_columns(self, model):
+        """Model fields behind the kept serializer fields, or None if one is not a plain model field."""
+        columns = [model._meta.pk.name]
+        for field in self.get_serializer().fields.values():
+            if not field.source_attrs:
+                return None  # source='*' reads the whole object
+            try:
+                model_field = model._meta.get_field(field.source_attrs[0])
+            except FieldDoesNotExist:
+                return None
+            if model_field.concrete:
+                columns.append(model_field.name)
+        return columns
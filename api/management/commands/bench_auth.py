@@ -0,0 +1,62 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api.authentication import CachedJWTAuthentication
+from api.views import DashboardMetricsView, TaskViewSet
+
+AUTHENTICATORS = (('database', JWTAuthentication), ('cached', CachedJWTAuthentication))
+
+
+class Command(BaseCommand):
+    help = 'Compares requests per second of JWT authentication with and without the user cache'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=2000, help='Requests per endpoint and authenticator.')
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        user, _ = User.objects.get_or_create(username='bench-auth')
+        factory = APIRequestFactory()
+        headers = {'HTTP_AUTHORIZATION': f'Bearer {AccessToken.for_user(user)}'}
+        cache.clear()
+
+        # A conditional GET answered with 304 and a cached dashboard: after
+        # authentication, neither needs the database.
+        etag = self.view(TaskViewSet, JWTAuthentication, {'get': 'list'})(
+            factory.get('/api/tasks/', **headers)
+        )['ETag']
+        endpoints = (
+            ('tasks 304', TaskViewSet, {'get': 'list'}, lambda: factory.get(
+                '/api/tasks/', HTTP_IF_NONE_MATCH=etag, **headers,
+            )),
+            ('dashboard', DashboardMetricsView, None, lambda: factory.get('/api/dashboard-metrics/', **headers)),
+        )
+
+        self.stdout.write(f"{connection.vendor}: {options['requests']} requests per row")
+        self.stdout.write(f"{'endpoint':<12} {'auth':<10} {'req/s':>9} {'queries/req':>12}")
+        for name, view_class, actions, make_request in endpoints:
+            for auth_name, authenticator in AUTHENTICATORS:
+                view = self.view(view_class, authenticator, actions)
+                view(make_request())  # warm the caches
+                with CaptureQueriesContext(connection) as queries:
+                    started = time.perf_counter()
+                    for _ in range(options['requests']):
+                        view(make_request())
+                    elapsed = time.perf_counter() - started
+                self.stdout.write(
+                    f"{name:<12} {auth_name:<10} {options['requests'] / elapsed:>9.0f} "
+                    f"{len(queries) / options['requests']:>12.2f}"
+                )
+
+    def view(self, view_class, authenticator, actions):
+        if actions:
+            return view_class.as_view(actions, authentication_classes=[authenticator])
+        return view_class.as_view(authentication_classes=[authenticator])
@@ -0,0 +1,85 @@
+import random
+import statistics
+import time
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.utils import timezone
+
+from api import recurrence
+from api.models import Task, TaskOccurrence
+
+PATTERNS = ('DAILY', 'WEEKLY', 'MONTHLY', 'YEARLY')
+
+
+class Command(BaseCommand):
+    help = 'Times expanding recurring tasks into occurrences over a date window'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tasks', type=int, default=10000, help='Recurring tasks to seed for the benchmark user.')
+        parser.add_argument('--days', type=int, default=365, help='Width of the expanded window.')
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument(
+            '--pattern', choices=PATTERNS,
+            help='Give every seeded task this pattern (default: a mix, mostly DAILY).',
+        )
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        user = self.seed_user(options['tasks'], options['pattern'], rng)
+        start = timezone.localdate()
+        end = start + timedelta(days=options['days'] - 1)
+        tasks = Task.objects.filter(user=user)
+
+        timings = []
+        occurrences = []
+        for _ in range(options['repeat']):
+            started = time.perf_counter()
+            occurrences = recurrence.expand(tasks, start, end)
+            timings.append((time.perf_counter() - started) * 1000)
+
+        self.stdout.write(
+            f"{connection.vendor}: {options['tasks']} recurring tasks, {options['days']}-day window, "
+            f"{len(occurrences)} occurrences"
+        )
+        self.stdout.write(f"{'p50 ms':>9} {'max ms':>9} {'us/occurrence':>14}")
+        median = statistics.median(timings)
+        self.stdout.write(
+            f"{median:>9.1f} {max(timings):>9.1f} {median * 1000 / max(1, len(occurrences)):>14.3f}"
+        )
+
+    def seed_user(self, total, pattern, rng):
+        User = get_user_model()
+        user, created = User.objects.get_or_create(username=f'bench-recurrence-{total}-{pattern or "mixed"}')
+        if created:
+            today = timezone.localdate()
+            tasks = Task.objects.bulk_create(
+                (
+                    Task(
+                        user=user,
+                        title=f'Recurring task {i}',
+                        priority=rng.choice((1, 2, 3)),
+                        due_date=today - timedelta(days=rng.randint(0, 365)),
+                        recurrence_pattern=pattern or rng.choices(PATTERNS, weights=(6, 2, 1, 1))[0],
+                        recurrence_end_date=rng.choice((None, today + timedelta(days=rng.randint(30, 730)))),
+                    )
+                    for i in range(total)
+                ),
+                batch_size=5000,
+            )
+            # A few completions so exceptions are part of the timed reads.
+            TaskOccurrence.objects.bulk_create(
+                (
+                    TaskOccurrence(task=task, date=task.due_date, status='DONE')
+                    for task in rng.sample(tasks, min(len(tasks), total // 10))
+                ),
+                batch_size=5000,
+            )
+            if connection.vendor == 'postgresql':
+                with connection.cursor() as cursor:
+                    cursor.execute('ANALYZE api_task')
+                    cursor.execute('ANALYZE api_taskoccurrence')
+        return user
@@ -0,0 +1,61 @@
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from api.models import Category, Subtask, Task
+from api.renderers import MessagePackRenderer, ORJSONRenderer
+from api.serializers import TaskSerializer
+
+RENDERERS = (
+    ('stdlib json', JSONRenderer),
+    ('orjson', ORJSONRenderer),
+    ('msgpack', MessagePackRenderer),
+)
+
+
+class Command(BaseCommand):
+    help = 'Compares bytes and CPU time of rendering task list pages with each API renderer'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tasks', type=int, default=1000, help='Tasks per page.')
+        parser.add_argument('--repeat', type=int, default=20, help='Renders per renderer.')
+
+    def handle(self, *args, **options):
+        tasks = self.seed_user(options['tasks'])
+        page = {'count': len(tasks), 'next': None, 'previous': None}
+
+        self.stdout.write(f"{len(tasks)} tasks per page, {options['repeat']} runs, CPU ms (median)")
+        self.stdout.write(f"{'renderer':<12} {'bytes':>9} {'serialize':>10} {'render':>8} {'total':>8}")
+        for name, renderer_class in RENDERERS:
+            renderer = renderer_class()
+            serialize_ms, render_ms = [], []
+            for _ in range(options['repeat']):
+                started = time.process_time()
+                data = {**page, 'results': TaskSerializer(tasks, many=True, context={'expand': []}).data}
+                serialized = time.process_time()
+                body = renderer.render(data)
+                serialize_ms.append((serialized - started) * 1000)
+                render_ms.append((time.process_time() - serialized) * 1000)
+            serialize, render = statistics.median(serialize_ms), statistics.median(render_ms)
+            self.stdout.write(f"{name:<12} {len(body):>9} {serialize:>10.1f} {render:>8.1f} {serialize + render:>8.1f}")
+
+    def seed_user(self, total):
+        user, created = get_user_model().objects.get_or_create(username=f'bench-renderers-{total}')
+        if created:
+            category = Category.objects.create(user=user, name='Work')
+            today = timezone.localdate()
+            Task.objects.bulk_create(
+                Task(
+                    user=user, title=f'Task {i}', description='Write up the findings and share them with the team.',
+                    due_date=today, priority=i % 3 + 1, category=category,
+                )
+                for i in range(total)
+            )
+            Subtask.objects.bulk_create(
+                Subtask(task=task, title=f'Step {n}') for task in Task.objects.filter(user=user) for n in range(2)
+            )
+        return list(Task.objects.filter(user=user).prefetch_related('subtasks').order_by('id'))
@@ -0,0 +1,88 @@
+import random
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.models import Q
+
+from api.models import Task
+from api.search import search_tasks
+
+WORDS = (
+    'review project proposal presentation client follow up code refactoring blog '
+    'research tool team sync meeting documentation marketing campaign data analysis '
+    'report feedback bug fixing onboarding feature sprint planning manual beta market '
+    'design mockup database query unit tests security audit financial support triage '
+    'legal contract environment content calendar social newsletter competitor budget'
+).split()
+
+
+class Command(BaseCommand):
+    help = 'Compares task search latency of the full-text path against icontains'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tasks', type=int, default=100000, help='Tasks to seed for the benchmark user.')
+        parser.add_argument('--repeat', type=int, default=20, help='Runs per query and path.')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument(
+            '--query', dest='queries', action='append',
+            help='Search string to time (can be repeated).',
+        )
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        user = self.seed_user(options['tasks'], rng)
+        queries = options['queries'] or ['meeting', 'secur', 'budget report', 'onboarding plan']
+        tasks = Task.objects.filter(user=user)
+
+        self.stdout.write(f"{connection.vendor}: {options['tasks']} tasks, {options['repeat']} runs per query")
+        self.stdout.write(f"{'query':<20} {'path':<10} {'matches':>8} {'p50 ms':>9} {'p95 ms':>9}")
+        for query in queries:
+            paths = (
+                ('icontains', tasks.filter(Q(title__icontains=query) | Q(description__icontains=query))
+                    .order_by('due_date', 'priority', '-created_at')),
+                ('fulltext', search_tasks(tasks, query).order_by('-search_rank', 'due_date')),
+            )
+            for name, queryset in paths:
+                timings, matches = self.time_page(queryset, options['repeat'])
+                self.stdout.write(
+                    f"{query:<20} {name:<10} {matches:>8} "
+                    f"{statistics.median(timings):>9.2f} {self.percentile(timings, 95):>9.2f}"
+                )
+
+    def seed_user(self, total, rng):
+        User = get_user_model()
+        user, created = User.objects.get_or_create(username=f'bench-search-{total}')
+        if created:
+            batch = []
+            for i in range(total):
+                batch.append(Task(
+                    user=user,
+                    title=' '.join(rng.choices(WORDS, k=4)).capitalize(),
+                    description=' '.join(rng.choices(WORDS, k=rng.randint(10, 60))),
+                ))
+                if len(batch) == 5000:
+                    Task.objects.bulk_create(batch)
+                    batch = []
+            Task.objects.bulk_create(batch)
+            if connection.vendor == 'postgresql':
+                with connection.cursor() as cursor:
+                    cursor.execute('ANALYZE api_task')
+        return user
+
+    def time_page(self, queryset, repeat, page_size=20):
+        """Time what a search request costs: the count plus the first page."""
+        timings = []
+        matches = 0
+        for _ in range(repeat):
+            start = time.perf_counter()
+            matches = queryset.count()
+            list(queryset[:page_size])
+            timings.append((time.perf_counter() - start) * 1000)
+        return timings, matches
+
+    def percentile(self, values, percent):
+        ordered = sorted(values)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * percent / 100))]
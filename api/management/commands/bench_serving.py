@@ -0,0 +1,169 @@
+import http.client
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api.models import Task
+
+# (server, views): the same app under sync gunicorn workers and under Uvicorn
+# workers, the latter with the DRF views and with their async versions.
+MODES = {
+    'wsgi': (['backend.wsgi:application'], 'sync'),
+    'asgi-sync': (['backend.asgi:application', '--worker-class', 'uvicorn.workers.UvicornWorker'], 'sync'),
+    'asgi': (['backend.asgi:application', '--worker-class', 'uvicorn.workers.UvicornWorker'], 'async'),
+}
+ENDPOINTS = {
+    'dashboard': {'sync': '/api/dashboard-metrics/', 'async': '/api/async/dashboard-metrics/'},
+    'list': {'sync': '/api/tasks/?page_size=20&expand=category', 'async': '/api/async/tasks/?page_size=20&expand=category'},
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Serves the app under WSGI and ASGI workers and compares p50/p99 latency and memory per '
+        'in-flight request under concurrent dashboard and task list reads. Point it at PostgreSQL '
+        'and run with DEBUG=True (no HTTPS redirect).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--modes', default=','.join(MODES), help=f"Comma-separated, from {', '.join(MODES)}.")
+        parser.add_argument('--endpoints', default=','.join(ENDPOINTS), help=f"Comma-separated, from {', '.join(ENDPOINTS)}.")
+        parser.add_argument('--workers', type=int, default=2, help='Server worker processes.')
+        parser.add_argument('--concurrency', type=int, default=32, help='Concurrent clients.')
+        parser.add_argument('--requests', type=int, default=20, help='Requests per client.')
+        parser.add_argument('--tasks', type=int, default=200, help='Tasks of the benchmark user.')
+        parser.add_argument('--port', type=int, default=8765)
+
+    def handle(self, *args, **options):
+        modes = options['modes'].split(',')
+        endpoints = options['endpoints'].split(',')
+        unknown = set(modes) - set(MODES) | set(endpoints) - set(ENDPOINTS)
+        if unknown:
+            raise CommandError(f"Unknown mode or endpoint: {', '.join(sorted(unknown))}")
+
+        user, _ = get_user_model().objects.get_or_create(username='bench-serving')
+        missing = options['tasks'] - Task.objects.filter(user=user).count()
+        Task.objects.bulk_create(
+            Task(user=user, title=f'Bench task {i}', priority=i % 3 + 1) for i in range(max(missing, 0))
+        )
+        self.token = str(AccessToken.for_user(user))
+        self.host = next((host for host in settings.ALLOWED_HOSTS if host and host != '*'), 'localhost').lstrip('.')
+
+        self.stdout.write(
+            f"{options['workers']} workers, {options['concurrency']} clients x {options['requests']} requests"
+        )
+        self.stdout.write(
+            f"{'mode':<10} {'endpoint':<10} {'req/s':>7} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7} "
+            f"{'in-flight':>9} {'peak MB':>8} {'MB/in-flight':>13}"
+        )
+        for mode in modes:
+            server = self.start(mode, options)
+            try:
+                for endpoint in endpoints:
+                    self.report(mode, endpoint, server, options)
+            finally:
+                server.terminate()
+                server.wait()
+
+    def start(self, mode, options):
+        target, _ = MODES[mode]
+        server = subprocess.Popen(
+            [sys.executable, '-m', 'gunicorn', *target, '--workers', str(options['workers']),
+             '--bind', f"127.0.0.1:{options['port']}", '--log-level', 'warning'],
+            cwd=settings.BASE_DIR,
+        )
+        for _ in range(100):
+            try:
+                socket.create_connection(('127.0.0.1', options['port']), timeout=1).close()
+                return server
+            except OSError:
+                if server.poll() is not None:
+                    raise CommandError(f'{mode} server exited with {server.returncode}')
+                time.sleep(0.1)
+        server.terminate()
+        raise CommandError(f'{mode} server did not start')
+
+    def report(self, mode, endpoint, server, options):
+        path = ENDPOINTS[endpoint][MODES[mode][1]]
+        # Warm every worker: imports, connections and the dashboard cache.
+        self.load(path, options['concurrency'], 2, options['port'])
+
+        peak = [self.rss(server.pid)]
+        done = threading.Event()
+
+        def sample():
+            while not done.wait(0.02):
+                peak[0] = max(peak[0], self.rss(server.pid))
+
+        sampler = threading.Thread(target=sample)
+        sampler.start()
+        started = time.perf_counter()
+        latencies, errors = self.load(path, options['concurrency'], options['requests'], options['port'])
+        elapsed = time.perf_counter() - started
+        done.set()
+        sampler.join()
+
+        # A sync worker holds one request at a time and the rest wait in the
+        # listen queue; Uvicorn workers accept every client's request.
+        in_flight = min(options['workers'], options['concurrency']) if mode == 'wsgi' else options['concurrency']
+        latencies = sorted(latencies) or [0]
+        self.stdout.write(
+            f"{mode:<10} {endpoint:<10} {len(latencies) / elapsed:>7.0f} {statistics.median(latencies):>8.1f} "
+            f"{latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]:>8.1f} {errors:>7} "
+            f"{in_flight:>9} {peak[0] / 1024:>8.1f} {peak[0] / 1024 / in_flight:>13.2f}"
+        )
+
+    def load(self, path, concurrency, requests, port):
+        latencies = []
+        errors = [0]
+        lock = threading.Lock()
+        headers = {'Authorization': f'Bearer {self.token}', 'Host': self.host}
+
+        def client():
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+            for _ in range(requests):
+                started = time.perf_counter()
+                try:
+                    connection.request('GET', path, headers=headers)
+                    response = connection.getresponse()
+                    response.read()
+                    ok = response.status == 200
+                except (OSError, http.client.HTTPException):
+                    connection.close()
+                    ok = False
+                with lock:
+                    if ok:
+                        latencies.append((time.perf_counter() - started) * 1000)
+                    else:
+                        errors[0] += 1
+            connection.close()
+
+        clients = [threading.Thread(target=client) for _ in range(concurrency)]
+        for thread in clients:
+            thread.start()
+        for thread in clients:
+            thread.join()
+        return latencies, errors[0]
+
+    def rss(self, pid):
+        """Resident set size in kB of a process and its children."""
+        total = 0
+        pending = [pid]
+        while pending:
+            pid = pending.pop()
+            try:
+                with open(f'/proc/{pid}/status') as status:
+                    total += next(int(line.split()[1]) for line in status if line.startswith('VmRSS:'))
+                with open(f'/proc/{pid}/task/{pid}/children') as children:
+                    pending += [int(child) for child in children.read().split()]
+            except (OSError, StopIteration):
+                continue
+        return total
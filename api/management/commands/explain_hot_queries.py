@@ -0,0 +1,42 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from api import query_plans
+
+
+class Command(BaseCommand):
+    help = 'Runs EXPLAIN on the task list and dashboard queries and checks they use indexes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', dest='user_id', type=int, help='Explain the queries of this user id.')
+        parser.add_argument(
+            '--seed-tasks', type=int, default=0,
+            help='Bulk-create this many tasks (e.g. 1000000) before explaining.',
+        )
+        parser.add_argument('--seed-users', type=int, default=100, help='Users to spread seeded tasks over.')
+        parser.add_argument('--show-plans', action='store_true', help='Print every query plan.')
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        if options['seed_tasks']:
+            self.stdout.write(f"Seeding {options['seed_tasks']} tasks over {options['seed_users']} users...")
+            user = query_plans.seed_tasks(options['seed_tasks'], users=options['seed_users'])[0]
+        elif options['user_id']:
+            user = User.objects.get(pk=options['user_id'])
+        else:
+            user = User.objects.filter(tasks__isnull=False).first()
+            if user is None:
+                raise CommandError('No tasks to explain. Pass --seed-tasks to create some.')
+
+        failures = []
+        for name, plan, uses_index in query_plans.explain_hot_queries(user):
+            if uses_index:
+                self.stdout.write(self.style.SUCCESS(f'[index] {name}'))
+            else:
+                failures.append(name)
+                self.stdout.write(self.style.ERROR(f'[scan]  {name}'))
+            if options['show_plans'] or not uses_index:
+                self.stdout.write(plan)
+
+        if failures:
+            raise CommandError(f"Queries not using an index: {', '.join(failures)}")
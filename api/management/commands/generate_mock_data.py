@@ -0,0 +1,66 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from api.mock_data import MockDataGenerator
+
+
+class Command(BaseCommand):
+    help = 'Generates users with tasks, subtasks, categories, projects, apps and notifications for load testing'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1, help='Number of new users to create.')
+        parser.add_argument('--tasks-per-user', type=int, default=45)
+        parser.add_argument(
+            '--user', dest='user_id', type=int,
+            help='Add tasks to this existing user id instead of creating users.',
+        )
+        parser.add_argument('--seed', type=int, default=0, help='Random seed; the same seed and --chunk-size give the same data.')
+        parser.add_argument('--chunk-size', type=int, default=5000, help='Rows per bulk_create batch. Changing it changes the generated data.')
+        parser.add_argument('--done-ratio', type=float, default=0.5, help='Share of tasks that are DONE.')
+        parser.add_argument('--overdue-ratio', type=float, default=0.2, help='Share of pending tasks that are overdue.')
+        parser.add_argument('--recurring-ratio', type=float, default=0.1, help='Share of tasks that recur.')
+        parser.add_argument('--max-subtasks', type=int, default=4, help='Subtasks per task are drawn from 0..N.')
+        parser.add_argument('--categories-per-user', type=int, default=4)
+        parser.add_argument('--apps-per-user', type=int, default=4)
+        parser.add_argument('--projects-per-user', type=int, default=3)
+        parser.add_argument('--notifications-per-user', type=int, default=10, help='Average notifications per user.')
+        parser.add_argument('--history-days', type=int, default=30, help='Tasks are created over the last N days.')
+        parser.add_argument('--horizon-days', type=int, default=60, help='Future due dates fall within N days.')
+
+    def handle(self, *args, **options):
+        for name in ('done_ratio', 'overdue_ratio', 'recurring_ratio'):
+            if not 0 <= options[name] <= 1:
+                raise CommandError(f"--{name.replace('_', '-')} must be between 0 and 1.")
+        if options['chunk_size'] < 1:
+            raise CommandError('--chunk-size must be at least 1.')
+
+        existing_user = None
+        if options['user_id']:
+            User = get_user_model()
+            try:
+                existing_user = User.objects.get(pk=options['user_id'])
+            except User.DoesNotExist:
+                raise CommandError(f"User {options['user_id']} does not exist.")
+
+        generator = MockDataGenerator(
+            users=options['users'],
+            tasks_per_user=options['tasks_per_user'],
+            seed=options['seed'],
+            chunk_size=options['chunk_size'],
+            done_ratio=options['done_ratio'],
+            overdue_ratio=options['overdue_ratio'],
+            recurring_ratio=options['recurring_ratio'],
+            max_subtasks=options['max_subtasks'],
+            categories_per_user=options['categories_per_user'],
+            apps_per_user=options['apps_per_user'],
+            projects_per_user=options['projects_per_user'],
+            notifications_per_user=options['notifications_per_user'],
+            history_days=options['history_days'],
+            horizon_days=options['horizon_days'],
+            existing_user=existing_user,
+            log=self.stdout.write,
+        )
+        counts = generator.run()
+        seconds = counts.pop('seconds')
+        summary = ', '.join(f'{count} {name}' for name, count in counts.items())
+        self.stdout.write(self.style.SUCCESS(f"Created {summary} in {seconds}s."))
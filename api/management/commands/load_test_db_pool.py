@@ -0,0 +1,80 @@
+import statistics
+import threading
+import time
+from collections import Counter
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError, connection, connections
+
+from api import db_pool
+
+
+class Command(BaseCommand):
+    help = (
+        'Drives more concurrent queries than the connection pool holds and reports '
+        'latency, pool waits and timeouts. Size the pool with DB_POOL_MAX_SIZE and '
+        'DB_POOL_TIMEOUT; run it against PostgreSQL.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, help='Concurrent clients (default: twice the pool size).')
+        parser.add_argument('--requests', type=int, default=20, help='Queries per client.')
+        parser.add_argument('--hold-ms', type=int, default=100, help='How long each query keeps its connection.')
+
+    def handle(self, *args, **options):
+        before = db_pool.pool_stats()
+        if before is None:
+            raise CommandError('The default database is not pooled (PostgreSQL with DB_POOL_MAX_SIZE > 0 needed).')
+        threads = options['threads'] or before['max_size'] * 2
+        hold = options['hold_ms'] / 1000
+
+        latencies = []
+        errors = Counter()
+        lock = threading.Lock()
+
+        def client():
+            for _ in range(options['requests']):
+                started = time.perf_counter()
+                try:
+                    with connection.cursor() as cursor:
+                        cursor.execute('SELECT pg_sleep(%s)', [hold])
+                except DatabaseError as e:
+                    with lock:
+                        errors[type(e.__cause__ or e).__name__] += 1
+                else:
+                    with lock:
+                        latencies.append((time.perf_counter() - started) * 1000)
+                finally:
+                    # Hand the connection back to the pool, as the end of a request does.
+                    connection.close()
+            connections.close_all()
+
+        workers = [threading.Thread(target=client) for _ in range(threads)]
+        started = time.perf_counter()
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        elapsed = time.perf_counter() - started
+
+        after = db_pool.pool_stats()
+        self.stdout.write(
+            f"pool max {after['max_size']} (min {after['min_size']}), {threads} clients x "
+            f"{options['requests']} queries holding {options['hold_ms']} ms"
+        )
+        self.stdout.write(f"{'ok':>6} {'failed':>7} {'qps':>7} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8}")
+        ok = len(latencies)
+        latencies = latencies or [0]
+        self.stdout.write(
+            f"{ok:>6} {sum(errors.values()):>7} {ok / elapsed:>7.1f} "
+            f"{statistics.median(latencies):>8.1f} {self.percentile(latencies, 95):>8.1f} {max(latencies):>8.1f}"
+        )
+        for name, count in errors.most_common():
+            self.stdout.write(f"  {name}: {count}")
+        self.stdout.write('pool counters during the run:')
+        for name in ('requests', 'waits', 'wait_ms', 'timeouts', 'connections_opened', 'connection_errors'):
+            self.stdout.write(f"  {name:<20} {after[name] - before[name]:>8}")
+
+    def percentile(self, values, percent):
+        ordered = sorted(values)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * percent / 100))]
@@ -0,0 +1,96 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Runs in a fresh interpreter so nothing is imported yet. The WSGI
+# application is built the way gunicorn builds it and then serves one request,
+# which is when the URLconf, views and serializers are first imported.
+CHILD = '''
+import io, json, sys, time
+started = time.perf_counter()
+from django.core.wsgi import get_wsgi_application
+application = get_wsgi_application()
+ready = time.perf_counter()
+status = []
+environ = {
+    'REQUEST_METHOD': 'GET', 'PATH_INFO': sys.argv[1], 'QUERY_STRING': '',
+    'SERVER_NAME': sys.argv[2], 'SERVER_PORT': '443', 'HTTP_HOST': sys.argv[2],
+    'wsgi.url_scheme': 'https', 'wsgi.input': io.BytesIO(), 'wsgi.errors': sys.stderr,
+}
+body = b''.join(application(environ, lambda code, headers, exc_info=None: status.append(code)))
+done = time.perf_counter()
+print(json.dumps({
+    'status': status[0], 'setup_ms': (ready - started) * 1000, 'first_request_ms': (done - ready) * 1000,
+    'finished_at': time.time(),
+}))
+'''
+
+
+class Command(BaseCommand):
+    help = 'Reports cold-start import time per module and time to the first request'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', default='/api/hello/', help='Path of the first request.')
+        parser.add_argument('--runs', type=int, default=3, help='Cold starts to time; the digest is from the last.')
+        parser.add_argument('--top', type=int, default=15, help='Rows per digest table.')
+
+    def handle(self, *args, **options):
+        host = next((host for host in settings.ALLOWED_HOSTS if host and host != '*'), 'localhost').lstrip('.')
+        env = {**os.environ, 'DJANGO_SETTINGS_MODULE': os.environ.get('DJANGO_SETTINGS_MODULE', 'backend.settings')}
+
+        runs = []
+        for _ in range(options['runs']):
+            spawned = time.time()
+            child = subprocess.run(
+                [sys.executable, '-X', 'importtime', '-c', CHILD, options['path'], host],
+                capture_output=True, text=True, env=env, cwd=settings.BASE_DIR,
+            )
+            if child.returncode != 0:
+                raise CommandError(child.stderr.strip().splitlines()[-1] if child.stderr.strip() else 'Startup failed')
+            result = json.loads(child.stdout.strip().splitlines()[-1])
+            result['total_ms'] = (result['finished_at'] - spawned) * 1000
+            runs.append((result, child.stderr))
+
+        imports = self.parse_importtime(runs[-1][1])
+        self.report_imports(imports, options['top'])
+
+        self.stdout.write(f"\nCold starts ({options['runs']} runs, median), first request GET {options['path']} "
+                          f"-> {runs[-1][0]['status']}")
+        for key, label in (
+            ('setup_ms', 'settings + django.setup() + WSGI app'),
+            ('first_request_ms', 'first request (URLconf, views)'),
+            ('total_ms', 'process spawn to first response'),
+        ):
+            self.stdout.write(f"{label:<40} {statistics.median(result[key] for result, _ in runs):>9.1f} ms")
+
+    def parse_importtime(self, stderr):
+        """(module, self us, cumulative us, depth) for each `-X importtime` line."""
+        imports = []
+        for line in stderr.splitlines():
+            if not line.startswith('import time:') or 'self [us]' in line:
+                continue
+            own, cumulative, name = line[len('import time:'):].split('|')
+            imports.append((name.strip(), int(own), int(cumulative), (len(name) - len(name.lstrip())) // 2))
+        return imports
+
+    def report_imports(self, imports, top):
+        total = sum(own for _, own, _, _ in imports)
+        self.stdout.write(f"{len(imports)} modules imported in {total / 1000:.1f} ms")
+
+        packages = defaultdict(int)
+        for name, own, _, _ in imports:
+            packages[name.split('.')[0]] += own
+        self.stdout.write(f"\n{'package':<40} {'ms':>9}")
+        for package, own in sorted(packages.items(), key=lambda item: -item[1])[:top]:
+            self.stdout.write(f"{package:<40} {own / 1000:>9.1f}")
+
+        self.stdout.write(f"\n{'module (cumulative)':<40} {'ms':>9}")
+        for name, _, cumulative, depth in sorted(imports, key=lambda item: -item[2])[:top]:
+            self.stdout.write(f"{name[:40]:<40} {cumulative / 1000:>9.1f}")
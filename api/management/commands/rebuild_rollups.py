@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from api import rollups
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the daily task rollups used by the dashboard from the Task table'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--user', dest='user_ids', type=int, action='append',
+            help='Only rebuild rollups for this user id (can be repeated).',
+        )
+
+    def handle(self, *args, **options):
+        count = rollups.rebuild(user_ids=options['user_ids'])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {count} rollup rows."))
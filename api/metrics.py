@@ -0,0 +1,253 @@
+# api/metrics.py
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.db.models import Count, DateField, F, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce, Trunc
+from django.utils import timezone
+
+from . import rollups
+from .models import DailyTaskRollup, Subtask, Task
+
+# Categories whose completed minutes count towards work hours.
+WORK_CATEGORY_NAMES = ('Work', 'Focus')
+FOCUS_CATEGORY_NAME = 'Focus'
+
+
+def day_bounds(day):
+    """Aware [start, end) datetimes of `day` in the current time zone."""
+    start = timezone.make_aware(datetime.combine(day, time.min))
+    return start, start + timedelta(days=1)
+
+
+def completed_between(start_day, end_day):
+    """
+    Q for DONE tasks last updated between two days (inclusive), written as a
+    range on updated_at so it can use an index instead of a date cast.
+    """
+    start, _ = day_bounds(start_day)
+    _, end = day_bounds(end_day)
+    return Q(status='DONE', updated_at__gte=start, updated_at__lt=end)
+
+
+def status_count_expressions(today):
+    return {
+        'total': Count('id'),
+        'done': Count('id', filter=Q(status='DONE')),
+        'pending': Count('id', filter=Q(status='PENDING')),
+        'overdue': Count('id', filter=Q(status='PENDING', due_date__lt=today)),
+    }
+
+
+def task_status_counts(tasks, today):
+    """Total, done, pending and overdue counts of a Task queryset in one query."""
+    return tasks.aggregate(**status_count_expressions(today))
+
+
+def task_status_counts_by_user(tasks, today):
+    """{user_id: task_status_counts} for every user with tasks in `tasks`, in one grouped query."""
+    rows = tasks.values('user_id').annotate(**status_count_expressions(today)).order_by()
+    return {row.pop('user_id'): row for row in rows}
+
+
+def _subtask_count(**filters):
+    subtasks = Subtask.objects.filter(task__project=OuterRef('pk'), **filters)
+    return Coalesce(Subquery(subtasks.values('task__project').annotate(n=Count('id')).values('n').order_by()), 0)
+
+
+def project_stats_expressions(today):
+    """
+    Annotations of a Project queryset with its tasks' status counts, total and
+    remaining minutes and subtask counts, so every project's stats come in the
+    same query as the projects. Subtasks are counted in subqueries so they do
+    not multiply the task rows being summed.
+    """
+    done = Q(tasks_project__status='DONE')
+    return {
+        'total_tasks': Count('tasks_project'),
+        'done_tasks': Count('tasks_project', filter=done),
+        'pending_tasks': Count('tasks_project', filter=Q(tasks_project__status='PENDING')),
+        'overdue_tasks': Count(
+            'tasks_project', filter=Q(tasks_project__status='PENDING', tasks_project__due_date__lt=today),
+        ),
+        'total_minutes': Coalesce(Sum('tasks_project__duration_minutes'), 0),
+        'remaining_minutes': Coalesce(Sum('tasks_project__duration_minutes', filter=~done), 0),
+        'total_subtasks': _subtask_count(),
+        'done_subtasks': _subtask_count(completed=True),
+    }
+
+
+def project_stats(project):
+    """Stats of a project annotated with project_stats_expressions()."""
+    stats = {name: getattr(project, name) for name in (
+        'total_tasks', 'done_tasks', 'pending_tasks', 'overdue_tasks',
+        'total_minutes', 'remaining_minutes', 'total_subtasks', 'done_subtasks',
+    )}
+    stats['progress'] = round(stats['done_tasks'] * 100 / stats['total_tasks']) if stats['total_tasks'] else 0
+    stats['subtask_completion'] = (
+        round(stats['done_subtasks'] / stats['total_subtasks'], 4) if stats['total_subtasks'] else None
+    )
+    return stats
+
+
+def empty_summary():
+    return {
+        'work_minutes_today': 0,
+        'work_minutes_yesterday': 0,
+        'focus_minutes_today': 0,
+        'minutes_by_category': {},
+        'minutes_by_app': {},
+        'tasks_due_today': 0,
+    }
+
+
+def rollup_summary(user, today):
+    """Dashboard summary read from the precomputed daily rollups (one query)."""
+    yesterday = today - timedelta(days=1)
+    return summarize_rollup_rows(rollups.dashboard_rows(user, [today, yesterday]), today)
+
+
+async def arollup_summary(user, today):
+    yesterday = today - timedelta(days=1)
+    rows = [row async for row in rollups.dashboard_rows(user, [today, yesterday])]
+    return summarize_rollup_rows(rows, today)
+
+
+def summarize_rollup_rows(rows, today):
+    summary = empty_summary()
+    for row in rows:
+        category_name = row['category__name']
+        minutes = row['completed_minutes']
+        if category_name in WORK_CATEGORY_NAMES:
+            key = 'work_minutes_today' if row['date'] == today else 'work_minutes_yesterday'
+            summary[key] += minutes
+        if row['date'] != today:
+            continue
+        summary['tasks_due_today'] += row['due_pending_count']
+        if category_name == FOCUS_CATEGORY_NAME:
+            summary['focus_minutes_today'] += minutes
+        if category_name and minutes:
+            by_category = summary['minutes_by_category']
+            by_category[category_name] = by_category.get(category_name, 0) + minutes
+        app_name = row['app_website__name']
+        if app_name and minutes:
+            by_app = summary['minutes_by_app']
+            by_app[app_name] = by_app.get(app_name, 0) + minutes
+    return summary
+
+
+def live_summary(user, today):
+    """
+    Dashboard summary computed from the Task table: one conditional aggregate
+    for the headline numbers plus one group-by each for categories and apps.
+    """
+    tasks, totals, by_category, by_app = live_queries(user, today)
+    summary = tasks.aggregate(**totals)
+    summary['minutes_by_category'] = dict(by_category)
+    summary['minutes_by_app'] = dict(by_app)
+    return summary
+
+
+async def alive_summary(user, today):
+    tasks, totals, by_category, by_app = live_queries(user, today)
+    summary = await tasks.aaggregate(**totals)
+    summary['minutes_by_category'] = {name: minutes async for name, minutes in by_category}
+    summary['minutes_by_app'] = {name: minutes async for name, minutes in by_app}
+    return summary
+
+
+def live_queries(user, today):
+    """(tasks, totals aggregate, minutes-by-category rows, minutes-by-app rows) behind live_summary."""
+    yesterday = today - timedelta(days=1)
+    done_today = completed_between(today, today)
+    done_yesterday = completed_between(yesterday, yesterday)
+    work = Q(category__name__in=WORK_CATEGORY_NAMES)
+    due_today = Q(status='PENDING', due_date=today)
+
+    tasks = Task.objects.filter(user=user)
+    totals = {
+        'work_minutes_today': Coalesce(Sum('duration_minutes', filter=done_today & work), 0),
+        'work_minutes_yesterday': Coalesce(Sum('duration_minutes', filter=done_yesterday & work), 0),
+        'focus_minutes_today': Coalesce(
+            Sum('duration_minutes', filter=done_today & Q(category__name=FOCUS_CATEGORY_NAME)), 0
+        ),
+        'tasks_due_today': Count('id', filter=due_today),
+    }
+
+    completed_today = tasks.filter(done_today, duration_minutes__gt=0)
+    by_category = completed_today.filter(category__isnull=False).values_list('category__name').annotate(
+        minutes=Sum('duration_minutes')
+    ).order_by()
+    by_app = completed_today.filter(app_website__isnull=False).values_list('app_website__name').annotate(
+        minutes=Sum('duration_minutes')
+    ).order_by()
+    return tasks.filter(completed_between(yesterday, today) | due_today), totals, by_category, by_app
+
+
+def rollup_bucket_rows(user, start, end, kind):
+    """
+    [(bucket, category name, app name, minutes, completed, due pending)] of the
+    user's rollups in [start, end], grouped into `kind` buckets in one query.
+    """
+    bucket = F('date') if kind == 'day' else Trunc('date', kind)
+    rows = DailyTaskRollup.objects.filter(user=user, date__range=(start, end)).filter(
+        Q(completed_count__gt=0) | Q(due_pending_count__gt=0)
+    ).annotate(bucket=bucket).values('bucket', 'category__name', 'app_website__name').annotate(
+        minutes=Sum('completed_minutes'),
+        completed=Sum('completed_count'),
+        due_pending=Sum('due_pending_count'),
+    ).order_by()
+    return [
+        (row['bucket'], row['category__name'], row['app_website__name'],
+         row['minutes'], row['completed'], row['due_pending'])
+        for row in rows
+    ]
+
+
+def live_bucket_rows(user, start, end, kind):
+    """rollup_bucket_rows() computed from the Task table: one group-by for completions, one for due tasks."""
+    tasks = Task.objects.filter(user=user)
+    completed = tasks.filter(completed_between(start, end)).annotate(
+        bucket=Trunc('updated_at', kind, output_field=DateField()),
+    ).values('bucket', 'category__name', 'app_website__name').annotate(
+        minutes=Coalesce(Sum('duration_minutes'), 0),
+        completed=Count('id'),
+    ).order_by()
+    due = tasks.filter(status='PENDING', due_date__range=(start, end)).annotate(
+        bucket=F('due_date') if kind == 'day' else Trunc('due_date', kind),
+    ).values('bucket', 'category__name', 'app_website__name').annotate(due_pending=Count('id')).order_by()
+    return [
+        (row['bucket'], row['category__name'], row['app_website__name'], row['minutes'], row['completed'], 0)
+        for row in completed
+    ] + [
+        (row['bucket'], row['category__name'], row['app_website__name'], 0, 0, row['due_pending'])
+        for row in due
+    ]
+
+
+def uses_live_source():
+    return getattr(settings, 'DASHBOARD_METRICS_SOURCE', 'rollups') == 'live'
+
+
+def dashboard_summary(user, today):
+    """
+    Summary numbers behind DashboardMetricsView, from the rollups by default or
+    straight from the Task table when DASHBOARD_METRICS_SOURCE is 'live'.
+    """
+    if uses_live_source():
+        return live_summary(user, today)
+    return rollup_summary(user, today)
+
+
+async def adashboard_summary(user, today):
+    """dashboard_summary() read through the async ORM."""
+    if uses_live_source():
+        return await alive_summary(user, today)
+    return await arollup_summary(user, today)
+
+
+def bucket_rows(user, start, end, kind):
+    """The dashboard's period buckets, from the same source as dashboard_summary()."""
+    if uses_live_source():
+        return live_bucket_rows(user, start, end, kind)
+    return rollup_bucket_rows(user, start, end, kind)
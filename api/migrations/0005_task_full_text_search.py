@@ -0,0 +1,79 @@
+# Full-text search over Task.title and Task.description.
+#
+# PostgreSQL gets a GIN index on the weighted tsvector expression used by
+# api.search, so Postgres maintains it on every write. SQLite (local
+# development) gets an external-content FTS5 table kept in sync by triggers;
+# SQLite drops those triggers whenever a later migration rebuilds api_task,
+# so such migrations must re-create them.
+# Other databases fall back to icontains and need nothing here.
+
+from django.db import migrations
+
+INDEX_NAME = 'task_search_gin_idx'
+
+SQLITE_FTS_SQL = [
+    "CREATE VIRTUAL TABLE api_task_fts USING fts5("
+    "title, description, content='api_task', content_rowid='id', tokenize='porter unicode61')",
+    "CREATE TRIGGER api_task_fts_insert AFTER INSERT ON api_task BEGIN "
+    "INSERT INTO api_task_fts(rowid, title, description) VALUES (new.id, new.title, new.description); END",
+    "CREATE TRIGGER api_task_fts_delete AFTER DELETE ON api_task BEGIN "
+    "INSERT INTO api_task_fts(api_task_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); END",
+    "CREATE TRIGGER api_task_fts_update AFTER UPDATE OF title, description ON api_task BEGIN "
+    "INSERT INTO api_task_fts(api_task_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); "
+    "INSERT INTO api_task_fts(rowid, title, description) VALUES (new.id, new.title, new.description); END",
+    "INSERT INTO api_task_fts(api_task_fts) VALUES ('rebuild')",
+]
+
+SQLITE_FTS_REVERSE_SQL = [
+    "DROP TRIGGER IF EXISTS api_task_fts_insert",
+    "DROP TRIGGER IF EXISTS api_task_fts_delete",
+    "DROP TRIGGER IF EXISTS api_task_fts_update",
+    "DROP TABLE IF EXISTS api_task_fts",
+]
+
+
+def search_index(apps):
+    from django.contrib.postgres.indexes import GinIndex
+    from django.contrib.postgres.search import SearchVector
+
+    # Must stay identical to api.search.task_search_vector() for the index to be used.
+    vector = (
+        SearchVector('title', weight='A', config='english')
+        + SearchVector('description', weight='B', config='english')
+    )
+    return GinIndex(vector, name=INDEX_NAME)
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.add_index(apps.get_model('api', 'Task'), search_index(apps))
+    elif vendor == 'sqlite':
+        with schema_editor.connection.cursor() as cursor:
+            cursor.execute("PRAGMA compile_options")
+            if 'ENABLE_FTS5' not in {row[0] for row in cursor.fetchall()}:
+                return
+        for statement in SQLITE_FTS_SQL:
+            schema_editor.execute(statement)
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.remove_index(apps.get_model('api', 'Task'), search_index(apps))
+    elif vendor == 'sqlite':
+        for statement in SQLITE_FTS_REVERSE_SQL:
+            schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_task_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.5 on 2026-10-17 17:37
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0006_notification_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskOccurrence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('status', models.CharField(choices=[('DONE', 'Done'), ('SKIPPED', 'Skipped')], max_length=10)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['date'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('recurrence_pattern', 'NONE'), _negated=True), fields=['user', 'due_date', 'recurrence_end_date'], name='task_recurring_series_idx'),
+        ),
+        migrations.AddField(
+            model_name='taskoccurrence',
+            name='task',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='occurrences', to='api.task'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='taskoccurrence',
+            unique_together={('task', 'date')},
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.5 on 2026-10-17 18:53
+
+import django.db.models.functions.comparison
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def merge_duplicate_buckets(apps, schema_editor):
+    """Fold rows sharing a bucket key into one, so the unique constraint can be added."""
+    DailyTaskRollup = apps.get_model('api', 'DailyTaskRollup')
+    key = ('user_id', 'date', 'category_id', 'app_website_id')
+    duplicates = DailyTaskRollup.objects.values(*key).annotate(
+        rows=Count('id'),
+        minutes=Sum('completed_minutes'),
+        completed=Sum('completed_count'),
+        due_pending=Sum('due_pending_count'),
+    ).filter(rows__gt=1).order_by()
+    for bucket in duplicates:
+        rows = DailyTaskRollup.objects.filter(**{name: bucket[name] for name in key})
+        keep = rows.order_by('id').first()
+        rows.exclude(pk=keep.pk).delete()
+        rows.update(
+            completed_minutes=bucket['minutes'],
+            completed_count=bucket['completed'],
+            due_pending_count=bucket['due_pending'],
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0007_task_occurrences'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_buckets, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='dailytaskrollup',
+            constraint=models.UniqueConstraint(models.F('user'), models.F('date'), django.db.models.functions.comparison.Coalesce('category', 0), django.db.models.functions.comparison.Coalesce('app_website', 0), name='rollup_bucket_uniq'),
+        ),
+    ]
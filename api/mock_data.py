@@ -0,0 +1,235 @@
+# api/mock_data.py
+import random
+import secrets
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import connection, transaction
+from django.utils import timezone
+
+from . import rollups, watermarks
+from .models import AppWebsite, Category, Notification, Project, Subtask, Task
+
+User = get_user_model()
+
+TASK_TITLES = (
+    "Review Project Proposal", "Prepare Presentation", "Client Follow-up",
+    "Code Refactoring", "Write Blog Post", "Research New Tool",
+    "Team Sync Meeting", "Update Documentation", "Plan Marketing Campaign",
+    "Data Analysis Report", "User Feedback Collection", "Bug Fixing",
+    "Onboard New Team Member", "Develop New Feature X", "Sprint Planning",
+    "Create User Manual", "Test Beta Version", "Conduct Market Research",
+    "Design UI/UX Mockups", "Optimize Database Queries", "Write Unit Tests",
+    "Perform Security Audit", "Prepare Financial Report", "Customer Support Triage",
+    "Review Legal Contracts", "Setup Development Environment", "Content Calendar Planning",
+    "Social Media Engagement", "Email Newsletter Draft", "Competitor Analysis",
+)
+SUBTASK_VERBS = ('Research', 'Draft', 'Finalize', 'Review')
+# 'Work' and 'Focus' come first because the dashboard counts them as work hours.
+CATEGORY_NAMES = ('Work', 'Focus', 'Personal', 'Learning', 'Health', 'Admin', 'Errands', 'Meetings')
+APP_NAMES = ('VS Code', 'Browser', 'Slack', 'Figma', 'Notion', 'Terminal', 'Email', 'Calendar')
+PROJECT_NAMES = ('Website Relaunch', 'Mobile App', 'Q3 Planning', 'Hiring', 'Data Platform', 'Onboarding')
+RECURRENCE_PATTERNS = ('DAILY', 'WEEKLY', 'MONTHLY', 'YEARLY')
+DURATIONS = (None, 15, 30, 45, 60, 90, 120)
+NOTIFICATION_MESSAGES = (
+    "Your task '{title}' is due soon.",
+    "You completed '{title}'. Nice work!",
+    "Reminder: '{title}' is still pending.",
+)
+
+
+@contextmanager
+def explicit_timestamps(*models):
+    """Let bulk_create keep the created_at/updated_at values we generate."""
+    fields = [
+        field for model in models for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False)
+    ]
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+class MockDataGenerator:
+    """
+    Generates users with tasks, subtasks, categories, app/websites, projects
+    and notifications using chunked bulk_create. The same seed, chunk size and
+    options always produce the same data: subtasks and notifications are drawn
+    from the same random stream when each chunk is flushed. Usernames carry a
+    per-run suffix so generating again into the same database never collides.
+    """
+
+    def __init__(self, users=1, tasks_per_user=45, seed=0, chunk_size=5000,
+                 done_ratio=0.5, overdue_ratio=0.2, recurring_ratio=0.1,
+                 max_subtasks=4, categories_per_user=4, apps_per_user=4,
+                 projects_per_user=3, notifications_per_user=10,
+                 history_days=30, horizon_days=60, username_prefix='mock-user',
+                 existing_user=None, log=None):
+        self.users = users
+        self.tasks_per_user = tasks_per_user
+        self.seed = seed
+        self.chunk_size = chunk_size
+        self.done_ratio = done_ratio
+        self.overdue_ratio = overdue_ratio
+        self.recurring_ratio = recurring_ratio
+        self.max_subtasks = max_subtasks
+        self.categories_per_user = min(categories_per_user, len(CATEGORY_NAMES))
+        self.apps_per_user = min(apps_per_user, len(APP_NAMES))
+        self.projects_per_user = min(projects_per_user, len(PROJECT_NAMES))
+        self.notifications_per_user = notifications_per_user
+        self.history_days = history_days
+        self.horizon_days = horizon_days
+        self.username_prefix = username_prefix
+        self.run_id = secrets.token_hex(4)
+        self.existing_user = existing_user
+        self.log = log or (lambda message: None)
+
+        self.rng = random.Random(seed)
+        self.now = timezone.now()
+        self.today = timezone.localdate()
+        self.counts = dict.fromkeys(
+            ('users', 'tasks', 'subtasks', 'categories', 'app_websites', 'projects', 'notifications'), 0
+        )
+
+    def run(self):
+        """Generate everything and return the number of rows created per model."""
+        started = time.perf_counter()
+        users_per_chunk = max(1, self.chunk_size // max(1, self.tasks_per_user))
+        with explicit_timestamps(Task, Subtask, Notification):
+            if self.existing_user is not None:
+                self.generate_for_users([self.existing_user])
+            else:
+                for offset in range(0, self.users, users_per_chunk):
+                    count = min(users_per_chunk, self.users - offset)
+                    self.generate_for_users(self.create_users(offset, count))
+                    self.log(f"{offset + count}/{self.users} users, {self.counts['tasks']} tasks")
+
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE')
+        self.counts['seconds'] = round(time.perf_counter() - started, 2)
+        return self.counts
+
+    def create_users(self, offset, count):
+        password = make_password(None)  # unusable, and hashed only once
+        usernames = [f'{self.username_prefix}-{self.seed}-{self.run_id}-{offset + i}' for i in range(count)]
+        users = User.objects.bulk_create(
+            User(username=username, email=f'{username}@example.com', password=password)
+            for username in usernames
+        )
+        if not all(user.pk for user in users):
+            users = list(User.objects.filter(username__in=usernames).order_by('id'))
+        self.counts['users'] += len(users)
+        return users
+
+    def generate_for_users(self, users):
+        with transaction.atomic():
+            categories = self.create_named(Category, CATEGORY_NAMES[:self.categories_per_user], users, 'categories')
+            apps = self.create_named(AppWebsite, APP_NAMES[:self.apps_per_user], users, 'app_websites')
+            projects = self.create_named(Project, PROJECT_NAMES[:self.projects_per_user], users, 'projects')
+
+            batch = []
+            for user in users:
+                for _ in range(self.tasks_per_user):
+                    batch.append(self.build_task(user, categories[user.pk], apps[user.pk], projects[user.pk]))
+                    if len(batch) >= self.chunk_size:
+                        self.flush_tasks(batch)
+                        batch = []
+            self.flush_tasks(batch)
+
+            rollups.rebuild(user_ids=[user.pk for user in users])
+            watermarks.bump([user.pk for user in users], *watermarks.ALL_RESOURCES)
+
+    def create_named(self, model, names, users, counter):
+        """Create the same set of names for every user; returns {user_id: [objects]}."""
+        existing = {}
+        for obj in model.objects.filter(user__in=users, name__in=names):
+            existing.setdefault(obj.user_id, {})[obj.name] = obj
+        new = [
+            model(user=user, name=name)
+            for user in users for name in names
+            if name not in existing.get(user.pk, {})
+        ]
+        if new:
+            model.objects.bulk_create(new, batch_size=self.chunk_size)
+            for obj in model.objects.filter(user__in=users, name__in=names):
+                existing.setdefault(obj.user_id, {})[obj.name] = obj
+            self.counts[counter] += len(new)
+        return {user.pk: list(existing.get(user.pk, {}).values()) for user in users}
+
+    def build_task(self, user, categories, apps, projects):
+        rng = self.rng
+        created_at = self.now - timedelta(days=rng.random() * self.history_days)
+        status = 'DONE' if rng.random() < self.done_ratio else 'PENDING'
+        if status == 'PENDING' and rng.random() < self.overdue_ratio:
+            due_date = self.today - timedelta(days=rng.randint(1, 30))
+        else:
+            due_date = self.today + timedelta(days=rng.randint(0, self.horizon_days))
+        if status == 'DONE':
+            updated_at = created_at + (self.now - created_at) * rng.random()
+        else:
+            updated_at = created_at
+
+        recurrence_pattern = 'NONE'
+        recurrence_end_date = None
+        if rng.random() < self.recurring_ratio:
+            recurrence_pattern = rng.choice(RECURRENCE_PATTERNS)
+            recurrence_end_date = rng.choice((None, due_date + timedelta(days=rng.randint(90, 365))))
+
+        title = rng.choice(TASK_TITLES)
+        return Task(
+            user=user,
+            title=title,
+            description=f"{title} for {rng.choice(PROJECT_NAMES)}. Generated mock task.",
+            status=status,
+            priority=rng.choices((1, 2, 3), weights=(2, 5, 3))[0],
+            due_date=due_date,
+            duration_minutes=rng.choice(DURATIONS),
+            recurrence_pattern=recurrence_pattern,
+            recurrence_end_date=recurrence_end_date,
+            category=rng.choice(categories) if categories and rng.random() < 0.8 else None,
+            app_website=rng.choice(apps) if apps and rng.random() < 0.6 else None,
+            project=rng.choice(projects) if projects and rng.random() < 0.5 else None,
+            created_at=created_at,
+            updated_at=updated_at,
+        )
+
+    def flush_tasks(self, tasks):
+        if not tasks:
+            return
+        tasks = Task.objects.bulk_create(tasks, batch_size=self.chunk_size)
+        self.counts['tasks'] += len(tasks)
+
+        subtasks = []
+        notifications = []
+        notifications_per_task = self.notifications_per_user / max(1, self.tasks_per_user)
+        for task in tasks:
+            for i in range(self.rng.randint(0, self.max_subtasks)):
+                subtasks.append(Subtask(
+                    task=task,
+                    title=f"{self.rng.choice(SUBTASK_VERBS)} step {i + 1}",
+                    completed=task.status == 'DONE' or self.rng.random() < 0.3,
+                    created_at=task.created_at,
+                    updated_at=task.updated_at,
+                ))
+            if self.rng.random() < notifications_per_task:
+                is_read = self.rng.random() < 0.7
+                notifications.append(Notification(
+                    user_id=task.user_id,
+                    message=self.rng.choice(NOTIFICATION_MESSAGES).format(title=task.title),
+                    is_read=is_read,
+                    created_at=task.updated_at,
+                    read_at=task.updated_at if is_read else None,
+                ))
+        Subtask.objects.bulk_create(subtasks, batch_size=self.chunk_size)
+        Notification.objects.bulk_create(notifications, batch_size=self.chunk_size)
+        self.counts['subtasks'] += len(subtasks)
+        self.counts['notifications'] += len(notifications)
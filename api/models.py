@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models.functions import Coalesce
 from django.contrib.auth import get_user_model
 # from django.contrib.postgres.fields import ArrayField # No longer needed for subtasks
 import json
@@ -63,6 +64,16 @@ class Notification(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Inbox pages, newest first (keyset pagination on created_at, id)
+            models.Index(fields=['user', '-created_at', '-id'], name='notif_user_inbox_idx'),
+            # Unread count and mark-all-read only touch unread rows
+            models.Index(
+                fields=['user', 'created_at'],
+                condition=models.Q(is_read=False),
+                name='notif_user_unread_idx',
+            ),
+        ]
 
     def __str__(self):
         return f"Notification for {self.user.username}: {self.message[:50]}..."
@@ -143,6 +154,29 @@ class Task(models.Model):
 
     class Meta:
         ordering = ['due_date', 'priority', '-created_at']
+        # Every hot query is scoped to one user, so user leads each index.
+        indexes = [
+            # Default TaskViewSet ordering
+            models.Index(fields=['user', 'due_date', 'priority', '-created_at'], name='task_user_order_idx'),
+            # ?status= filter and pending/overdue counts
+            models.Index(fields=['user', 'status', 'due_date'], name='task_user_status_due_idx'),
+            # Tasks completed in a date range (dashboard, rollup rebuilds)
+            models.Index(fields=['user', 'status', 'updated_at'], name='task_user_status_upd_idx'),
+            # ?priority= filter
+            models.Index(fields=['user', 'priority', 'due_date'], name='task_user_priority_idx'),
+            # Pending tasks by due date (due today, upcoming deadlines)
+            models.Index(
+                fields=['user', 'due_date'],
+                condition=models.Q(status='PENDING'),
+                name='task_pending_due_idx',
+            ),
+            # Recurring series by their first and last date (occurrence windows)
+            models.Index(
+                fields=['user', 'due_date', 'recurrence_end_date'],
+                condition=~models.Q(recurrence_pattern='NONE'),
+                name='task_recurring_series_idx',
+            ),
+        ]
 
     def __str__(self):
         return self.title
@@ -180,3 +214,77 @@ class Subtask(models.Model):
     def __str__(self):
         return f"{self.title} ({'Done' if self.completed else 'Pending'})"
 
+
+
+# NEW: Exceptions to a recurring task's occurrences
+class TaskOccurrence(models.Model):
+    """
+    The state of one date of a recurring task. Occurrences are computed from
+    the task's recurrence (see api/recurrence.py); only dates that were
+    completed or skipped are stored.
+    """
+    STATUS_CHOICES = [
+        ('DONE', 'Done'),
+        ('SKIPPED', 'Skipped'),
+    ]
+
+    task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name='occurrences')
+    date = models.DateField()
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        # Also the (task, date) index the occurrence expansion reads from
+        unique_together = ('task', 'date')
+        ordering = ['date']
+
+    def __str__(self):
+        return f"{self.task_id} on {self.date}: {self.status}"
+
+
+# NEW: Per-user, per-day rollup of task metrics backing the dashboard
+class DailyTaskRollup(models.Model):
+    """
+    One row per (user, date, category, app_website) bucket.
+
+    completed_* columns are attributed to the day a DONE task was last updated,
+    due_pending_count to the due date of PENDING tasks. Rows are kept up to date
+    incrementally by the signals in api/signals.py and can be rebuilt from the
+    Task table with `manage.py rebuild_rollups`.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='daily_rollups')
+    date = models.DateField()
+    category = models.ForeignKey(
+        Category,
+        on_delete=models.SET_NULL, # Mirrors Task.category so rollups follow the tasks
+        related_name='daily_rollups',
+        blank=True,
+        null=True,
+    )
+    app_website = models.ForeignKey(
+        AppWebsite,
+        on_delete=models.SET_NULL, # Mirrors Task.app_website
+        related_name='daily_rollups',
+        blank=True,
+        null=True,
+    )
+    completed_minutes = models.IntegerField(default=0)
+    completed_count = models.IntegerField(default=0)
+    due_pending_count = models.IntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'date'], name='rollup_user_date_idx'),
+        ]
+        constraints = [
+            # One row per bucket, with no category/app counting as a bucket of
+            # its own. NULLs are coalesced rather than using nulls_distinct=False,
+            # which only PostgreSQL 15+ enforces (Django skips it on SQLite).
+            models.UniqueConstraint(
+                'user', 'date', Coalesce('category', 0), Coalesce('app_website', 0),
+                name='rollup_bucket_uniq',
+            ),
+        ]
+
+    def __str__(self):
+        return f"Rollup for {self.user_id} on {self.date}"
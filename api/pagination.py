@@ -1,19 +1,57 @@
 # api/pagination.py
-from rest_framework.pagination import PageNumberPagination
+import base64
+import json
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.paginator import InvalidPage
+from django.db import connections
+from django.db.models import F, Field, Func, Q, Value
+from django.db.models.lookups import GreaterThan, LessThan
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
 from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 from collections import OrderedDict
 
+# Backends that compare row values, `(a, b) < (x, y)`, as one index range.
+ROW_VALUE_VENDORS = ('postgresql', 'sqlite', 'mysql')
+
+
+class RowValue(Func):
+    """A row value, `(a, b, ...)`, compared column by column."""
+    template = '(%(expressions)s)'
+    output_field = Field()
+
+
 class SafePageNumberPagination(PageNumberPagination):
     page_size = 3  # same as your settings.PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = 100
 
     def paginate_queryset(self, queryset, request, view=None):
         try:
             return super().paginate_queryset(queryset, request, view=view)
-        except Exception:
+        except NotFound:
             # When page is out of range, return empty list
             self.page = None
             return []
 
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """paginate_queryset() with the count and the page read through the async ORM."""
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+        self.request = request
+        paginator = self.django_paginator_class(queryset, page_size)
+        paginator.count = await queryset.acount()
+        try:
+            self.page = paginator.page(self.get_page_number(request, paginator))
+        except InvalidPage:
+            self.page = None
+            return []
+        self.page.object_list = [obj async for obj in self.page.object_list]
+        return list(self.page)
+
     def get_paginated_response(self, data):
         return Response(OrderedDict([
             ('count', self.page.paginator.count if self.page else 0),
@@ -21,3 +59,203 @@ class SafePageNumberPagination(PageNumberPagination):
             ('previous', self.get_previous_link() if self.page else None),
             ('results', data)
         ]))
+
+
+class OccurrencePagination(SafePageNumberPagination):
+    """Pages of the occurrences computed for a planner window."""
+    page_size = 200
+    max_page_size = 1000
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination over a composite, unique ordering. Each page is a
+    `WHERE (ordering) > (last row)` range read, so deep pages cost the same as
+    the first one. Nullable fields sort last.
+
+    ?page_size= picks the page size (up to max_page_size) and ?count=false
+    skips the COUNT(*) query.
+    """
+    ordering = ('-created_at', '-id')
+    page_size = 20
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    count_query_param = 'count'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.count = queryset.count() if self.include_count(request) else None
+        return self.set_page(list(self.page_queryset(queryset, request)))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.count = await queryset.acount() if self.include_count(request) else None
+        return self.set_page([row async for row in self.page_queryset(queryset, request)])
+
+    def page_queryset(self, queryset, request):
+        """The rows after the request's cursor, one more than a page to tell if there is a next one."""
+        return self.rows_after(queryset, self.decode_cursor(request, queryset.model))[:self.page_size + 1]
+
+    def rows_after(self, queryset, position):
+        """`queryset` in the pagination order, from just after `position` (None for the start)."""
+        queryset = queryset.order_by(*self.get_order_by(queryset.model))
+        if position is not None:
+            queryset = queryset.filter(self.after(queryset, position))
+        return queryset
+
+    def set_page(self, rows):
+        self.has_next = len(rows) > self.page_size
+        self.page = rows[:self.page_size]
+        return self.page
+
+    def get_paginated_response(self, data):
+        response = OrderedDict()
+        if self.count is not None:
+            response['count'] = self.count
+        response['next'] = self.get_next_link()
+        response['previous'] = None
+        response['results'] = data
+        return Response(response)
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(page_size, self.max_page_size))
+
+    def include_count(self, request):
+        return request.query_params.get(self.count_query_param, 'true').lower() not in ('false', '0', 'no')
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        last = self.page[-1]
+        values = [self.field_value(last, field) for field, _ in self.get_fields()]
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(values))
+
+    # --- ordering helpers ---
+
+    def get_fields(self):
+        """[(field_name, descending)] for the configured ordering."""
+        return [(name.lstrip('-'), name.startswith('-')) for name in self.ordering]
+
+    def get_order_by(self, model=None):
+        # Only nullable fields need NULLS LAST; on the others it would stop
+        # PostgreSQL from matching the order to a plain ASC/DESC index.
+        order_by = []
+        for name, descending in self.get_fields():
+            nullable = model is not None and model._meta.get_field(name).null
+            expression = F(name).desc if descending else F(name).asc
+            order_by.append(expression(nulls_last=True) if nullable else expression())
+        return order_by
+
+    def field_value(self, obj, name):
+        value = getattr(obj, name)
+        return value.isoformat() if hasattr(value, 'isoformat') else value
+
+    def uses_row_comparison(self, queryset):
+        """Whether the ordering can be one `(a, b) > (x, y)` range, which an index answers directly."""
+        fields = self.get_fields()
+        return (
+            connections[queryset.db].vendor in ROW_VALUE_VENDORS
+            and len({descending for _, descending in fields}) == 1
+            and not any(queryset.model._meta.get_field(name).null for name, _ in fields)
+        )
+
+    def after(self, queryset, position):
+        """Condition matching rows of `queryset` that sort strictly after `position`."""
+        model = queryset.model
+        fields = self.get_fields()
+        if self.uses_row_comparison(queryset):
+            comparison = LessThan if fields[0][1] else GreaterThan
+            return comparison(
+                RowValue(*(F(name) for name, _ in fields)),
+                RowValue(*(
+                    Value(value, output_field=model._meta.get_field(name))
+                    for (name, _), value in zip(fields, position)
+                )),
+            )
+
+        condition = Q(pk__in=[])
+        equal_so_far = Q()
+        for (name, descending), value in zip(fields, position):
+            if value is None:
+                # Nulls sort last, so nothing comes after a null in this field.
+                equal_so_far &= Q(**{f'{name}__isnull': True})
+                continue
+            lookup = 'lt' if descending else 'gt'
+            beyond = Q(**{f'{name}__{lookup}': value})
+            if model._meta.get_field(name).null:
+                beyond |= Q(**{f'{name}__isnull': True})
+            condition |= equal_so_far & beyond
+            equal_so_far &= Q(**{name: value})
+        return condition
+
+    # --- cursor encoding ---
+
+    def encode_cursor(self, values):
+        return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+    def decode_cursor(self, request, model):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            values = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+            fields = self.get_fields()
+            if not isinstance(values, list) or len(values) != len(fields):
+                raise ValueError
+            return [
+                None if value is None else model._meta.get_field(name).to_python(value)
+                for (name, _), value in zip(fields, values)
+            ]
+        except (TypeError, ValueError, DjangoValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+
+class TaskKeysetPagination(KeysetPagination):
+    # Matches TaskViewSet's ordering, made unique by the primary key.
+    ordering = ('due_date', 'priority', '-created_at', 'id')
+
+
+class OptInKeysetPagination(SafePageNumberPagination):
+    """
+    Page-number pagination by default; keyset pagination when the request
+    carries ?cursor= (or ?pagination=cursor for the first page).
+    """
+    keyset_class = KeysetPagination
+
+    def use_keyset(self, request):
+        return 'cursor' in request.query_params or request.query_params.get('pagination') == 'cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = self.keyset_class() if self.use_keyset(request) else None
+        if self.keyset:
+            return self.keyset.paginate_queryset(queryset, request, view=view)
+        return super().paginate_queryset(queryset, request, view=view)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        self.keyset = self.keyset_class() if self.use_keyset(request) else None
+        if self.keyset:
+            return await self.keyset.apaginate_queryset(queryset, request, view=view)
+        return await super().apaginate_queryset(queryset, request, view=view)
+
+    def get_paginated_response(self, data):
+        if self.keyset:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+
+class TaskPagination(OptInKeysetPagination):
+    keyset_class = TaskKeysetPagination
+
+
+class NotificationPagination(OptInKeysetPagination):
+    # Newest first, the default KeysetPagination ordering.
+    keyset_class = KeysetPagination
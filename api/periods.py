@@ -0,0 +1,150 @@
+# api/periods.py
+from calendar import monthrange
+from collections import defaultdict
+from datetime import timedelta
+
+from . import dashboard_cache, metrics
+from .metrics import FOCUS_CATEGORY_NAME, WORK_CATEGORY_NAMES
+
+PERIODS = ('day', 'week', 'month', 'year', 'custom')
+ONE_DAY = timedelta(days=1)
+
+
+def period_bounds(period, day):
+    """[start, end] of the calendar `period` containing `day`; weeks start on Monday."""
+    if period == 'week':
+        start = day - timedelta(days=day.weekday())
+        return start, start + timedelta(days=6)
+    if period == 'month':
+        return day.replace(day=1), day.replace(day=monthrange(day.year, day.month)[1])
+    if period == 'year':
+        return day.replace(month=1, day=1), day.replace(month=12, day=31)
+    return day, day
+
+
+def previous_bounds(period, start, end):
+    """The period before [start, end]: the previous calendar period, or as many days for a custom range."""
+    if period in ('month', 'year'):
+        return period_bounds(period, start - ONE_DAY)
+    return start - (end - start) - ONE_DAY, start - ONE_DAY
+
+
+def granularity(start, end):
+    """Bucket size of a series over [start, end]: days up to a month, weeks up to half a year, then months."""
+    days = (end - start).days + 1
+    if days <= 31:
+        return 'day'
+    return 'week' if days <= 26 * 7 else 'month'
+
+
+def bucket_starts(start, end, kind):
+    """First day of every `kind` bucket overlapping [start, end], as Trunc() labels them."""
+    if kind == 'week':
+        current = start - timedelta(days=start.weekday())
+    elif kind == 'month':
+        current = start.replace(day=1)
+    else:
+        current = start
+    buckets = []
+    while current <= end:
+        buckets.append(current)
+        if kind == 'month':
+            current = (current.replace(day=28) + timedelta(days=4)).replace(day=1)
+        else:
+            current += timedelta(days=7 if kind == 'week' else 1)
+    return buckets
+
+
+def period_rows(user, start, end, kind, today):
+    """metrics.bucket_rows() with the days before today read from the dashboard history cache."""
+    rows = []
+    if start < today:
+        past_end = min(end, today - ONE_DAY)
+        rows += dashboard_cache.cached_history(
+            user.pk, start, past_end, kind, lambda: metrics.bucket_rows(user, start, past_end, kind),
+        )
+    if end >= today:
+        rows += metrics.bucket_rows(user, max(start, today), end, kind)
+    return rows
+
+
+def totals(rows):
+    """Work, focus and completion totals of bucket rows, with minutes by category and by app."""
+    summary = {
+        'work_minutes': 0,
+        'focus_minutes': 0,
+        'completed': 0,
+        'tasks_due': 0,
+        'minutes_by_category': defaultdict(int),
+        'minutes_by_app': defaultdict(int),
+    }
+    for _, category_name, app_name, minutes, completed, due_pending in rows:
+        summary['completed'] += completed
+        summary['tasks_due'] += due_pending
+        if category_name in WORK_CATEGORY_NAMES:
+            summary['work_minutes'] += minutes
+        if category_name == FOCUS_CATEGORY_NAME:
+            summary['focus_minutes'] += minutes
+        if category_name and minutes:
+            summary['minutes_by_category'][category_name] += minutes
+        if app_name and minutes:
+            summary['minutes_by_app'][app_name] += minutes
+    summary['minutes_by_category'] = dict(summary['minutes_by_category'])
+    summary['minutes_by_app'] = dict(summary['minutes_by_app'])
+    return summary
+
+
+def series(rows, start, end, kind):
+    """Per-bucket minutes by category, minutes by app and completions, zero-filled."""
+    labels = bucket_starts(start, end, kind)
+    index = {label: i for i, label in enumerate(labels)}
+    by_category = defaultdict(lambda: [0] * len(labels))
+    by_app = defaultdict(lambda: [0] * len(labels))
+    completions = [0] * len(labels)
+    for bucket, category_name, app_name, minutes, completed, _ in rows:
+        i = index[bucket]
+        completions[i] += completed
+        if category_name and minutes:
+            by_category[category_name][i] += minutes
+        if app_name and minutes:
+            by_app[app_name][i] += minutes
+    return {
+        'granularity': kind,
+        'labels': labels,
+        'minutesByCategory': dict(sorted(by_category.items())),
+        'minutesByApp': dict(sorted(by_app.items())),
+        'completions': completions,
+    }
+
+
+def label(period, start, end, today):
+    """How insights name the period: 'today', 'this week', 'that month', 'this period'..."""
+    if period == 'custom':
+        return 'this period'
+    if period == 'day':
+        return 'today' if start == today else 'that day'
+    return f"{'this' if start <= today <= end else 'that'} {period}"
+
+
+def period_metrics(user, period, start, end, today):
+    """
+    Totals and bucketed series of [start, end] plus the totals of the period
+    before it, from the daily rollups. Past days come from the history cache,
+    so a closed period costs no query once cached.
+    """
+    kind = granularity(start, end)
+    previous_start, previous_end = previous_bounds(period, start, end)
+    rows = period_rows(user, start, end, kind, today)
+    previous = totals(period_rows(user, previous_start, previous_end, kind, today))
+    return {
+        'period': period,
+        'label': label(period, start, end, today),
+        'start': start,
+        'end': end,
+        'days': (end - start).days + 1,
+        'previous_start': previous_start,
+        'previous_end': previous_end,
+        'current': totals(rows),
+        'previous': previous,
+        'series': series(rows, start, end, kind),
+    }
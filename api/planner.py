@@ -0,0 +1,73 @@
+# api/planner.py
+from datetime import timedelta
+
+from django.db.models import Count, F, Q, Sum, Window
+from django.db.models.functions import Coalesce, RowNumber
+
+from . import recurrence
+
+TOP_TASK_FIELDS = ('id', 'title', 'priority', 'status', 'due_date')
+
+
+def empty_day(day):
+    return {'date': day, 'pending': 0, 'done': 0, 'overdue': 0, 'minutes': 0}
+
+
+def calendar_days(tasks, start, end, today, top=0):
+    """
+    One entry per day in [start, end] with pending, done and overdue counts and
+    the planned minutes of the tasks due that day. One-off tasks are counted by
+    a single query grouped on due_date (the (user, due_date) index path);
+    recurring tasks add their computed occurrences. With `top`, each day also
+    lists its `top` most important tasks.
+    """
+    days = {start + timedelta(days=offset): empty_day(start + timedelta(days=offset))
+            for offset in range((end - start).days + 1)}
+    one_off = tasks.filter(recurrence_pattern='NONE', due_date__range=(start, end))
+
+    for row in one_off.values('due_date').annotate(
+        pending=Count('id', filter=Q(status='PENDING')),
+        done=Count('id', filter=Q(status='DONE')),
+        overdue=Count('id', filter=Q(status='PENDING', due_date__lt=today)),
+        minutes=Coalesce(Sum('duration_minutes'), 0),
+    ).order_by():
+        day = days[row.pop('due_date')]
+        for key, value in row.items():
+            day[key] += value
+
+    candidates = {}
+    if top:
+        # Rank within each day in the database so only `top` rows per day come back.
+        ranked = one_off.annotate(rank=Window(
+            RowNumber(), partition_by=[F('due_date')], order_by=[F('priority').asc(), F('id').asc()],
+        )).filter(rank__lte=top).values(*TOP_TASK_FIELDS)
+        for task in ranked:
+            candidates.setdefault(task['due_date'], []).append(_top_task(task, task['due_date'], task['status']))
+
+    for task, occurrence_date, status in recurrence.recurring_occurrences(tasks, start, end):
+        day = days[occurrence_date]
+        if status == 'DONE':
+            day['done'] += 1
+        elif status == 'PENDING':
+            day['pending'] += 1
+            if occurrence_date < today:
+                day['overdue'] += 1
+        if status != 'SKIPPED':
+            day['minutes'] += task['duration_minutes'] or 0
+        if top:
+            candidates.setdefault(occurrence_date, []).append(_top_task(task, occurrence_date, status))
+
+    if top:
+        for day in days.values():
+            day['tasks'] = sorted(candidates.get(day['date'], ()), key=lambda task: (task['priority'], task['id']))[:top]
+    return list(days.values())
+
+
+def _top_task(task, day, status):
+    return {
+        'id': task['id'],
+        'title': task['title'],
+        'priority': task['priority'],
+        'status': status,
+        'date': day,
+    }
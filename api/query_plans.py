@@ -0,0 +1,123 @@
+# api/query_plans.py
+import random
+import secrets
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.db.models import Q
+from django.utils import timezone
+
+from . import metrics, recurrence, rollups
+from .models import Notification, Task
+from .pagination import KeysetPagination, TaskKeysetPagination
+
+User = get_user_model()
+
+# Plan fragments showing an index is used / a hot table is read in full.
+INDEX_MARKERS = {
+    'postgresql': ('Index Scan', 'Index Only Scan', 'Bitmap Index Scan'),
+    'sqlite': ('USING INDEX', 'USING COVERING INDEX'),
+}
+FULL_SCAN_MARKERS = {
+    'postgresql': ('Seq Scan on api_task ', 'Seq Scan on api_notification '),
+    'sqlite': ('SCAN api_task\n', 'SCAN api_notification\n'),
+}
+
+
+def deep_page(pagination, queryset, page_size):
+    """The page a keyset `pagination` reads from the middle of `queryset`."""
+    ordered = pagination.rows_after(queryset, None)
+    position = ordered.values_list(*(name for name, _ in pagination.get_fields()))[ordered.count() // 2]
+    return pagination.rows_after(queryset, list(position))[:page_size + 1]
+
+
+def hot_queries(user, today=None, page_size=20):
+    """The queries behind TaskViewSet, the notification inbox and the dashboard, as (name, queryset) pairs."""
+    today = today or timezone.localdate()
+    yesterday = today - timedelta(days=1)
+    tasks = Task.objects.filter(user=user)
+    ordering = ('due_date', 'priority', '-created_at')
+    return [
+        ('task_list', tasks.order_by(*ordering)[:page_size]),
+        ('task_list_status', tasks.filter(status='PENDING').order_by(*ordering)[:page_size]),
+        ('task_list_priority', tasks.filter(priority=1).order_by(*ordering)[:page_size]),
+        ('task_list_due_today', tasks.filter(due_date=today).order_by(*ordering)[:page_size]),
+        ('task_recurring_series', recurrence.series_in_window(tasks, today, today + timedelta(days=365))),
+        ('dashboard_totals', tasks.filter(
+            metrics.completed_between(yesterday, today) | Q(status='PENDING', due_date=today)
+        )),
+        ('dashboard_completed_today', tasks.filter(metrics.completed_between(today, today))),
+        ('dashboard_due_today', tasks.filter(status='PENDING', due_date=today)),
+        ('dashboard_rollups', rollups.dashboard_rows(user, [today, yesterday])),
+        ('task_list_deep_page', deep_page(TaskKeysetPagination(), tasks, page_size)),
+        ('notification_inbox', Notification.objects.filter(user=user).order_by('-created_at', '-id')[:page_size]),
+        ('notification_inbox_deep_page', deep_page(KeysetPagination(), Notification.objects.filter(user=user), page_size)),
+        ('notification_unread_count', Notification.objects.filter(user=user, is_read=False)),
+    ]
+
+
+def uses_index(plan, vendor=None):
+    """True if `plan` (QuerySet.explain() output) reads through an index only."""
+    vendor = vendor or connection.vendor
+    plan = plan + '\n'
+    if any(marker in plan for marker in FULL_SCAN_MARKERS.get(vendor, ())):
+        return False
+    return any(marker in plan for marker in INDEX_MARKERS.get(vendor, ()))
+
+
+def explain_hot_queries(user, today=None):
+    """Return [(name, plan, uses_index)] for every hot query of `user`."""
+    results = []
+    for name, queryset in hot_queries(user, today):
+        plan = queryset.explain()
+        results.append((name, plan, uses_index(plan)))
+    return results
+
+
+def seed_tasks(total_tasks, users=100, batch_size=5000, seed=0):
+    """
+    Bulk-create `total_tasks` tasks, and one notification per two tasks, spread
+    over `users` new users so the planner sees a realistic per-user selectivity.
+    Usernames carry a per-run suffix, so seeding the same database twice works.
+    Returns the created users.
+    """
+    rng = random.Random(seed)
+    today = timezone.localdate()
+    prefix = f'explain-{seed}-{secrets.token_hex(4)}-'
+    seeded_users = User.objects.bulk_create(
+        User(username=f'{prefix}{i}', email=f'{prefix}{i}@example.com') for i in range(users)
+    )
+    if not all(user.pk for user in seeded_users):
+        seeded_users = list(User.objects.filter(username__startswith=prefix).order_by('id'))
+
+    batch = []
+    for i in range(total_tasks):
+        batch.append(Task(
+            user=seeded_users[i % users],
+            title=f'Seeded task {i}',
+            status='DONE' if rng.random() < 0.6 else 'PENDING',
+            priority=rng.choice((1, 2, 3)),
+            due_date=today + timedelta(days=rng.randint(-180, 180)),
+            duration_minutes=rng.choice((None, 15, 30, 60, 90)),
+        ))
+        if len(batch) >= batch_size:
+            Task.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        Task.objects.bulk_create(batch)
+
+    Notification.objects.bulk_create(
+        (
+            Notification(user=seeded_users[i % users], message=f'Seeded notification {i}', is_read=rng.random() < 0.8)
+            for i in range(total_tasks // 2)
+        ),
+        batch_size=batch_size,
+    )
+
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE api_task')
+            cursor.execute('ANALYZE api_notification')
+    rollups.rebuild(user_ids=[user.pk for user in seeded_users])
+    return seeded_users
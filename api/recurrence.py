@@ -0,0 +1,123 @@
+# api/recurrence.py
+import calendar
+from datetime import timedelta
+
+from django.db.models import Q
+
+from .models import TaskOccurrence
+
+# Patterns stepping a fixed number of days, and patterns stepping whole months.
+STEP_DAYS = {'DAILY': 1, 'WEEKLY': 7}
+STEP_MONTHS = {'MONTHLY': 1, 'YEARLY': 12}
+
+
+def add_months(day, months):
+    """`day` moved by `months`, clamped to the last day of shorter months."""
+    year, month = divmod(day.month - 1 + months, 12)
+    year += day.year
+    month += 1
+    return day.replace(year=year, month=month, day=min(day.day, calendar.monthrange(year, month)[1]))
+
+
+def occurrence_dates(anchor, pattern, until, start, end):
+    """
+    Dates in [start, end] on which a task due on `anchor` recurs with `pattern`
+    until `until` (None for open-ended). The first date in the window and the
+    number of dates are computed directly, so cost grows with the number of
+    occurrences returned, never with the width of the gap before the window.
+    """
+    if anchor is None:
+        return []
+    if pattern not in STEP_DAYS and pattern not in STEP_MONTHS:
+        return [anchor] if start <= anchor <= end else []
+
+    last = min(end, until) if until else end
+    if last < anchor or last < start:
+        return []
+
+    if pattern in STEP_DAYS:
+        step = STEP_DAYS[pattern]
+        # Ceiling division: index of the first occurrence on or after `start`.
+        first = max(0, -(-(start - anchor).days // step))
+        count = (last - anchor).days // step - first + 1
+        return [anchor + timedelta(days=step * index) for index in range(first, first + max(0, count))]
+
+    step = STEP_MONTHS[pattern]
+    months_to_start = (start.year - anchor.year) * 12 + start.month - anchor.month
+    index = max(0, months_to_start // step)
+    dates = []
+    while True:
+        day = add_months(anchor, index * step)
+        if day > last:
+            return dates
+        if day >= start:
+            dates.append(day)
+        index += 1
+
+
+def series_in_window(tasks, start, end):
+    """Recurring tasks of `tasks` that can recur in [start, end], read from the recurring-series index."""
+    return tasks.exclude(recurrence_pattern='NONE').filter(due_date__lte=end).filter(
+        Q(recurrence_end_date__isnull=True) | Q(recurrence_end_date__gte=start)
+    )
+
+
+SERIES_FIELDS = (
+    'id', 'title', 'priority', 'status', 'due_date', 'duration_minutes',
+    'recurrence_pattern', 'recurrence_end_date',
+)
+
+
+def recurring_occurrences(tasks, start, end):
+    """
+    (task values, date, status) for every occurrence of the recurring tasks in
+    `tasks` within [start, end]; two queries, the series and their exceptions.
+    """
+    series_tasks = series_in_window(tasks, start, end)
+    series = list(series_tasks.values(*SERIES_FIELDS))
+    if not series:
+        return
+    exceptions = {
+        (task_id, day): status
+        for task_id, day, status in TaskOccurrence.objects.filter(
+            task__in=series_tasks.values('id'), date__range=(start, end),
+        ).order_by().values_list('task_id', 'date', 'status')
+    }
+    for task in series:
+        for day in occurrence_dates(
+            task['due_date'], task['recurrence_pattern'], task['recurrence_end_date'], start, end,
+        ):
+            yield task, day, exceptions.get((task['id'], day), 'PENDING')
+
+
+def expand(tasks, start, end):
+    """
+    Every occurrence of `tasks` between `start` and `end` (inclusive), sorted by
+    date, priority and task. One-off tasks appear on their due date with their own
+    status; recurring ones on each computed date, PENDING unless a
+    TaskOccurrence row records that date as DONE or SKIPPED.
+    """
+    occurrences = [
+        _occurrence(task, task['due_date'], task['status'])
+        for task in tasks.filter(recurrence_pattern='NONE', due_date__range=(start, end)).values(*SERIES_FIELDS)
+    ]
+    for task, day, status in recurring_occurrences(tasks, start, end):
+        occurrences.append(_occurrence(task, day, status))
+
+    occurrences.sort(key=lambda occurrence: (occurrence['date'], occurrence['priority'], occurrence['task']))
+    return occurrences
+
+
+def _occurrence(task, day, status):
+    return {
+        'task': task['id'],
+        'date': day,
+        'title': task['title'],
+        'priority': task['priority'],
+        'status': status,
+        'recurrence_pattern': task['recurrence_pattern'],
+    }
+
+
+def is_occurrence(task, day):
+    return day in occurrence_dates(task.due_date, task.recurrence_pattern, task.recurrence_end_date, day, day)
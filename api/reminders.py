@@ -0,0 +1,138 @@
+# api/reminders.py
+import logging
+import time
+from datetime import datetime
+from itertools import groupby
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from . import events, watermarks
+from .models import Notification, Task
+
+logger = logging.getLogger(__name__)
+
+# Digest notifications start with this, which is also how a rerun on the same
+# day recognises users that were already reminded.
+OVERDUE_PREFIX = 'Overdue: '
+# Tasks listed by name in one digest email; the rest are only counted.
+DIGEST_MAX_TASKS = 20
+
+
+def overdue_rows(today, after_user_id=0):
+    """Overdue tasks of every user after `after_user_id`, grouped by user, in one query."""
+    return Task.objects.filter(
+        status='PENDING', due_date__lt=today, user_id__gt=after_user_id,
+    ).order_by('user_id', 'due_date', 'id').values_list(
+        'user_id', 'user__username', 'user__email', 'title', 'due_date',
+    )
+
+
+def digest_message(username, tasks):
+    lines = [f"- {title} (due {due_date})" for title, due_date in tasks[:DIGEST_MAX_TASKS]]
+    if len(tasks) > DIGEST_MAX_TASKS:
+        lines.append(f"- ...and {len(tasks) - DIGEST_MAX_TASKS} more")
+    return (
+        f"Hi {username},\n\n"
+        f"You have {len(tasks)} overdue task{'s' if len(tasks) != 1 else ''}:\n"
+        + '\n'.join(lines)
+        + "\n\nPlease take action to complete them.\n\n"
+        "Keep up the good work!\n"
+        "— Your Productivity App"
+    )
+
+
+def notification_message(tasks):
+    title, due_date = tasks[0]
+    if len(tasks) == 1:
+        message = f"{OVERDUE_PREFIX}your task '{title}' has been due since {due_date}."
+    else:
+        message = f"{OVERDUE_PREFIX}{len(tasks)} tasks, the oldest '{title}' since {due_date}."
+    return message[:Notification._meta.get_field('message').max_length]
+
+
+def send_overdue_reminders(today=None, after_user_id=0, chunk_size=None):
+    """
+    Send one digest email and write one notification per user with overdue
+    tasks. Users are handled in chunks of `chunk_size`, each committed on its
+    own, and users already reminded today are skipped, so an interrupted run
+    can simply be started again (or resumed from `after_user_id`). A failed
+    email send raises after recording the users emailed before it.
+
+    Returns timing and volume metrics of the run.
+    """
+    today = today or timezone.localdate()
+    chunk_size = chunk_size or settings.OVERDUE_REMINDER_CHUNK_SIZE
+    day_start = timezone.make_aware(datetime.combine(today, datetime.min.time()))
+    started = time.perf_counter()
+    metrics = dict.fromkeys(('users', 'tasks', 'emails', 'notifications', 'skipped_users', 'chunks'), 0)
+    metrics['last_user_id'] = after_user_id
+
+    connection = get_connection(fail_silently=False)
+    connection.open()
+    try:
+        chunk = []
+        rows = overdue_rows(today, after_user_id).iterator(chunk_size=2000)
+        for (user_id, username, email), user_rows in groupby(rows, key=lambda row: row[:3]):
+            chunk.append((user_id, username, email, [row[3:] for row in user_rows]))
+            if len(chunk) >= chunk_size:
+                _send_chunk(chunk, connection, day_start, metrics)
+                chunk = []
+        if chunk:
+            _send_chunk(chunk, connection, day_start, metrics)
+    finally:
+        connection.close()
+
+    metrics['seconds'] = round(time.perf_counter() - started, 3)
+    logger.info("Overdue reminders: %s", metrics)
+    return metrics
+
+
+def _send_chunk(chunk, connection, day_start, metrics):
+    already_reminded = set(Notification.objects.filter(
+        user_id__in=[user_id for user_id, *_ in chunk],
+        created_at__gte=day_start,
+        message__startswith=OVERDUE_PREFIX,
+    ).order_by().values_list('user_id', flat=True))
+
+    pending = []
+    for user_id, username, email, tasks in chunk:
+        if user_id in already_reminded:
+            metrics['skipped_users'] += 1
+            continue
+        metrics['users'] += 1
+        metrics['tasks'] += len(tasks)
+        message = EmailMessage(
+            f"You have {len(tasks)} overdue task{'s' if len(tasks) != 1 else ''}",
+            digest_message(username, tasks),
+            settings.DEFAULT_FROM_EMAIL,
+            [email],
+        ) if email else None
+        pending.append((Notification(user_id=user_id, message=notification_message(tasks)), message))
+
+    # Notifications are the record of who was reminded, so one is only written
+    # once its email went out. Emails are sent before the chunk's transaction
+    # opens; when one fails, the users emailed so far are still recorded and
+    # the error ends the run.
+    notifications = []
+    try:
+        for notification, message in pending:
+            if message is not None:
+                if not connection.send_messages([message]):
+                    continue
+                metrics['emails'] += 1
+            notifications.append(notification)
+    finally:
+        with transaction.atomic():
+            Notification.objects.bulk_create(notifications)
+            watermarks.bump([notification.user_id for notification in notifications], watermarks.NOTIFICATIONS)
+            for notification in notifications:
+                events.publish(notification.user_id, 'notification.created', {
+                    'id': notification.pk, 'message': notification.message, 'is_read': False,
+                    'created_at': notification.created_at,
+                })
+        metrics['notifications'] += len(notifications)
+    metrics['chunks'] += 1
+    metrics['last_user_id'] = chunk[-1][0]
@@ -0,0 +1,66 @@
+# api/renderers.py
+import msgpack
+import orjson
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+# Serializers format dates as ISO strings. Dates that reach the renderer
+# unformatted (dashboard periods, event payloads) are written by orjson the way
+# DRF would, with UTC as 'Z'; DRF's encoder covers whatever orjson cannot
+# (Decimal, lazy strings, timedelta, querysets).
+_encoder = JSONEncoder()
+ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+
+def dumps(data, indent=False):
+    """JSON bytes of `data`, encoded as the API renders it."""
+    return orjson.dumps(data, default=_encoder.default, option=ORJSON_OPTIONS | (orjson.OPT_INDENT_2 if indent else 0))
+
+
+class ORJSONRenderer(BaseRenderer):
+    """JSON renderer on orjson. Honours an `indent` media type parameter (as 2 spaces)."""
+    media_type = 'application/json'
+    format = 'json'
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        indent = 'indent' in (accepted_media_type or '') or bool((renderer_context or {}).get('indent'))
+        return dumps(data, indent=indent)
+
+
+class MessagePackRenderer(BaseRenderer):
+    """MessagePack for clients that send Accept: application/msgpack (or ?format=msgpack)."""
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        # Dates go out as the same ISO strings as in JSON, so clients can switch formats.
+        return msgpack.packb(data, default=_encoder.default, use_bin_type=True)
+
+
+class ORJSONParser(BaseParser):
+    media_type = 'application/json'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f'JSON parse error - {exc}')
+
+
+class MessagePackParser(BaseParser):
+    media_type = 'application/msgpack'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return msgpack.unpackb(stream.read(), raw=False)
+        except (ValueError, TypeError, msgpack.UnpackException) as exc:
+            raise ParseError(f'MessagePack parse error - {exc}')
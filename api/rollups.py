@@ -0,0 +1,212 @@
+# api/rollups.py
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import Coalesce, TruncDate
+from django.utils import timezone
+
+from . import dashboard_cache
+from .models import DailyTaskRollup, Task
+
+# Task columns needed to work out what a task contributes to the rollups.
+CONTRIBUTION_FIELDS = (
+    'user_id', 'status', 'duration_minutes', 'updated_at',
+    'due_date', 'category_id', 'app_website_id',
+)
+
+REBUILD_BATCH_SIZE = 1000
+
+_state = threading.local()
+
+
+@contextmanager
+def deferred():
+    """
+    Skip per-task rollup updates from signals inside the block. Callers doing
+    bulk writes must call rebuild() for the affected users afterwards.
+    """
+    previous = getattr(_state, 'deferred', False)
+    _state.deferred = True
+    try:
+        yield
+    finally:
+        _state.deferred = previous
+
+
+def is_deferred():
+    return getattr(_state, 'deferred', False)
+
+
+def task_contributions(values):
+    """
+    Return {(date, category_id, app_website_id): (minutes, completed, due_pending)}
+    for a task given as a dict of CONTRIBUTION_FIELDS.
+    """
+    contributions = {}
+    if not values:
+        return contributions
+    category_id = values['category_id']
+    app_website_id = values['app_website_id']
+
+    if values['status'] == 'DONE' and values['updated_at'] is not None:
+        day = timezone.localdate(values['updated_at'])
+        contributions[(day, category_id, app_website_id)] = (values['duration_minutes'] or 0, 1, 0)
+
+    if values['status'] == 'PENDING' and values['due_date'] is not None:
+        key = (values['due_date'], category_id, app_website_id)
+        minutes, completed, _ = contributions.get(key, (0, 0, 0))
+        contributions[key] = (minutes, completed, 1)
+
+    return contributions
+
+
+def snapshot(task):
+    """Contribution values of an in-memory Task instance."""
+    return {field: getattr(task, field) for field in CONTRIBUTION_FIELDS}
+
+
+def apply_change(before, after):
+    """
+    Apply the difference between two task snapshots (either may be None) to the
+    rollup rows of the task's user.
+    """
+    apply_changes((after or before)['user_id'], [(before, after)])
+
+
+def apply_changes(user_id, changes):
+    """
+    apply_change() for many (before, after) snapshot pairs of one user's tasks,
+    with their differences summed so each bucket is written once.
+    """
+    deltas = defaultdict(lambda: [0, 0, 0])
+    for before, after in changes:
+        for sign, snapshot_values in ((-1, before), (1, after)):
+            for key, values in task_contributions(snapshot_values).items():
+                for i, value in enumerate(values):
+                    deltas[key][i] += sign * value
+
+    today = timezone.localdate()
+    with transaction.atomic():
+        changed_days = set()
+        for key, delta in deltas.items():
+            if any(delta):
+                _apply_delta(user_id, key, *delta)
+                changed_days.add(key[0])
+        if any(day < today for day in changed_days):
+            dashboard_cache.invalidate_history([user_id])
+
+
+def _apply_delta(user_id, key, minutes, completed, due_pending):
+    day, category_id, app_website_id = key
+    bucket = DailyTaskRollup.objects.filter(
+        user_id=user_id,
+        date=day,
+        category_id=category_id,
+        app_website_id=app_website_id,
+    )
+    increments = {
+        'completed_minutes': F('completed_minutes') + minutes,
+        'completed_count': F('completed_count') + completed,
+        'due_pending_count': F('due_pending_count') + due_pending,
+    }
+    if bucket.update(**increments):
+        return
+    # Only ever create rows for additions; a missing row on removal means the
+    # rollups were already out of date and `rebuild_rollups` will fix them.
+    if minutes < 0 or completed < 0 or due_pending < 0:
+        return
+    try:
+        with transaction.atomic():
+            DailyTaskRollup.objects.create(
+                user_id=user_id,
+                date=day,
+                category_id=category_id,
+                app_website_id=app_website_id,
+                completed_minutes=minutes,
+                completed_count=completed,
+                due_pending_count=due_pending,
+            )
+    except IntegrityError:
+        # A concurrent write created the bucket first (rollup_bucket_uniq).
+        bucket.update(**increments)
+
+
+def merge_detached(field, instance):
+    """
+    Fold the buckets of a category or app website about to be deleted (`field`
+    is 'category' or 'app_website') into the buckets without one, where the
+    tasks' SET_NULL moves their contributions.
+    """
+    rows = DailyTaskRollup.objects.filter(**{field: instance})
+    with transaction.atomic():
+        for row in rows:
+            key = [row.date, row.category_id, row.app_website_id]
+            key[1 if field == 'category' else 2] = None
+            _apply_delta(row.user_id, tuple(key), row.completed_minutes, row.completed_count, row.due_pending_count)
+        rows.delete()
+
+
+def rebuild(user_ids=None):
+    """
+    Recompute rollup rows from the Task table, for all users or only `user_ids`.
+    Returns the number of rollup rows written.
+    """
+    tasks = Task.objects.all()
+    rollups = DailyTaskRollup.objects.all()
+    if user_ids is not None:
+        tasks = tasks.filter(user_id__in=user_ids)
+        rollups = rollups.filter(user_id__in=user_ids)
+
+    buckets = defaultdict(lambda: [0, 0, 0])
+
+    completed = tasks.filter(status='DONE').annotate(
+        day=TruncDate('updated_at')
+    ).values('user_id', 'day', 'category_id', 'app_website_id').annotate(
+        minutes=Coalesce(Sum('duration_minutes'), 0),
+        completed=Count('id'),
+    ).order_by()
+    for row in completed:
+        bucket = buckets[(row['user_id'], row['day'], row['category_id'], row['app_website_id'])]
+        bucket[0] += row['minutes']
+        bucket[1] += row['completed']
+
+    due = tasks.filter(status='PENDING', due_date__isnull=False).values(
+        'user_id', 'due_date', 'category_id', 'app_website_id'
+    ).annotate(due_pending=Count('id')).order_by()
+    for row in due:
+        buckets[(row['user_id'], row['due_date'], row['category_id'], row['app_website_id'])][2] += row['due_pending']
+
+    with transaction.atomic():
+        rollups.delete()
+        DailyTaskRollup.objects.bulk_create(
+            (
+                DailyTaskRollup(
+                    user_id=user_id,
+                    date=day,
+                    category_id=category_id,
+                    app_website_id=app_website_id,
+                    completed_minutes=minutes,
+                    completed_count=completed_count,
+                    due_pending_count=due_pending,
+                )
+                for (user_id, day, category_id, app_website_id), (minutes, completed_count, due_pending)
+                in buckets.items()
+            ),
+            batch_size=REBUILD_BATCH_SIZE,
+        )
+    dashboard_cache.invalidate(user_ids)
+    dashboard_cache.invalidate_history(user_ids)
+    return len(buckets)
+
+
+def dashboard_rows(user, days):
+    """The rollup rows the dashboard needs for `days`, in one indexed read."""
+    return DailyTaskRollup.objects.filter(user=user, date__in=days).filter(
+        Q(completed_count__gt=0) | Q(due_pending_count__gt=0)
+    ).values(
+        'date', 'category__name', 'app_website__name',
+        'completed_minutes', 'due_pending_count',
+    )
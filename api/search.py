@@ -0,0 +1,86 @@
+# api/search.py
+import re
+
+from django.db import connections
+from django.db.models import FloatField, Q, Value
+
+SEARCH_CONFIG = 'english'
+FTS_TABLE = 'api_task_fts'
+TERM_RE = re.compile(r'\w+', re.UNICODE)
+
+# Databases (by alias) known to have the SQLite FTS5 table.
+_fts_available = {}
+
+
+def task_search_vector():
+    """
+    The weighted tsvector over title and description. The GIN index created in
+    migration 0005 is built on this exact expression, so the two must match.
+    """
+    from django.contrib.postgres.search import SearchVector
+
+    return (
+        SearchVector('title', weight='A', config=SEARCH_CONFIG)
+        + SearchVector('description', weight='B', config=SEARCH_CONFIG)
+    )
+
+
+def search_terms(query):
+    return TERM_RE.findall(query.lower())
+
+
+def search_tasks(queryset, query):
+    """
+    Filter a Task queryset to tasks matching `query`, every term matched as a
+    word prefix (for typeahead), annotated with a `search_rank` (higher is better).
+    """
+    terms = search_terms(query)
+    if not terms:
+        return queryset.none()
+
+    connection = connections[queryset.db]
+    if connection.vendor == 'postgresql':
+        return _search_postgres(queryset, terms)
+    if connection.vendor == 'sqlite' and _has_fts_table(connection):
+        return _search_sqlite(queryset, terms)
+    return _search_icontains(queryset, query)
+
+
+def _search_postgres(queryset, terms):
+    from django.contrib.postgres.search import SearchQuery, SearchRank
+
+    tsquery = SearchQuery(
+        ' & '.join(f'{term}:*' for term in terms),
+        search_type='raw',
+        config=SEARCH_CONFIG,
+    )
+    vector = task_search_vector()
+    return queryset.annotate(search_vector=vector).filter(search_vector=tsquery).annotate(
+        search_rank=SearchRank(vector, tsquery)
+    )
+
+
+def _search_sqlite(queryset, terms):
+    match = ' '.join(f'"{term}"*' for term in terms)
+    # Join the FTS table once; a correlated bm25() subquery would re-run the
+    # MATCH for every row. The unary + keeps SQLite from driving the FTS table
+    # by rowid (same problem), so it runs the MATCH first and joins tasks by
+    # primary key. bm25() is lower for better matches, so negate it.
+    return queryset.extra(
+        select={'search_rank': f'-bm25({FTS_TABLE})'},
+        tables=[FTS_TABLE],
+        where=[f'+{FTS_TABLE}.rowid = api_task.id', f'{FTS_TABLE} MATCH %s'],
+        params=[match],
+    )
+
+
+def _search_icontains(queryset, query):
+    return queryset.filter(
+        Q(title__icontains=query) | Q(description__icontains=query)
+    ).annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+
+def _has_fts_table(connection):
+    if connection.alias not in _fts_available:
+        _fts_available[connection.alias] = FTS_TABLE in connection.introspection.table_names()
+    return _fts_available[connection.alias]
@@ -1,9 +1,14 @@
 from rest_framework import serializers
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.utils import timezone
 from .models import Notification, Task, Category, AppWebsite, Project, Subtask
 import json
 from django.contrib.auth.password_validation import validate_password
 from rest_framework.exceptions import ValidationError
+from .fieldsets import SparseFieldsetSerializerMixin
+from .metrics import project_stats
+from .periods import PERIODS, period_bounds
 
 User = get_user_model()
 
@@ -13,8 +18,42 @@ class SubtaskSerializer(serializers.ModelSerializer):
         fields = ['id', 'title', 'completed']
         read_only_fields = ['id']
 
-class TaskSerializer(serializers.ModelSerializer):
+class UserOwnedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    Only accepts objects owned by the requesting user. When the view preloads
+    them into context['related_objects'] ({model: {pk: obj}}), lookups are
+    served from there instead of one query per value.
+    """
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        request = self.context.get('request')
+        if request is not None:
+            queryset = queryset.filter(user=request.user)
+        return queryset
+
+    def to_internal_value(self, data):
+        preloaded = self.context.get('related_objects', {}).get(self.queryset.model)
+        if preloaded is None:
+            return super().to_internal_value(data)
+        if isinstance(data, bool):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            return preloaded[int(data)]
+        except KeyError:
+            self.fail('does_not_exist', pk_value=data)
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+
+
+class TaskSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
+    # Relations whose names can be inlined as `<field>_name` via the 'expand' context
+    EXPANDABLE_FIELDS = ('category', 'app_website', 'project')
+
     subtasks = SubtaskSerializer(many=True, read_only=True)
+    category = UserOwnedPrimaryKeyRelatedField(queryset=Category.objects.all(), required=False, allow_null=True)
+    app_website = UserOwnedPrimaryKeyRelatedField(queryset=AppWebsite.objects.all(), required=False, allow_null=True)
+    project = UserOwnedPrimaryKeyRelatedField(queryset=Project.objects.all(), required=False, allow_null=True)
 
     class Meta:
         model = Task
@@ -33,7 +72,14 @@ class TaskSerializer(serializers.ModelSerializer):
     def update(self, instance, validated_data):
         return super().update(instance, validated_data)
 
-class NotificationSerializer(serializers.ModelSerializer):
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        for field in self.context.get('expand', ()):
+            related = getattr(instance, field)
+            data[f'{field}_name'] = related.name if related else None
+        return data
+
+class NotificationSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Notification
         fields = '__all__'
@@ -82,7 +128,7 @@ class ChangePasswordSerializer(serializers.Serializer):
             raise serializers.ValidationError({"new_password": "New passwords must match."})
         return data
 
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Category
         fields = ['id', 'name', 'description', 'created_at', 'updated_at']
@@ -92,7 +138,7 @@ class CategorySerializer(serializers.ModelSerializer):
         validated_data['user'] = self.context['request'].user
         return super().create(validated_data)
 
-class AppWebsiteSerializer(serializers.ModelSerializer):
+class AppWebsiteSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = AppWebsite
         fields = ['id', 'name', 'description', 'created_at', 'updated_at']
@@ -102,7 +148,7 @@ class AppWebsiteSerializer(serializers.ModelSerializer):
         validated_data['user'] = self.context['request'].user
         return super().create(validated_data)
 
-class ProjectSerializer(serializers.ModelSerializer):
+class ProjectSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Project
         fields = ['id', 'name', 'description', 'created_at', 'updated_at']
@@ -111,3 +157,105 @@ class ProjectSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         validated_data['user'] = self.context['request'].user
         return super().create(validated_data)
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        # With the 'stats' context the view has annotated metrics.project_stats_expressions().
+        if self.context.get('stats'):
+            data['stats'] = project_stats(instance)
+        return data
+
+class TaskBulkSerializer(serializers.Serializer):
+    """Envelope of a batch request: tasks to create, partial updates (with 'id') and ids to delete."""
+    create = serializers.ListField(child=serializers.DictField(), required=False, default=list)
+    update = serializers.ListField(child=serializers.DictField(), required=False, default=list)
+    delete = serializers.ListField(child=serializers.IntegerField(), required=False, default=list)
+
+    def validate_update(self, value):
+        ids = [item.get('id') for item in value]
+        if not all(isinstance(pk, int) and not isinstance(pk, bool) for pk in ids):
+            raise serializers.ValidationError("Every update needs an integer 'id'.")
+        if len(set(ids)) != len(ids):
+            raise serializers.ValidationError("Each task can only be updated once per batch.")
+        return value
+
+    def validate_delete(self, value):
+        if len(set(value)) != len(value):
+            raise serializers.ValidationError("Each task can only be deleted once per batch.")
+        return value
+
+    def validate(self, data):
+        total = len(data['create']) + len(data['update']) + len(data['delete'])
+        if total == 0:
+            raise serializers.ValidationError("No operations given.")
+        if total > settings.TASK_BULK_MAX_OPERATIONS:
+            raise serializers.ValidationError(
+                f"At most {settings.TASK_BULK_MAX_OPERATIONS} operations are allowed per batch."
+            )
+        if set(item['id'] for item in data['update']) & set(data['delete']):
+            raise serializers.ValidationError("A task cannot be updated and deleted in the same batch.")
+        return data
+
+
+class NotificationIdsSerializer(serializers.Serializer):
+    """Ids of the requesting user's notifications for a bulk action."""
+    ids = serializers.ListField(child=serializers.IntegerField(), allow_empty=False, max_length=1000)
+
+
+class OccurrenceWindowSerializer(serializers.Serializer):
+    """?start= and ?end= (inclusive) of a planner date window."""
+    # Setting holding the widest window allowed.
+    max_days_setting = 'RECURRENCE_MAX_WINDOW_DAYS'
+
+    start = serializers.DateField()
+    end = serializers.DateField()
+
+    def validate(self, data):
+        max_days = getattr(settings, self.max_days_setting)
+        if data['end'] < data['start']:
+            raise serializers.ValidationError("end must not be before start.")
+        if (data['end'] - data['start']).days + 1 > max_days:
+            raise serializers.ValidationError(f"The window can span at most {max_days} days.")
+        return data
+
+
+class CalendarQuerySerializer(OccurrenceWindowSerializer):
+    """Calendar window plus ?top=, the number of tasks to list per day."""
+    max_days_setting = 'CALENDAR_MAX_WINDOW_DAYS'
+
+    top = serializers.IntegerField(min_value=0, max_value=20, default=0)
+
+
+class DashboardPeriodSerializer(serializers.Serializer):
+    """
+    ?period= and ?date= (default today) of the dashboard metrics, or a custom
+    ?start_date= / ?end_date= range. Validates to {period, start, end}.
+    """
+    period = serializers.ChoiceField(choices=PERIODS, required=False)
+    date = serializers.DateField(required=False)
+    start_date = serializers.DateField(required=False)
+    end_date = serializers.DateField(required=False)
+
+    def validate(self, data):
+        has_range = 'start_date' in data or 'end_date' in data
+        period = data.get('period') or ('custom' if has_range else 'day')
+        if period != 'custom':
+            start, end = period_bounds(period, data.get('date') or data.get('start_date') or timezone.localdate())
+            return {'period': period, 'start': start, 'end': end}
+
+        if 'start_date' not in data or 'end_date' not in data:
+            raise serializers.ValidationError("A custom period needs start_date and end_date.")
+        start, end = data['start_date'], data['end_date']
+        if end < start:
+            raise serializers.ValidationError("end_date must not be before start_date.")
+        if (end - start).days + 1 > settings.DASHBOARD_MAX_PERIOD_DAYS:
+            raise serializers.ValidationError(
+                f"The period can span at most {settings.DASHBOARD_MAX_PERIOD_DAYS} days."
+            )
+        return {'period': period, 'start': start, 'end': end}
+
+
+class TaskOccurrenceSerializer(serializers.Serializer):
+    """New state of one occurrence of a recurring task; PENDING clears a stored exception."""
+    date = serializers.DateField()
+    status = serializers.ChoiceField(choices=['PENDING', 'DONE', 'SKIPPED'])
@@ -0,0 +1,116 @@
+# api/signals.py
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from . import authentication, dashboard_cache, events, rollups, watermarks
+from .models import AppWebsite, Category, Notification, Project, Subtask, Task
+from .serializers import NotificationSerializer
+
+
+@receiver(pre_save, sender=Task)
+def remember_task_rollup_state(sender, instance, raw=False, **kwargs):
+    # Read the stored row rather than trusting the instance, which may be stale.
+    if raw or instance.pk is None or rollups.is_deferred():
+        instance._rollup_before = None
+        return
+    instance._rollup_before = Task.objects.filter(pk=instance.pk).values(*rollups.CONTRIBUTION_FIELDS).first()
+
+
+@receiver(post_save, sender=Task)
+def update_rollups_on_task_save(sender, instance, raw=False, **kwargs):
+    if raw or rollups.is_deferred():
+        return
+    rollups.apply_change(getattr(instance, '_rollup_before', None), rollups.snapshot(instance))
+    instance._rollup_before = None
+
+
+@receiver(post_delete, sender=Task)
+def update_rollups_on_task_delete(sender, instance, **kwargs):
+    if rollups.is_deferred():
+        return
+    rollups.apply_change(rollups.snapshot(instance), None)
+
+
+@receiver(pre_delete, sender=Category)
+@receiver(pre_delete, sender=AppWebsite)
+def merge_detached_rollups(sender, instance, **kwargs):
+    # SET_NULL would otherwise turn the buckets into duplicates of the unassigned ones.
+    rollups.merge_detached('category' if sender is Category else 'app_website', instance)
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=AppWebsite)
+@receiver(post_delete, sender=AppWebsite)
+def invalidate_dashboard_cache(sender, instance, raw=False, **kwargs):
+    if not raw:
+        dashboard_cache.invalidate([instance.user_id])
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=AppWebsite)
+@receiver(post_delete, sender=AppWebsite)
+def invalidate_dashboard_history(sender, instance, raw=False, **kwargs):
+    # Past buckets are grouped by category and app names.
+    if not raw:
+        dashboard_cache.invalidate_history([instance.user_id])
+
+
+# List resources each model's rows appear in. Tasks embed their subtasks and,
+# with ?expand=, their category, app/website and project.
+WATERMARK_RESOURCES = {
+    Task: (watermarks.TASKS,),
+    Notification: (watermarks.NOTIFICATIONS,),
+    Category: (watermarks.CATEGORIES, watermarks.TASKS),
+    AppWebsite: (watermarks.APP_WEBSITES, watermarks.TASKS),
+    Project: (watermarks.PROJECTS, watermarks.TASKS),
+}
+
+
+def bump_watermarks(sender, instance, raw=False, **kwargs):
+    if not raw:
+        watermarks.bump([instance.user_id], *WATERMARK_RESOURCES[sender])
+
+
+for model in WATERMARK_RESOURCES:
+    post_save.connect(bump_watermarks, sender=model, dispatch_uid=f'bump_watermarks_save_{model.__name__}')
+    post_delete.connect(bump_watermarks, sender=model, dispatch_uid=f'bump_watermarks_delete_{model.__name__}')
+
+
+@receiver(post_save, sender=Subtask)
+@receiver(post_delete, sender=Subtask)
+def bump_task_watermark_for_subtask(sender, instance, raw=False, origin=None, **kwargs):
+    # Deleting tasks cascades to their subtasks; the task deletes bump already.
+    if raw or isinstance(origin, Task) or getattr(origin, 'model', None) is Task:
+        return
+    user_id = Task.objects.filter(pk=instance.task_id).values_list('user_id', flat=True).first()
+    if user_id is not None:
+        watermarks.bump([user_id], watermarks.TASKS)
+
+
+@receiver(post_save, sender=Notification)
+def push_notification_created(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        events.publish(instance.user_id, 'notification.created', NotificationSerializer(instance).data)
+
+
+@receiver(post_save, sender=Task)
+def push_task_saved(sender, instance, created, raw=False, **kwargs):
+    if not raw:
+        events.publish(instance.user_id, 'task.created' if created else 'task.updated', {'id': instance.pk})
+
+
+@receiver(post_delete, sender=Task)
+def push_task_deleted(sender, instance, **kwargs):
+    events.publish(instance.user_id, 'task.deleted', {'id': instance.pk})
+
+
+@receiver(post_save, sender=get_user_model())
+@receiver(post_delete, sender=get_user_model())
+def invalidate_cached_user(sender, instance, **kwargs):
+    # Covers password changes and resets, profile updates and deactivation.
+    authentication.invalidate_user(instance)
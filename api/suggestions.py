@@ -0,0 +1,162 @@
+# api/suggestions.py
+import logging
+import time
+from datetime import timedelta
+from itertools import islice
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils import timezone
+
+from . import ai, dashboard_cache
+from .ai_helper import suggest_task_for_user as mock_suggestion
+from .models import Task
+
+logger = logging.getLogger(__name__)
+
+User = get_user_model()
+
+# Precomputed suggestions are written by Celery and only read by requests.
+SUGGESTION_KEY = 'ai:suggestion:{user_id}'
+PENDING_KEY = 'ai:suggestion:pending:{user_id}'
+AI_MESSAGE = "AI-generated productivity suggestion"
+
+
+class CircuitBreaker:
+    """
+    Stops calls to a failing dependency. After `failure_threshold` failures
+    within `reset_timeout` seconds the circuit opens and allow() is False; once
+    `reset_timeout` has passed a single probe call is let through, closing the
+    circuit again on success and reopening it on failure. State lives in the
+    cache: with REDIS_CACHE_URL every worker shares one circuit, otherwise each
+    process (web workers and Celery alike) trips and recovers its own.
+    """
+
+    def __init__(self, name, failure_threshold=None, reset_timeout=None):
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self.failures_key = f'circuit:{name}:failures'
+        self.opened_key = f'circuit:{name}:opened_at'
+        self.probe_key = f'circuit:{name}:probe'
+
+    @property
+    def failure_threshold(self):
+        return self._failure_threshold or settings.AI_CIRCUIT_FAILURE_THRESHOLD
+
+    @property
+    def reset_timeout(self):
+        return self._reset_timeout or settings.AI_CIRCUIT_RESET_SECONDS
+
+    def is_open(self):
+        opened_at = cache.get(self.opened_key)
+        return opened_at is not None and time.time() - opened_at < self.reset_timeout
+
+    def allow(self):
+        opened_at = cache.get(self.opened_key)
+        if opened_at is None:
+            return True
+        if time.time() - opened_at < self.reset_timeout:
+            return False
+        return cache.add(self.probe_key, 1, timeout=self.reset_timeout)
+
+    def record_success(self):
+        cache.delete_many([self.failures_key, self.opened_key, self.probe_key])
+
+    def record_failure(self):
+        if cache.add(self.failures_key, 1, timeout=self.reset_timeout):
+            failures = 1
+        else:
+            failures = cache.incr(self.failures_key)
+        if failures >= self.failure_threshold or cache.get(self.opened_key) is not None:
+            cache.set(self.opened_key, time.time(), timeout=None)
+            cache.delete(self.probe_key)
+
+
+breaker = CircuitBreaker('openai')
+
+
+def fallback():
+    return {**mock_suggestion(None), 'source': 'fallback'}
+
+
+def get_suggestion(user):
+    """
+    The user's precomputed suggestion, or a mock tip when there is none yet.
+    Never calls the LLM; a missing suggestion is queued for Celery instead.
+    """
+    if user is None or not user.is_authenticated:
+        return fallback()
+    entry = cache.get(SUGGESTION_KEY.format(user_id=user.pk))
+    if entry is not None:
+        return entry
+    if ai.ai_configured() and not breaker.is_open():
+        schedule_refresh(user.pk)
+    return fallback()
+
+
+def suggest_task_for_user(user):
+    return get_suggestion(user)['suggestion']
+
+
+def schedule_refresh(user_id):
+    """Queue one refresh per user at a time; losing the broker only costs the precompute."""
+    if not cache.add(PENDING_KEY.format(user_id=user_id), 1, timeout=settings.AI_SUGGESTION_PENDING_TTL):
+        return
+    from .tasks import refresh_ai_suggestions
+
+    try:
+        refresh_ai_suggestions.apply_async(([user_id],), retry=False)
+    except Exception as e:
+        cache.delete(PENDING_KEY.format(user_id=user_id))
+        logger.warning(f"Could not queue AI suggestion refresh for user {user_id}: {e}")
+
+
+def refresh(user):
+    """
+    Ask the LLM for `user`'s suggestion and cache it. Returns True when a new
+    suggestion was stored, False when the call failed and None when the circuit
+    did not allow it; either way the old entry is kept.
+    """
+    if not breaker.allow():
+        return None
+    try:
+        suggestion = ai.request_suggestion(user)
+    except Exception as e:
+        breaker.record_failure()
+        logger.warning(f"AI suggestion failed for user {user.pk}: {e}")
+        return False
+    breaker.record_success()
+    cache.set(
+        SUGGESTION_KEY.format(user_id=user.pk),
+        {'suggestion': suggestion, 'message': AI_MESSAGE, 'source': 'ai'},
+        timeout=settings.AI_SUGGESTION_CACHE_TTL,
+    )
+    # Let today's dashboard pick the new suggestion up instead of a cached tip.
+    dashboard_cache.invalidate_ai_insight(user.pk, timezone.localdate())
+    return True
+
+
+def refresh_users(user_ids):
+    """Refresh the suggestions of `user_ids`, stopping early while the circuit is open."""
+    metrics = {'refreshed': 0, 'failed': 0, 'skipped': 0}
+    users = list(User.objects.filter(pk__in=user_ids).only('id', 'username'))
+    for index, user in enumerate(users):
+        cache.delete(PENDING_KEY.format(user_id=user.pk))
+        refreshed = refresh(user)
+        if refreshed is None:
+            metrics['skipped'] = len(users) - index
+            break
+        metrics['refreshed' if refreshed else 'failed'] += 1
+    return metrics
+
+
+def active_user_id_chunks(chunk_size=None, now=None):
+    """Ids of users who touched a task within AI_SUGGESTION_ACTIVE_DAYS, in lists of `chunk_size`."""
+    chunk_size = chunk_size or settings.AI_SUGGESTION_CHUNK_SIZE
+    since = (now or timezone.now()) - timedelta(days=settings.AI_SUGGESTION_ACTIVE_DAYS)
+    ids = Task.objects.filter(updated_at__gte=since).order_by('user_id').values_list(
+        'user_id', flat=True,
+    ).distinct().iterator(chunk_size=chunk_size)
+    while chunk := list(islice(ids, chunk_size)):
+        yield chunk
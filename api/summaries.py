@@ -0,0 +1,67 @@
+# api/summaries.py
+import logging
+import time
+from itertools import islice
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.mail import EmailMessage, get_connection
+
+from .metrics import task_status_counts_by_user
+from .models import Task
+
+logger = logging.getLogger(__name__)
+
+User = get_user_model()
+
+EMPTY_COUNTS = {'total': 0, 'done': 0, 'pending': 0, 'overdue': 0}
+
+
+def recipient_id_chunks(chunk_size=None):
+    """Stream the ids of users with an email address in lists of `chunk_size`."""
+    chunk_size = chunk_size or settings.PRODUCTIVITY_SUMMARY_CHUNK_SIZE
+    ids = User.objects.exclude(email='').exclude(email__isnull=True).order_by('id').values_list(
+        'id', flat=True,
+    ).iterator(chunk_size=chunk_size)
+    while chunk := list(islice(ids, chunk_size)):
+        yield chunk
+
+
+def summary_message(username, counts):
+    return (
+        f"Hi {username},\n\n"
+        f"Here's your task summary for today:\n"
+        f"- Total tasks: {counts['total']}\n"
+        f"- Completed: {counts['done']}\n"
+        f"- Pending: {counts['pending']}\n"
+        f"- Overdue: {counts['overdue']}\n\n"
+        "Keep up the great work!\n\n"
+        "— Your AI Productivity Dashboard"
+    )
+
+
+def send_summary_chunk(user_ids, today):
+    """
+    Email the daily summary to `user_ids`: one user query, one grouped count
+    query and one mail connection for the whole chunk. Returns emails sent.
+    """
+    started = time.perf_counter()
+    counts = task_status_counts_by_user(Task.objects.filter(user_id__in=user_ids), today)
+    messages = [
+        EmailMessage(
+            "Your Daily Productivity Summary",
+            summary_message(username, counts.get(user_id, EMPTY_COUNTS)),
+            settings.DEFAULT_FROM_EMAIL,
+            [email],
+        )
+        for user_id, username, email in User.objects.filter(pk__in=user_ids).exclude(email='').values_list(
+            'id', 'username', 'email',
+        )
+    ]
+    with get_connection(fail_silently=True) as connection:
+        sent = connection.send_messages(messages) or 0
+    logger.info(
+        "Productivity summary: %s of %s emails sent for users %s-%s in %.3fs",
+        sent, len(messages), user_ids[0], user_ids[-1], time.perf_counter() - started,
+    )
+    return sent
@@ -1,13 +1,30 @@
 # api/tests.py
 
+import asyncio
 import json
-from django.test import TestCase, Client
+import os
+import subprocess
+import sys
+import threading
+import time
+import msgpack
+from smtplib import SMTPException
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from asgiref.sync import sync_to_async
+from django.test import TestCase, Client, override_settings
 from django.urls import reverse
 from django.contrib.auth import get_user_model
 from rest_framework import status
 from datetime import timedelta
 from django.utils import timezone
 from unittest.mock import patch
+from io import StringIO
+from django.core.management import call_command
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, connection, transaction
+from django.db.models import F
+from django.test.utils import CaptureQueriesContext
 
 # Import for password reset token and encoding
 from django.contrib.auth.tokens import default_token_generator
@@ -15,8 +32,12 @@ from django.utils.encoding import force_bytes
 from django.utils.http import urlsafe_base64_encode
 
 # Import models and serializers
-from .models import Task, Category, AppWebsite, Project
-from .serializers import UserRegisterSerializer, ChangePasswordSerializer
+from .models import Task, TaskOccurrence, Category, AppWebsite, Project, DailyTaskRollup, Subtask, Notification
+from .pagination import KeysetPagination, SafePageNumberPagination
+from . import authentication, dashboard_cache, db_pool, events, metrics, query_plans, recurrence, reminders, renderers, rollups, suggestions, summaries
+from .mock_data import MockDataGenerator
+from .search import search_tasks
+from .serializers import UserRegisterSerializer, ChangePasswordSerializer, TaskSerializer
 
 User = get_user_model()
 
@@ -293,6 +314,7 @@ class DashboardMetricsViewTests(TestCase):
     """
 
     def setUp(self):
+        cache.clear()
         self.client = Client()
         self.user = User.objects.create_user(username='dashuser', email='dash@example.com', password='password123')
         response = self.client.post(
@@ -345,5 +367,1659 @@ class DashboardMetricsViewTests(TestCase):
         self.assertIn("Complete a task to get your first insight!", data['aiInsights'][1]['text'])
         self.assertEqual(data['tasksDueToday'], 0)
 
-    # Additional dashboard tests can be added here similarly
+    @patch('api.views.suggest_task_for_user')
+    @override_settings(AUTH_USER_CACHE_TTL=60)
+    def test_dashboard_metrics_cached_until_tasks_change(self, mock_suggest_task_for_user):
+        mock_suggest_task_for_user.return_value = "Review documentation"
+
+        self.client.get(reverse('dashboard_metrics'))
+        with self.assertNumQueries(0):  # the user and the payload both come from the cache
+            self.client.get(reverse('dashboard_metrics'))
+        self.assertEqual(dashboard_cache.stats()['hits'], 1)
+
+        self.create_task('Focus block', 'DONE', 90, self.work_category)
+        data = self.client.get(reverse('dashboard_metrics')).json()
+        self.assertEqual(data['workHours'], {'hours': 1, 'minutes': 30})
+        self.assertEqual(dashboard_cache.stats()['misses'], 2)
+        # The AI insight keeps its own TTL and is not asked for again.
+        self.assertEqual(mock_suggest_task_for_user.call_count, 1)
+        self.assertIn("AI suggests: Review documentation", data['aiInsights'][0]['text'])
+
+    @patch('api.views.suggest_task_for_user')
+    def test_dashboard_metrics_does_not_cache_ai_failures(self, mock_suggest_task_for_user):
+        mock_suggest_task_for_user.side_effect = RuntimeError('down')
+        self.client.get(reverse('dashboard_metrics'))
+        self.client.get(reverse('dashboard_metrics'))
+        self.assertEqual(mock_suggest_task_for_user.call_count, 2)
+
+    def test_rebuild_invalidates_cached_dashboards(self):
+        day = timezone.localdate()
+        self.assertEqual(dashboard_cache.cached_payload(self.user.pk, day, lambda: {'n': 1}), {'n': 1})
+        self.assertEqual(dashboard_cache.cached_payload(self.user.pk, day, lambda: {'n': 2}), {'n': 1})
+        rollups.rebuild(user_ids=[self.user.pk])
+        self.assertEqual(dashboard_cache.cached_payload(self.user.pk, day, lambda: {'n': 3}), {'n': 3})
+        rollups.rebuild()
+        self.assertEqual(dashboard_cache.cached_payload(self.user.pk, day, lambda: {'n': 4}), {'n': 4})
+
+
+class DailyTaskRollupTests(TestCase):
+    """
+    Tests for the incrementally maintained dashboard rollups.
+    """
+
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create_user(username='rollupuser', email='rollup@example.com', password='password123')
+        response = self.client.post(
+            reverse('token_obtain_pair'),
+            {'username': 'rollupuser', 'password': 'password123'},
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.client.defaults['HTTP_AUTHORIZATION'] = f"Bearer {response.json()['access']}"
+
+        self.today = timezone.localdate()
+        self.work_category = Category.objects.create(user=self.user, name='Work')
+        self.focus_category = Category.objects.create(user=self.user, name='Focus')
+        self.app_website = AppWebsite.objects.create(user=self.user, name='IDE')
+
+    def rollup_totals(self):
+        rows = DailyTaskRollup.objects.filter(user=self.user)
+        totals = {}
+        for row in rows:
+            key = (row.date, row.category_id, row.app_website_id)
+            minutes, completed, due = totals.get(key, (0, 0, 0))
+            totals[key] = (
+                minutes + row.completed_minutes,
+                completed + row.completed_count,
+                due + row.due_pending_count,
+            )
+        return {key: value for key, value in totals.items() if value != (0, 0, 0)}
+
+    def assert_matches_rebuild(self):
+        incremental = self.rollup_totals()
+        rollups.rebuild(user_ids=[self.user.id])
+        self.assertEqual(incremental, self.rollup_totals())
+
+    def test_task_lifecycle_keeps_rollups_in_sync(self):
+        task = Task.objects.create(
+            user=self.user, title='Write report', status='PENDING', due_date=self.today,
+            duration_minutes=45, category=self.work_category, app_website=self.app_website,
+        )
+        self.assertEqual(
+            self.rollup_totals(),
+            {(self.today, self.work_category.id, self.app_website.id): (0, 0, 1)}
+        )
+
+        task.status = 'DONE'
+        task.save()
+        self.assertEqual(
+            self.rollup_totals(),
+            {(self.today, self.work_category.id, self.app_website.id): (45, 1, 0)}
+        )
+
+        task.category = self.focus_category
+        task.duration_minutes = 30
+        task.save()
+        self.assert_matches_rebuild()
+
+        task.delete()
+        self.assertEqual(self.rollup_totals(), {})
+
+    def test_deleting_a_category_merges_its_buckets(self):
+        Task.objects.create(
+            user=self.user, title='Meeting', status='DONE', duration_minutes=30,
+            category=self.work_category, app_website=self.app_website,
+        )
+        review = Task.objects.create(
+            user=self.user, title='Review', status='DONE', duration_minutes=10, app_website=self.app_website,
+        )
+        self.work_category.delete()
+        review.duration_minutes = 20
+        review.save()
+        self.assertEqual(self.rollup_totals(), {(self.today, None, self.app_website.id): (50, 2, 0)})
+        self.assertEqual(DailyTaskRollup.objects.filter(user=self.user).count(), 1)
+        self.assert_matches_rebuild()
+
+    def test_one_row_per_bucket(self):
+        DailyTaskRollup.objects.create(user=self.user, date=self.today)
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            DailyTaskRollup.objects.create(user=self.user, date=self.today)
+
+    def test_dashboard_reads_rollups_in_one_query(self):
+        Task.objects.create(
+            user=self.user, title='Deep work', status='DONE', duration_minutes=90,
+            category=self.focus_category, app_website=self.app_website,
+        )
+        Task.objects.create(
+            user=self.user, title='Meeting', status='DONE', duration_minutes=30,
+            category=self.work_category,
+        )
+        Task.objects.create(user=self.user, title='Due soon', status='PENDING', due_date=self.today)
+
+        # One query for the JWT user lookup, one for the rollups.
+        with patch('api.views.suggest_task_for_user', return_value='Plan ahead'), self.assertNumQueries(2):
+            response = self.client.get(reverse('dashboard_metrics'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()
+        self.assertEqual(data['workHours'], {'hours': 2, 'minutes': 0})
+        self.assertEqual(data['focusPercent'], 75)
+        self.assertEqual(data['dailySummary'], {'labels': ['Focus', 'Work'], 'data': [90, 30]})
+        self.assertEqual(data['productiveApps'], [{'name': 'IDE', 'minutes': 90}])
+        self.assertEqual(data['tasksDueToday'], 1)
+
+    def test_rebuild_command(self):
+        Task.objects.create(user=self.user, title='Pending', status='PENDING', due_date=self.today)
+        DailyTaskRollup.objects.all().delete()
+        call_command('rebuild_rollups', user_ids=[self.user.id], stdout=StringIO())
+        self.assertEqual(self.rollup_totals(), {(self.today, None, None): (0, 0, 1)})
+
+
+class DashboardMetricsQueryTests(TestCase):
+    """
+    Tests for the shared single-pass metrics queries.
+    """
+
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create_user(username='metricsuser', email='metrics@example.com', password='password123')
+        response = self.client.post(
+            reverse('token_obtain_pair'),
+            {'username': 'metricsuser', 'password': 'password123'},
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.client.defaults['HTTP_AUTHORIZATION'] = f"Bearer {response.json()['access']}"
+
+        self.today = timezone.localdate()
+        self.work_category = Category.objects.create(user=self.user, name='Work')
+        self.focus_category = Category.objects.create(user=self.user, name='Focus')
+        self.app_website = AppWebsite.objects.create(user=self.user, name='IDE')
+
+    def add_categories(self, count):
+        existing = Category.objects.filter(user=self.user).count()
+        for i in range(existing, existing + count):
+            category = Category.objects.create(user=self.user, name=f'Extra {i}')
+            Task.objects.create(
+                user=self.user, title=f'Extra task {i}', status='DONE',
+                duration_minutes=10, category=category, app_website=self.app_website,
+            )
+
+    def test_live_and_rollup_summaries_agree(self):
+        Task.objects.create(
+            user=self.user, title='Deep work', status='DONE', duration_minutes=90,
+            category=self.focus_category, app_website=self.app_website,
+        )
+        Task.objects.create(user=self.user, title='Meeting', status='DONE', duration_minutes=30, category=self.work_category)
+        Task.objects.create(user=self.user, title='Due today', status='PENDING', due_date=self.today)
+        Task.objects.create(user=self.user, title='Overdue', status='PENDING', due_date=self.today - timedelta(days=3))
+        self.add_categories(3)
+
+        self.assertEqual(metrics.live_summary(self.user, self.today), metrics.rollup_summary(self.user, self.today))
+
+    @override_settings(DASHBOARD_METRICS_SOURCE='live', AUTH_USER_CACHE_TTL=60)
+    def test_live_dashboard_query_count_is_independent_of_categories(self):
+        self.client.get(reverse('dashboard_metrics'))  # caches the JWT user
+        for extra_categories in (1, 10):
+            self.add_categories(extra_categories)
+            # Headline aggregate, category group-by, app group-by.
+            with patch('api.views.suggest_task_for_user', return_value='Plan ahead'), self.assertNumQueries(3):
+                response = self.client.get(reverse('dashboard_metrics'))
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_task_status_counts(self):
+        Task.objects.create(user=self.user, title='Done', status='DONE')
+        Task.objects.create(user=self.user, title='Pending', status='PENDING', due_date=self.today)
+        Task.objects.create(user=self.user, title='Overdue', status='PENDING', due_date=self.today - timedelta(days=1))
+
+        with self.assertNumQueries(1):
+            counts = metrics.task_status_counts(Task.objects.filter(user=self.user), self.today)
+        self.assertEqual(counts, {'total': 3, 'done': 1, 'pending': 2, 'overdue': 1})
+
+
+class DashboardPeriodTests(TestCase):
+    """
+    Tests for ?period=, ?date= and custom ?start_date=/?end_date= dashboard metrics.
+    """
+
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create_user(username='perioduser', email='period@example.com', password='password123')
+        response = self.client.post(
+            reverse('token_obtain_pair'),
+            {'username': 'perioduser', 'password': 'password123'},
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.client.defaults['HTTP_AUTHORIZATION'] = f"Bearer {response.json()['access']}"
+
+        self.today = timezone.localdate()
+        self.work_category = Category.objects.create(user=self.user, name='Work')
+        self.focus_category = Category.objects.create(user=self.user, name='Focus')
+        self.app_website = AppWebsite.objects.create(user=self.user, name='IDE')
+        patcher = patch('api.views.suggest_task_for_user', return_value='Plan ahead')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def days_ago(self, days):
+        return self.today - timedelta(days=days)
+
+    def add_rollup(self, day, category, minutes, app_website=None):
+        DailyTaskRollup.objects.create(
+            user=self.user, date=day, category=category, app_website=app_website,
+            completed_minutes=minutes, completed_count=1,
+        )
+
+    def get_period(self, url_name='dashboard_metrics', **params):
+        return self.client.get(reverse(url_name), {key: str(value) for key, value in params.items()})
+
+    def test_custom_period_totals_series_and_comparison(self):
+        self.add_rollup(self.days_ago(4), self.work_category, 60, self.app_website)
+        self.add_rollup(self.days_ago(2), self.focus_category, 30)
+        self.add_rollup(self.days_ago(6), self.work_category, 20)  # previous period
+        self.add_rollup(self.days_ago(1), self.work_category, 500)  # after the period
+
+        response = self.get_period(start_date=self.days_ago(4), end_date=self.days_ago(2))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()
+        self.assertEqual(data['period'], {
+            'kind': 'custom',
+            'start': self.days_ago(4).isoformat(),
+            'end': self.days_ago(2).isoformat(),
+            'previousStart': self.days_ago(7).isoformat(),
+            'previousEnd': self.days_ago(5).isoformat(),
+        })
+        self.assertEqual(data['workHours'], {'hours': 1, 'minutes': 30})
+        self.assertEqual(data['workHoursTrend'], 'increase')
+        self.assertEqual(data['dailySummary'], {'labels': ['Focus', 'Work'], 'data': [30, 60]})
+        self.assertEqual(data['productiveApps'], [{'name': 'IDE', 'minutes': 60}])
+        self.assertEqual(data['comparison']['workMinutes'], {'current': 90, 'previous': 20})
+        self.assertEqual(data['comparison']['completions'], {'current': 2, 'previous': 1})
+        self.assertEqual(data['series'], {
+            'granularity': 'day',
+            'labels': [self.days_ago(days).isoformat() for days in (4, 3, 2)],
+            'minutesByCategory': {'Focus': [0, 0, 30], 'Work': [60, 0, 0]},
+            'minutesByApp': {'IDE': [60, 0, 0]},
+            'completions': [1, 0, 1],
+        })
+
+    def test_year_is_bucketed_by_month(self):
+        last_year = self.today.year - 1
+        self.add_rollup(self.today.replace(year=last_year, month=3, day=15), self.work_category, 45)
+        self.add_rollup(self.today.replace(year=last_year, month=3, day=20), self.work_category, 15)
+
+        response = self.get_period(period='year', date=self.today.replace(year=last_year, month=6, day=1))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        series = response.json()['series']
+        self.assertEqual(series['granularity'], 'month')
+        self.assertEqual(series['labels'][0], f'{last_year}-01-01')
+        self.assertEqual(len(series['labels']), 12)
+        self.assertEqual(series['minutesByCategory'], {'Work': [0, 0, 60] + [0] * 9})
+
+    def test_week_starts_on_monday(self):
+        response = self.get_period(period='week', date=self.today)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        period = response.json()['period']
+        monday = self.today - timedelta(days=self.today.weekday())
+        self.assertEqual(period['start'], monday.isoformat())
+        self.assertEqual(period['end'], (monday + timedelta(days=6)).isoformat())
+        self.assertEqual(period['previousStart'], (monday - timedelta(days=7)).isoformat())
+
+    @override_settings(AUTH_USER_CACHE_TTL=60)
+    def test_closed_period_is_served_from_cache(self):
+        self.add_rollup(self.days_ago(10), self.work_category, 60)
+        params = {'period': 'custom', 'start_date': self.days_ago(14), 'end_date': self.days_ago(8)}
+        first = self.get_period(**params)
+
+        with self.assertNumQueries(0):
+            second = self.get_period(**params)
+        self.assertEqual(second.json(), first.json())
+
+    def test_backdated_task_invalidates_cached_history(self):
+        self.add_rollup(self.days_ago(2), self.work_category, 10)
+        params = {'start_date': self.days_ago(5), 'end_date': self.days_ago(1)}
+        self.assertEqual(self.get_period(**params).json()['tasksDueToday'], 0)
+
+        Task.objects.create(user=self.user, title='Missed', status='PENDING', due_date=self.days_ago(3))
+        self.assertEqual(self.get_period(**params).json()['tasksDueToday'], 1)
+
+        # Buckets are grouped by category name, so renames drop them too.
+        self.work_category.name = 'Deep work'
+        self.work_category.save()
+        self.assertEqual(self.get_period(**params).json()['dailySummary']['labels'], ['Deep work'])
+
+    def test_async_endpoint_matches_sync(self):
+        self.add_rollup(self.days_ago(3), self.focus_category, 25, self.app_website)
+        params = {'period': 'month', 'date': self.days_ago(3)}
+        sync_data = self.get_period(**params).json()
+        async_response = self.get_period('dashboard_metrics_async', **params)
+        self.assertEqual(async_response.status_code, status.HTTP_200_OK)
+        self.assertEqual(async_response.json(), sync_data)
+
+        invalid = self.get_period('dashboard_metrics_async', period='decade')
+        self.assertEqual(invalid.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_live_source_matches_rollups(self):
+        Task.objects.create(user=self.user, title='Done', status='DONE', duration_minutes=40,
+                            category=self.work_category, app_website=self.app_website)
+        Task.objects.create(user=self.user, title='Open', status='PENDING', due_date=self.today)
+        params = {'period': 'month', 'date': self.today}
+        from_rollups = self.get_period(**params).json()
+
+        cache.clear()
+        with override_settings(DASHBOARD_METRICS_SOURCE='live'):
+            DailyTaskRollup.objects.all().delete()
+            from_tasks = self.get_period(**params).json()
+        self.assertEqual(from_tasks, from_rollups)
+        self.assertEqual(from_tasks['comparison']['workMinutes']['current'], 40)
+        self.assertIn('1 tasks due this month are still pending. Prioritize wisely!',
+                      [insight['text'] for insight in from_tasks['aiInsights']])
+
+    def test_invalid_periods_are_rejected(self):
+        for params in (
+            {'period': 'decade'},
+            {'date': 'yesterday'},
+            {'start_date': self.days_ago(3)},
+            {'start_date': self.days_ago(1), 'end_date': self.days_ago(3)},
+            {'start_date': self.days_ago(settings.DASHBOARD_MAX_PERIOD_DAYS), 'end_date': self.today},
+        ):
+            with self.subTest(params=params):
+                self.assertEqual(self.get_period(**params).status_code, status.HTTP_400_BAD_REQUEST)
+
+        self.assertEqual(
+            self.get_period(start_date=self.days_ago(settings.DASHBOARD_MAX_PERIOD_DAYS - 1), end_date=self.today).status_code,
+            status.HTTP_200_OK,
+        )
+
+
+class QueryPlanTests(TestCase):
+    """
+    EXPLAIN-based checks that the hot task and dashboard queries use indexes.
+    Run `manage.py explain_hot_queries --seed-tasks 1000000` for the full-size check.
+    """
+
+    def test_hot_queries_use_indexes(self):
+        user = query_plans.seed_tasks(2000, users=3, batch_size=1000)[0]
+        for name, plan, uses_index in query_plans.explain_hot_queries(user):
+            self.assertTrue(uses_index, f"{name} does not use an index:\n{plan}")
+
+    def test_deep_keyset_page_is_an_index_range(self):
+        user = query_plans.seed_tasks(40, users=2, batch_size=1000, seed=1)[0]
+        page = query_plans.deep_page(KeysetPagination(), Notification.objects.filter(user=user), 5)
+        # The cursor is one row-value bound in the order of the (user, created_at, id) index.
+        sql = str(page.query)
+        self.assertIn('("api_notification"."created_at", "api_notification"."id") <', sql)
+        self.assertIn('ORDER BY "api_notification"."created_at" DESC, "api_notification"."id" DESC', sql)
+
+        # On a table this small PostgreSQL may rightly prefer a seq scan, so only
+        # check that the index can serve the bound.
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('SET LOCAL enable_seqscan = off')
+        plan = page.explain()
+        self.assertTrue(query_plans.uses_index(plan), plan)
+        self.assertIn('ROW(created_at, id) <' if connection.vendor == 'postgresql' else 'created_at<?', plan)
+
+    def test_seeding_twice_with_same_seed(self):
+        first = query_plans.seed_tasks(4, users=2)
+        second = query_plans.seed_tasks(4, users=2)
+        self.assertFalse({user.pk for user in first} & {user.pk for user in second})
+
+    def test_uses_index_on_postgres_plans(self):
+        self.assertTrue(query_plans.uses_index(
+            "Limit\n  ->  Index Scan using task_user_order_idx on api_task", vendor='postgresql'
+        ))
+        self.assertFalse(query_plans.uses_index(
+            "Limit\n  ->  Sort\n        ->  Seq Scan on api_task  (cost=0.00..1.00)", vendor='postgresql'
+        ))
+
+
+class TaskListQueryCountTests(TestCase):
+    """
+    Tests that listing tasks costs a fixed number of queries per page.
+    """
+
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create_user(username='listuser', email='list@example.com', password='password123')
+        response = self.client.post(
+            reverse('token_obtain_pair'),
+            {'username': 'listuser', 'password': 'password123'},
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.client.defaults['HTTP_AUTHORIZATION'] = f"Bearer {response.json()['access']}"
+
+        self.category = Category.objects.create(user=self.user, name='Work')
+        self.project = Project.objects.create(user=self.user, name='Launch')
+        for i in range(20):
+            task = Task.objects.create(
+                user=self.user, title=f'Task {i}', category=self.category,
+                project=self.project if i % 2 else None,
+            )
+            Subtask.objects.bulk_create(Subtask(task=task, title=f'Step {j}') for j in range(3))
+
+    def list_tasks(self, page_size, params=None):
+        self.client.get(reverse('task-list'))  # caches the JWT user
+        # COUNT, the page of tasks and one subtask prefetch.
+        with patch.object(SafePageNumberPagination, 'page_size', page_size), self.assertNumQueries(3):
+            response = self.client.get(reverse('task-list'), params or {})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.json()['results']), page_size)
+        return response.json()['results']
+
+    @override_settings(AUTH_USER_CACHE_TTL=60)
+    def test_list_query_count_is_constant(self):
+        for page_size in (2, 5, 20):
+            results = self.list_tasks(page_size)
+            self.assertTrue(all(len(task['subtasks']) == 3 for task in results))
+
+    @override_settings(AUTH_USER_CACHE_TTL=60)
+    def test_expand_inlines_related_names(self):
+        for page_size in (2, 20):
+            results = self.list_tasks(page_size, {'expand': 'category,project,app_website,bogus'})
+        self.assertTrue(all(task['category_name'] == 'Work' for task in results))
+        self.assertEqual({task['project_name'] for task in results}, {'Launch', None})
+        self.assertTrue(all(task['app_website_name'] is None for task in results))
+        self.assertNotIn('bogus_name', results[0])
+
+    @override_settings(AUTH_USER_CACHE_TTL=60)
+    def test_without_expand_names_are_omitted(self):
+        results = self.list_tasks(2)
+        self.assertNotIn('category_name', results[0])
+
+
+class TaskKeysetPaginationTests(TestCase):
+    """
+    Tests for cursor-based paging of the task list.
+    """
+
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create_user(username='cursoruser', email='cursor@example.com', password='password123')
+        response = self.client.post(
+            reverse('token_obtain_pair'),
+            {'username': 'cursoruser', 'password': 'password123'},
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.client.defaults['HTTP_AUTHORIZATION'] = f"Bearer {response.json()['access']}"
+
+        today = timezone.localdate()
+        for i in range(23):
+            Task.objects.create(
+                user=self.user,
+                title=f'Task {i}',
+                priority=1 + i % 3,
+                due_date=None if i % 5 == 0 else today + timedelta(days=i % 4),
+            )
+
+    def expected_ids(self):
+        tasks = sorted(
+            Task.objects.filter(user=self.user),
+            key=lambda t: (t.due_date is None, t.due_date or timezone.localdate(), t.priority, -t.created_at.timestamp(), t.id),
+        )
+        return [task.id for task in tasks]
+
+    @override_settings(AUTH_USER_CACHE_TTL=60)
+    def test_walks_all_pages_in_order(self):
+        seen = []
+        url = reverse('task-list') + '?pagination=cursor&page_size=4&count=false'
+        self.client.get(url)  # caches the JWT user
+        while url:
+            # The page of tasks and the subtask prefetch; no COUNT.
+            with self.assertNumQueries(2):
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            body = response.json()
+            self.assertNotIn('count', body)
+            self.assertLessEqual(len(body['results']), 4)
+            seen.extend(task['id'] for task in body['results'])
+            url = body['next']
+        self.assertEqual(seen, self.expected_ids())
+
+    def test_count_and_page_size_limit(self):
+        response = self.client.get(reverse('task-list'), {'pagination': 'cursor', 'page_size': 1000})
+        body = response.json()
+        self.assertEqual(body['count'], 23)
+        self.assertEqual(len(body['results']), 23)
+        self.assertIsNone(body['next'])
+
+    def test_invalid_cursor(self):
+        response = self.client.get(reverse('task-list'), {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_page_number_mode_is_default(self):
+        response = self.client.get(reverse('task-list'), {'page': 2, 'page_size': 10})
+        body = response.json()
+        self.assertEqual(body['count'], 23)
+        self.assertEqual(len(body['results']), 10)
+        self.assertIsNotNone(body['previous'])
+
+
+class TaskSearchTests(TestCase):
+    """
+    Tests for full-text task search (FTS5 on SQLite, tsvector on PostgreSQL).
+    """
+
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create_user(username='searchuser', email='search@example.com', password='password123')
+        response = self.client.post(
+            reverse('token_obtain_pair'),
+            {'username': 'searchuser', 'password': 'password123'},
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.client.defaults['HTTP_AUTHORIZATION'] = f"Bearer {response.json()['access']}"
+
+        self.meeting = Task.objects.create(user=self.user, title='Meeting notes', description='Discuss the budget')
+        self.budget = Task.objects.create(user=self.user, title='Budget review', description='Budget for the next budget cycle')
+        Task.objects.create(user=self.user, title='Buy groceries', description='Milk, eggs, bread')
+        other_user = User.objects.create_user(username='searchother', password='password123')
+        Task.objects.create(user=other_user, title='Budget planning', description='Not visible')
+
+    def search(self, query):
+        response = self.client.get(reverse('task-list'), {'search': query, 'page_size': 10})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [task['id'] for task in response.json()['results']]
+
+    def test_ranked_results(self):
+        self.assertEqual(self.search('budget'), [self.budget.id, self.meeting.id])
+
+    def test_prefix_matching_for_typeahead(self):
+        self.assertEqual(self.search('meet'), [self.meeting.id])
+        self.assertEqual(self.search('bud rev'), [self.budget.id])
+
+    def test_search_follows_updates_and_deletes(self):
+        self.meeting.title = 'Standup'
+        self.meeting.description = ''
+        self.meeting.save()
+        self.assertEqual(self.search('meeting'), [])
+        self.budget.delete()
+        self.assertEqual(self.search('budget'), [])
+
+    def test_punctuation_only_query_matches_nothing(self):
+        self.assertFalse(search_tasks(Task.objects.filter(user=self.user), '"*:&').exists())
+
+
+class TaskBulkTests(TestCase):
+    """
+    Tests for the batch create/update/delete endpoint.
+    """
+
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create_user(username='bulkuser', email='bulk@example.com', password='password123')
+        response = self.client.post(
+            reverse('token_obtain_pair'),
+            {'username': 'bulkuser', 'password': 'password123'},
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.client.defaults['HTTP_AUTHORIZATION'] = f"Bearer {response.json()['access']}"
+        self.category = Category.objects.create(user=self.user, name='Work')
+        self.today = timezone.localdate()
+
+    def bulk(self, payload):
+        return self.client.post(reverse('task-bulk'), json.dumps(payload), content_type='application/json')
+
+    def test_mixed_batch(self):
+        to_update = Task.objects.create(user=self.user, title='Old title')
+        to_delete = Task.objects.create(user=self.user, title='Remove me')
+        payload = {
+            'create': [
+                {'title': f'Imported {i}', 'category': self.category.id, 'due_date': self.today.isoformat()}
+                for i in range(3)
+            ],
+            'update': [{'id': to_update.id, 'title': 'New title', 'status': 'DONE'}],
+            'delete': [to_delete.id],
+        }
+        response = self.bulk(payload)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = response.json()['results']
+        self.assertEqual([result['op'] for result in results], ['create'] * 3 + ['update', 'delete'])
+        self.assertEqual(results[0]['data']['category'], self.category.id)
+        self.assertEqual(results[3]['data']['title'], 'New title')
+
+        to_update.refresh_from_db()
+        self.assertEqual(to_update.status, 'DONE')
+        self.assertGreater(to_update.updated_at, to_update.created_at)
+        self.assertFalse(Task.objects.filter(pk=to_delete.pk).exists())
+        self.assertEqual(Task.objects.filter(user=self.user, title__startswith='Imported').count(), 3)
+        self.assertEqual(metrics.rollup_summary(self.user, self.today)['tasks_due_today'], 3)
+
+    def test_rollups_follow_the_batch_without_a_rebuild(self):
+        done = Task.objects.create(user=self.user, title='Done', status='DONE', duration_minutes=30, category=self.category)
+        due = Task.objects.create(user=self.user, title='Due', due_date=self.today - timedelta(days=2))
+        stale = Task.objects.create(user=self.user, title='Stale', due_date=self.today - timedelta(days=5))
+        Task.objects.create(user=self.user, title='Untouched', status='DONE', duration_minutes=15)
+        payload = {
+            'create': [{'title': f'Imported {i}', 'due_date': self.today.isoformat()} for i in range(3)],
+            'update': [{'id': done.id, 'status': 'PENDING', 'due_date': self.today.isoformat()},
+                       {'id': due.id, 'status': 'DONE', 'category': self.category.id}],
+            'delete': [stale.id],
+        }
+        with patch('api.rollups.rebuild') as rebuild:
+            self.assertEqual(self.bulk(payload).status_code, status.HTTP_200_OK)
+        rebuild.assert_not_called()
+
+        def buckets():
+            return set(DailyTaskRollup.objects.filter(user=self.user).exclude(
+                completed_count=0, due_pending_count=0,
+            ).values_list('date', 'category_id', 'completed_minutes', 'completed_count', 'due_pending_count'))
+
+        incremental = buckets()
+        rollups.rebuild(user_ids=[self.user.pk])
+        self.assertEqual(incremental, buckets())
+        self.assertEqual(metrics.rollup_summary(self.user, self.today)['tasks_due_today'], 4)
+
+    def test_query_count_does_not_grow_with_batch_size(self):
+        def queries_for(count):
+            payload = {'create': [{'title': f'Task {i}', 'category': self.category.id} for i in range(count)]}
+            with CaptureQueriesContext(connection) as queries:
+                response = self.bulk(payload)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            return len(queries)
+
+        # Only the INSERT splits into batches (SQLite caps parameters per statement).
+        self.assertLessEqual(queries_for(200) - queries_for(5), 3)
+
+    def test_invalid_item_rejects_whole_batch(self):
+        other_user = User.objects.create_user(username='bulkother', password='password123')
+        foreign_category = Category.objects.create(user=other_user, name='Theirs')
+        existing = Task.objects.create(user=self.user, title='Keep me')
+        payload = {
+            'create': [{'title': 'Valid'}, {'title': 'Foreign', 'category': foreign_category.id}, {'priority': 1}],
+            'update': [{'id': 999999, 'title': 'Missing'}],
+            'delete': [existing.id],
+        }
+        response = self.bulk(payload)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        errors = response.json()
+        self.assertEqual(errors['create'][0], {})
+        self.assertIn('category', errors['create'][1])
+        self.assertIn('title', errors['create'][2])
+        self.assertIn('id', errors['update'][0])
+        self.assertEqual(errors['delete'], [{}])
+        self.assertEqual(list(Task.objects.filter(user=self.user).values_list('title', flat=True)), ['Keep me'])
+
+    @override_settings(TASK_BULK_MAX_OPERATIONS=2)
+    def test_operation_limit(self):
+        response = self.bulk({'create': [{'title': 'a'}, {'title': 'b'}, {'title': 'c'}]})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+
+class MockDataGeneratorTests(TestCase):
+
+    def test_generates_related_rows_in_bulk(self):
+        out = StringIO()
+        call_command('generate_mock_data', users=3, tasks_per_user=20, chunk_size=25, stdout=out)
+
+        users = User.objects.filter(username__startswith='mock-user-0-')
+        self.assertEqual(users.count(), 3)
+        self.assertEqual(Task.objects.filter(user__in=users).count(), 60)
+        self.assertEqual(Category.objects.filter(user__in=users).count(), 12)
+        self.assertEqual(Project.objects.filter(user__in=users).count(), 9)
+        self.assertTrue(Subtask.objects.filter(task__user__in=users).exists())
+        self.assertFalse(Task.objects.exclude(category__isnull=True).exclude(category__user=F('user')).exists())
+        self.assertTrue(DailyTaskRollup.objects.filter(user__in=users).exists())
+        self.assertIn('Created 3 users, 60 tasks', out.getvalue())
+
+    def test_same_seed_gives_same_tasks(self):
+        def generate(seed):
+            user = User.objects.create_user(username=f'seeded-{User.objects.count()}', password='x')
+            MockDataGenerator(existing_user=user, tasks_per_user=30, seed=seed).run()
+            return list(Task.objects.filter(user=user).order_by('id', 'subtasks__id').values_list(
+                'title', 'status', 'priority', 'due_date', 'category__name', 'subtasks__title',
+            ))
+
+        self.assertEqual(generate(7), generate(7))
+        self.assertNotEqual(generate(7), generate(8))
+
+    def test_rerun_with_same_seed_creates_new_users(self):
+        for _ in range(2):
+            MockDataGenerator(users=2, tasks_per_user=3, seed=5).run()
+        self.assertEqual(User.objects.filter(username__startswith='mock-user-5-').count(), 4)
+
+
+@override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend')
+class OverdueReminderTests(TestCase):
+
+    def setUp(self):
+        self.today = timezone.localdate()
+        self.users = [
+            User.objects.create_user(username=f'late{i}', email=f'late{i}@example.com', password='x')
+            for i in range(3)
+        ]
+        for i, user in enumerate(self.users):
+            for days in range(1, i + 2):
+                Task.objects.create(user=user, title=f'Late {days}', due_date=self.today - timedelta(days=days))
+            Task.objects.create(user=user, title='Done', status='DONE', due_date=self.today - timedelta(days=1))
+            Task.objects.create(user=user, title='Upcoming', due_date=self.today + timedelta(days=1))
+
+    def test_one_digest_and_notification_per_user(self):
+        from django.core import mail
+
+        # One read of all overdue tasks, then per chunk of users: the already-reminded
+        # check and one notification insert (plus its savepoint pair).
+        with self.assertNumQueries(9):
+            result = reminders.send_overdue_reminders(today=self.today, chunk_size=2)
+
+        self.assertEqual(result['users'], 3)
+        self.assertEqual(result['tasks'], 6)
+        self.assertEqual(result['chunks'], 2)
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertIn('You have 3 overdue tasks', mail.outbox[2].body)
+        self.assertEqual(Notification.objects.filter(message__startswith=reminders.OVERDUE_PREFIX).count(), 3)
+
+    def test_rerun_skips_users_already_reminded(self):
+        from django.core import mail
+
+        reminders.send_overdue_reminders(today=self.today, after_user_id=self.users[0].pk)
+        result = reminders.send_overdue_reminders(today=self.today)
+
+        self.assertEqual(result['users'], 1)
+        self.assertEqual(result['skipped_users'], 2)
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertEqual(Notification.objects.count(), 3)
+
+    def test_failed_email_is_not_recorded_as_reminded(self):
+        from django.core import mail
+        from django.core.mail.backends.locmem import EmailBackend
+
+        send_messages = EmailBackend.send_messages
+
+        def flaky_send_messages(backend, messages):
+            if messages[0].to == [self.users[1].email]:
+                raise SMTPException('Mailbox unavailable')
+            return send_messages(backend, messages)
+
+        with patch.object(EmailBackend, 'send_messages', flaky_send_messages), self.assertRaises(SMTPException):
+            reminders.send_overdue_reminders(today=self.today)
+        self.assertEqual(list(Notification.objects.values_list('user_id', flat=True)), [self.users[0].pk])
+
+        result = reminders.send_overdue_reminders(today=self.today)
+        self.assertEqual(result['emails'], 2)
+        self.assertEqual(result['skipped_users'], 1)
+        self.assertEqual(len(mail.outbox), 3)
+
+
+@override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend')
+class ProductivitySummaryTests(TestCase):
+
+    def setUp(self):
+        self.today = timezone.localdate()
+        self.users = [
+            User.objects.create_user(username=f'summary{i}', email=f'summary{i}@example.com', password='x')
+            for i in range(3)
+        ]
+        User.objects.create_user(username='no-email', password='x')
+        first = self.users[0]
+        Task.objects.create(user=first, title='Done', status='DONE')
+        Task.objects.create(user=first, title='Late', due_date=self.today - timedelta(days=1))
+        Task.objects.create(user=first, title='Later', due_date=self.today + timedelta(days=1))
+
+    def test_counts_every_user_in_one_grouped_query(self):
+        counts = metrics.task_status_counts_by_user(Task.objects.all(), self.today)
+        self.assertEqual(counts, {self.users[0].pk: {'total': 3, 'done': 1, 'pending': 2, 'overdue': 1}})
+
+    def test_chunks_skip_users_without_email(self):
+        chunks = list(summaries.recipient_id_chunks(chunk_size=2))
+        self.assertEqual(chunks, [[self.users[0].pk, self.users[1].pk], [self.users[2].pk]])
+
+    def test_chunk_sends_one_email_per_user(self):
+        from django.core import mail
+
+        user_ids = [user.pk for user in self.users]
+        with self.assertNumQueries(2):
+            sent = summaries.send_summary_chunk(user_ids, self.today)
+
+        self.assertEqual(sent, 3)
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertIn('- Overdue: 1', mail.outbox[0].body)
+        self.assertIn('- Total tasks: 0', mail.outbox[1].body)
+
+
+@override_settings(LIST_CONDITIONAL_GET=True, AUTH_USER_CACHE_TTL=60)
+class ConditionalListTests(TestCase):
+    """
+    Tests for ETag / Last-Modified revalidation of the per-user list endpoints.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.user = User.objects.create_user(username='etaguser', email='etag@example.com', password='password123')
+        response = self.client.post(
+            reverse('token_obtain_pair'),
+            {'username': 'etaguser', 'password': 'password123'},
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.client.defaults['HTTP_AUTHORIZATION'] = f"Bearer {response.json()['access']}"
+        self.category = Category.objects.create(user=self.user, name='Work')
+        self.task = Task.objects.create(user=self.user, title='Poll me', category=self.category)
+
+    def revalidate(self, url_name, etag):
+        return self.client.get(reverse(url_name), HTTP_IF_NONE_MATCH=etag)
+
+    def test_unchanged_list_is_304_without_querying_tables(self):
+        etag = self.client.get(reverse('task-list'))['ETag']
+        with self.assertNumQueries(0):  # the JWT user is cached too
+            response = self.revalidate('task-list', etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+
+    def test_if_modified_since(self):
+        last_modified = self.client.get(reverse('category-list'))['Last-Modified']
+        response = self.client.get(reverse('category-list'), HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_writes_change_the_etag(self):
+        etags = {name: self.client.get(reverse(name))['ETag'] for name in ('task-list', 'category-list', 'project-list')}
+
+        self.category.name = 'Deep work'
+        self.category.save()
+        # Categories appear in expanded tasks, so both lists change.
+        self.assertEqual(self.revalidate('task-list', etags['task-list']).status_code, status.HTTP_200_OK)
+        self.assertEqual(self.revalidate('category-list', etags['category-list']).status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            self.revalidate('project-list', etags['project-list']).status_code, status.HTTP_304_NOT_MODIFIED
+        )
 
+    def test_bulk_writes_change_the_etag(self):
+        etag = self.client.get(reverse('task-list'))['ETag']
+        self.client.post(
+            reverse('task-bulk'), json.dumps({'update': [{'id': self.task.id, 'status': 'DONE'}]}),
+            content_type='application/json',
+        )
+        self.assertEqual(self.revalidate('task-list', etag).status_code, status.HTTP_200_OK)
+
+    def test_etag_depends_on_query_and_user(self):
+        etag = self.client.get(reverse('task-list'))['ETag']
+        response = self.client.get(reverse('task-list'), {'status': 'DONE'}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_off_without_a_shared_cache(self):
+        with override_settings(LIST_CONDITIONAL_GET=False):
+            response = self.client.get(reverse('task-list'))
+            self.assertNotIn('ETag', response)
+            response = self.client.get(reverse('task-list'), HTTP_IF_NONE_MATCH='*')
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class NotificationInboxTests(TestCase):
+    """
+    Tests for the unread count, bulk mark-read actions and keyset paging of notifications.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.user = User.objects.create_user(username='inboxuser', email='inbox@example.com', password='password123')
+        response = self.client.post(
+            reverse('token_obtain_pair'),
+            {'username': 'inboxuser', 'password': 'password123'},
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.client.defaults['HTTP_AUTHORIZATION'] = f"Bearer {response.json()['access']}"
+        self.notifications = Notification.objects.bulk_create(
+            Notification(user=self.user, message=f'Message {i}') for i in range(5)
+        )
+        other_user = User.objects.create_user(username='inboxother', password='password123')
+        Notification.objects.create(user=other_user, message='Not yours')
+
+    def unread_count(self):
+        response = self.client.get(reverse('notification-unread-count'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.json()['unread']
+
+    def test_mark_read_is_one_update(self):
+        ids = [self.notifications[0].id, self.notifications[1].id]
+        with self.assertNumQueries(2):  # JWT user lookup and the UPDATE
+            response = self.client.post(
+                reverse('notification-mark-read'), json.dumps({'ids': ids}), content_type='application/json'
+            )
+        self.assertEqual(response.json(), {'updated': 2})
+        self.assertEqual(self.unread_count(), 3)
+        self.assertTrue(Notification.objects.get(pk=ids[0]).read_at)
+
+    def test_mark_all_read_only_touches_own_unread(self):
+        response = self.client.post(reverse('notification-mark-all-read'))
+        self.assertEqual(response.json(), {'updated': 5})
+        self.assertEqual(self.unread_count(), 0)
+        self.assertEqual(Notification.objects.filter(is_read=False).count(), 1)
+        self.assertEqual(self.client.post(reverse('notification-mark-all-read')).json(), {'updated': 0})
+
+    @override_settings(LIST_CONDITIONAL_GET=True)
+    def test_mark_read_changes_list_etag(self):
+        etag = self.client.get(reverse('notification-list'))['ETag']
+        self.client.post(reverse('notification-mark-all-read'))
+        response = self.client.get(reverse('notification-list'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_keyset_pages_cover_inbox_newest_first(self):
+        seen = []
+        url = reverse('notification-list') + '?pagination=cursor&page_size=2&count=false'
+        while url:
+            page = self.client.get(url).json()
+            seen += [notification['id'] for notification in page['results']]
+            url = page['next']
+        expected = list(Notification.objects.filter(user=self.user).order_by('-created_at', '-id').values_list('id', flat=True))
+        self.assertEqual(seen, expected)
+
+
+class EventStreamTests(TestCase):
+    """
+    Tests for the per-user event bus and the /api/events/ server-sent event stream.
+    """
+
+    def setUp(self):
+        self.previous_bus = events.set_bus(events.InProcessEventBus())
+        self.user = User.objects.create_user(username='streamuser', email='stream@example.com', password='password123')
+        response = self.client.post(
+            reverse('token_obtain_pair'),
+            {'username': 'streamuser', 'password': 'password123'},
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.access_token = response.json()['access']
+
+    def tearDown(self):
+        events.set_bus(self.previous_bus)
+
+    async def test_bus_delivers_across_threads_per_user(self):
+        bus = events.get_bus()
+        subscription = bus.subscribe(self.user.pk).__aiter__()
+        pending = asyncio.ensure_future(subscription.__anext__())
+        await asyncio.sleep(0)  # let the subscription register
+
+        await asyncio.to_thread(bus.publish, self.user.pk + 1, {'type': 'other', 'data': {}})
+        await asyncio.to_thread(bus.publish, self.user.pk, {'type': 'mine', 'data': {}})
+        self.assertEqual((await asyncio.wait_for(pending, 1))['type'], 'mine')
+        await subscription.aclose()
+
+    async def test_stream_requires_authentication(self):
+        response = await self.async_client.get(reverse('event_stream'))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_stream_is_not_served_over_wsgi(self):
+        response = self.client.get(reverse('event_stream'), headers={'Authorization': f'Bearer {self.access_token}'})
+        self.assertEqual(response.status_code, status.HTTP_501_NOT_IMPLEMENTED)
+
+    async def test_stream_pushes_new_notifications(self):
+        response = await self.async_client.get(
+            reverse('event_stream'), headers={'Authorization': f'Bearer {self.access_token}'}
+        )
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        chunks = aiter(response.streaming_content)
+        self.assertEqual(await anext(chunks), b'retry: 5000\n\n')
+        pending = asyncio.ensure_future(anext(chunks))
+        # Let the stream subscribe before anything is published.
+        for _ in range(100):
+            if events.get_bus()._subscribers.get(self.user.pk):
+                break
+            await asyncio.sleep(0.01)
+
+        def create_notification():
+            with self.captureOnCommitCallbacks(execute=True):
+                return Notification.objects.create(user=self.user, message='Pushed')
+
+        notification = await sync_to_async(create_notification)()
+        chunk = (await asyncio.wait_for(pending, 1)).decode()
+        self.assertTrue(chunk.startswith('event: notification.created\n'))
+        self.assertEqual(json.loads(chunk.split('data: ', 1)[1])['id'], notification.pk)
+        await response.streaming_content.aclose()
+
+
+class RecurrenceTests(TestCase):
+    """
+    Tests for expanding recurring tasks into occurrences and recording exceptions.
+    """
+
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create_user(username='recuruser', email='recur@example.com', password='password123')
+        response = self.client.post(
+            reverse('token_obtain_pair'),
+            {'username': 'recuruser', 'password': 'password123'},
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.client.defaults['HTTP_AUTHORIZATION'] = f"Bearer {response.json()['access']}"
+
+    def test_occurrence_dates(self):
+        d = timezone.datetime.fromisoformat
+        jan1, jan31 = d('2026-01-01').date(), d('2026-01-31').date()
+        self.assertEqual(
+            recurrence.occurrence_dates(jan1, 'DAILY', None, d('2027-03-10').date(), d('2027-03-12').date()),
+            [d('2027-03-10').date(), d('2027-03-11').date(), d('2027-03-12').date()],
+        )
+        self.assertEqual(
+            recurrence.occurrence_dates(jan1, 'WEEKLY', d('2026-01-20').date(), jan1, d('2026-12-31').date()),
+            [jan1, d('2026-01-08').date(), d('2026-01-15').date()],
+        )
+        self.assertEqual(
+            recurrence.occurrence_dates(jan31, 'MONTHLY', None, d('2026-02-01').date(), d('2026-04-30').date()),
+            [d('2026-02-28').date(), d('2026-03-31').date(), d('2026-04-30').date()],
+        )
+        self.assertEqual(
+            recurrence.occurrence_dates(d('2024-02-29').date(), 'YEARLY', None, jan1, d('2028-12-31').date()),
+            [d('2026-02-28').date(), d('2027-02-28').date(), d('2028-02-29').date()],
+        )
+        self.assertEqual(recurrence.occurrence_dates(jan31, 'DAILY', None, jan1, d('2026-01-30').date()), [])
+        self.assertEqual(recurrence.occurrence_dates(jan31, 'NONE', None, jan1, jan31), [jan31])
+
+    def test_expand_window_with_exceptions(self):
+        today = timezone.localdate()
+        daily = Task.objects.create(
+            user=self.user, title='Standup', due_date=today - timedelta(days=30), recurrence_pattern='DAILY',
+        )
+        Task.objects.create(
+            user=self.user, title='Ended', due_date=today - timedelta(days=30), recurrence_pattern='DAILY',
+            recurrence_end_date=today - timedelta(days=1),
+        )
+        one_off = Task.objects.create(user=self.user, title='Dentist', due_date=today + timedelta(days=2))
+        TaskOccurrence.objects.create(task=daily, date=today + timedelta(days=1), status='DONE')
+
+        with self.assertNumQueries(3):
+            occurrences = recurrence.expand(Task.objects.filter(user=self.user), today, today + timedelta(days=6))
+
+        self.assertEqual(len(occurrences), 8)
+        self.assertEqual([o['task'] for o in occurrences if o['date'] == today + timedelta(days=2)], [daily.pk, one_off.pk])
+        self.assertEqual(
+            [o['status'] for o in occurrences if o['task'] == daily.pk][:3], ['PENDING', 'DONE', 'PENDING']
+        )
+
+    def test_occurrence_endpoints(self):
+        today = timezone.localdate()
+        weekly = Task.objects.create(user=self.user, title='Review', due_date=today, recurrence_pattern='WEEKLY')
+        next_week = today + timedelta(days=7)
+        url = reverse('task-occurrence', args=[weekly.pk])
+
+        response = self.client.post(url, {'date': next_week.isoformat(), 'status': 'DONE'}, content_type='application/json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.client.post(
+            url, {'date': (today + timedelta(days=1)).isoformat(), 'status': 'DONE'}, content_type='application/json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.get(reverse('task-occurrences'), {'start': today.isoformat(), 'end': next_week.isoformat()})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([o['status'] for o in response.json()['results']], ['PENDING', 'DONE'])
+
+        self.client.post(url, {'date': next_week.isoformat(), 'status': 'PENDING'}, content_type='application/json')
+        self.assertFalse(TaskOccurrence.objects.exists())
+
+        response = self.client.get(
+            reverse('task-occurrences'), {'start': today.isoformat(), 'end': (today + timedelta(days=400)).isoformat()}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_occurrences_are_paginated_and_windows_capped(self):
+        today = timezone.localdate()
+        Task.objects.create(user=self.user, title='Standup', due_date=today, recurrence_pattern='DAILY')
+        window = {'start': today.isoformat(), 'end': (today + timedelta(days=9)).isoformat()}
+
+        response = self.client.get(reverse('task-occurrences'), {**window, 'page_size': 4, 'page': 3})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()
+        self.assertEqual((data['start'], data['count'], len(data['results'])), (today.isoformat(), 10, 2))
+        self.assertEqual(data['results'][0]['date'], (today + timedelta(days=8)).isoformat())
+        self.assertIsNone(data['next'])
+
+        widest = settings.RECURRENCE_MAX_WINDOW_DAYS
+        for days, expected in ((widest, status.HTTP_200_OK), (widest + 1, status.HTTP_400_BAD_REQUEST)):
+            end = today + timedelta(days=days - 1)
+            response = self.client.get(reverse('task-occurrences'), {'start': today.isoformat(), 'end': end.isoformat()})
+            self.assertEqual(response.status_code, expected)
+
+
+class TaskCalendarTests(TestCase):
+    """
+    Tests for the per-day calendar aggregation endpoint.
+    """
+
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create_user(username='caluser', email='cal@example.com', password='password123')
+        response = self.client.post(
+            reverse('token_obtain_pair'),
+            {'username': 'caluser', 'password': 'password123'},
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.client.defaults['HTTP_AUTHORIZATION'] = f"Bearer {response.json()['access']}"
+        self.today = timezone.localdate()
+        self.yesterday = self.today - timedelta(days=1)
+        Task.objects.create(user=self.user, title='Late', due_date=self.yesterday, priority=1, duration_minutes=30)
+        Task.objects.create(user=self.user, title='Shipped', due_date=self.yesterday, status='DONE', duration_minutes=60)
+        Task.objects.create(user=self.user, title='Low', due_date=self.today, priority=3)
+        Task.objects.create(user=self.user, title='Urgent', due_date=self.today, priority=1)
+        Task.objects.create(user=self.user, title='Out of range', due_date=self.today + timedelta(days=30))
+        Task.objects.create(
+            user=self.user, title='Daily', due_date=self.yesterday, priority=2, duration_minutes=15,
+            recurrence_pattern='DAILY',
+        )
+        User.objects.create_user(username='calother', password='x').tasks.create(title='Hidden', due_date=self.today)
+
+    def calendar(self, **params):
+        params = {'start': self.yesterday.isoformat(), 'end': (self.today + timedelta(days=1)).isoformat(), **params}
+        response = self.client.get(reverse('task-calendar'), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return {day['date']: day for day in response.json()['days']}
+
+    def test_per_day_counts(self):
+        with self.assertNumQueries(4):  # JWT user, grouped counts, recurring series and their exceptions
+            days = self.calendar()
+        yesterday, today, tomorrow = (days[d.isoformat()] for d in (
+            self.yesterday, self.today, self.today + timedelta(days=1)
+        ))
+        self.assertEqual(
+            (yesterday['pending'], yesterday['done'], yesterday['overdue'], yesterday['minutes']), (2, 1, 2, 105)
+        )
+        self.assertEqual((today['pending'], today['overdue'], today['minutes']), (3, 0, 15))
+        self.assertEqual((tomorrow['pending'], tomorrow['minutes']), (1, 15))
+        self.assertNotIn('tasks', today)
+
+    def test_top_tasks_per_day(self):
+        days = self.calendar(top=2)
+        self.assertEqual([task['title'] for task in days[self.today.isoformat()]['tasks']], ['Urgent', 'Daily'])
+        self.assertEqual([task['title'] for task in days[(self.today + timedelta(days=1)).isoformat()]['tasks']], ['Daily'])
+
+
+class StubLLMHandler(BaseHTTPRequestHandler):
+    """Answers OpenAI chat completions with the delay and status set on the server."""
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        self.server.calls += 1
+        time.sleep(self.server.delay)
+        if self.server.status != 200:
+            body = {'error': {'message': 'stub failure', 'type': 'server_error'}}
+        else:
+            body = {
+                'id': 'chatcmpl-stub', 'object': 'chat.completion', 'created': 0, 'model': 'stub',
+                'choices': [{
+                    'index': 0, 'finish_reason': 'stop',
+                    'message': {'role': 'assistant', 'content': self.server.content},
+                }],
+            }
+        payload = json.dumps(body).encode()
+        try:
+            self.send_response(self.server.status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+        except (BrokenPipeError, ConnectionResetError):
+            # The client gave up on a slow response.
+            pass
+
+    def log_message(self, format, *args):
+        pass
+
+
+class AISuggestionServiceTests(TestCase):
+    """
+    Tests for precomputed AI suggestions against a local stub LLM server.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.llm = ThreadingHTTPServer(('127.0.0.1', 0), StubLLMHandler)
+        cls.llm.daemon_threads = True
+        threading.Thread(target=cls.llm.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.llm.shutdown()
+        cls.llm.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        cache.clear()
+        self.llm.calls, self.llm.delay, self.llm.status, self.llm.content = 0, 0, 200, 'Ship the smallest useful thing.'
+        self.enterContext(self.settings(
+            OPENAI_API_KEY='test-key',
+            OPENAI_BASE_URL=f'http://127.0.0.1:{self.llm.server_address[1]}/v1',
+            AI_SUGGESTION_TIMEOUT=0.3,
+            AI_CIRCUIT_FAILURE_THRESHOLD=2,
+        ))
+        self.queue = self.enterContext(patch('api.tasks.refresh_ai_suggestions.apply_async'))
+        self.client = Client()
+        self.user = User.objects.create_user(username='aiuser', email='ai@example.com', password='password123')
+        response = self.client.post(
+            reverse('token_obtain_pair'),
+            {'username': 'aiuser', 'password': 'password123'},
+            content_type='application/json'
+        )
+        self.client.defaults['HTTP_AUTHORIZATION'] = f"Bearer {response.json()['access']}"
+
+    def test_requests_read_the_precomputed_suggestion(self):
+        data = self.client.get(reverse('ai-suggestion')).json()
+        self.assertEqual(data['source'], 'fallback')
+        self.assertIn("AI suggests:", self.client.get(reverse('dashboard_metrics')).json()['aiInsights'][0]['text'])
+        self.assertEqual(self.queue.call_count, 1)  # queued once, not per request
+        self.assertEqual(self.llm.calls, 0)
+
+        self.assertEqual(suggestions.refresh_users([self.user.pk]), {'refreshed': 1, 'failed': 0, 'skipped': 0})
+        data = self.client.get(reverse('ai-suggestion')).json()
+        self.assertEqual((data['source'], data['suggestion']), ('ai', 'Ship the smallest useful thing.'))
+        insight = self.client.get(reverse('dashboard_metrics')).json()['aiInsights'][0]['text']
+        self.assertEqual(insight, 'AI suggests: Ship the smallest useful thing.')
+        self.assertEqual(self.llm.calls, 1)
+
+    def test_slow_responses_are_abandoned(self):
+        self.llm.delay = 1
+        started = time.monotonic()
+        self.assertFalse(suggestions.refresh(self.user))
+        self.assertLess(time.monotonic() - started, 0.9)
+        self.assertEqual(suggestions.get_suggestion(self.user)['source'], 'fallback')
+
+    def test_circuit_opens_after_failures_and_recovers(self):
+        self.llm.status = 500
+        users = [User.objects.create_user(username=f'ai{i}').pk for i in range(4)]
+        self.assertEqual(suggestions.refresh_users(users), {'refreshed': 0, 'failed': 2, 'skipped': 2})
+        self.assertEqual(self.llm.calls, 2)
+        self.assertTrue(suggestions.breaker.is_open())
+        # While open, requests do not even queue a refresh.
+        self.assertEqual(self.client.get(reverse('ai-suggestion')).json()['source'], 'fallback')
+        self.queue.assert_not_called()
+
+        # After the reset timeout one probe is let through and closes the circuit.
+        cache.set(suggestions.breaker.opened_key, time.time() - settings.AI_CIRCUIT_RESET_SECONDS - 1, timeout=None)
+        self.llm.status = 200
+        self.assertEqual(suggestions.refresh_users(users), {'refreshed': 4, 'failed': 0, 'skipped': 0})
+        self.assertFalse(suggestions.breaker.is_open())
+
+    def test_precompute_covers_recently_active_users(self):
+        Task.objects.create(user=self.user, title='Recent')
+        idle = User.objects.create_user(username='idle')
+        Task.objects.create(user=idle, title='Old')
+        Task.objects.filter(user=idle).update(updated_at=timezone.now() - timedelta(days=30))
+        self.assertEqual(list(suggestions.active_user_id_chunks()), [[self.user.pk]])
+
+
+@override_settings(AUTH_USER_CACHE_TTL=60)
+class CachedJWTAuthenticationTests(TestCase):
+    """
+    Tests for resolving the JWT user from the cache.
+    """
+
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create_user(username='authuser', email='auth@example.com', password='password123')
+        self.client.defaults['HTTP_AUTHORIZATION'] = f"Bearer {self.login('password123')['access']}"
+
+    def login(self, password):
+        response = self.client.post(
+            reverse('token_obtain_pair'),
+            {'username': 'authuser', 'password': password},
+            content_type='application/json'
+        )
+        return response.json() if response.status_code == status.HTTP_200_OK else None
+
+    def cached(self):
+        return cache.get(authentication.USER_KEY.format(user_id=self.user.pk))
+
+    def test_second_request_skips_the_user_lookup(self):
+        self.client.get(reverse('user_profile'))
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('user_profile'))
+        self.assertEqual(response.json()['username'], 'authuser')
+        self.assertNotIn(self.user.password, self.cached())
+
+    def test_profile_update_refreshes_the_cached_user(self):
+        self.client.get(reverse('user_profile'))
+        response = self.client.put(
+            reverse('user_profile'), json.dumps({'email': 'new@example.com'}), content_type='application/json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsNone(self.cached())
+        self.assertEqual(self.client.get(reverse('user_profile')).json()['email'], 'new@example.com')
+        # Saving the cached user, whose password is deferred, leaves the password alone.
+        self.assertIsNotNone(self.login('password123'))
+
+    def test_password_change_invalidates_the_cached_user(self):
+        self.client.get(reverse('user_profile'))
+        response = self.client.put(
+            reverse('change_password'),
+            json.dumps({
+                'old_password': 'password123', 'new_password': 'AnotherPass456!', 'confirm_password': 'AnotherPass456!',
+            }),
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsNone(self.cached())
+        self.assertIsNotNone(self.login('AnotherPass456!'))
+
+    @override_settings(AUTH_USER_CACHE_TTL=0)
+    def test_off_without_a_shared_cache(self):
+        self.client.get(reverse('user_profile'))
+        self.assertIsNone(self.cached())
+
+    def test_deactivated_user_is_rejected(self):
+        self.client.get(reverse('user_profile'))
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get(reverse('user_profile')).status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class StartupImportTests(TestCase):
+    """
+    Tests that a cold web worker does not import optional heavy dependencies.
+    """
+
+    def test_urlconf_import_skips_openai_and_celery(self):
+        script = (
+            "import sys, django; django.setup(); import backend.urls; "
+            "print(','.join(m for m in ('openai', 'celery') if m in sys.modules))"
+        )
+        result = subprocess.run(
+            [sys.executable, '-c', script], capture_output=True, text=True, cwd=settings.BASE_DIR,
+            env={**os.environ, 'DJANGO_SETTINGS_MODULE': 'backend.settings'},
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.strip(), '')
+
+
+class DatabasePoolStatsTests(TestCase):
+    """
+    Tests for the connection pool metrics endpoint.
+    """
+
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create_user(username='pooluser', password='password123')
+        response = self.client.post(
+            reverse('token_obtain_pair'),
+            {'username': 'pooluser', 'password': 'password123'},
+            content_type='application/json'
+        )
+        self.client.defaults['HTTP_AUTHORIZATION'] = f"Bearer {response.json()['access']}"
+
+    def test_staff_only(self):
+        self.assertEqual(self.client.get(reverse('db_pool_stats')).status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_reports_pool_metrics(self):
+        self.user.is_staff = True
+        self.user.save()
+        response = self.client.get(reverse('db_pool_stats'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        if db_pool.pool_stats() is None:
+            # SQLite, which Django does not pool.
+            self.assertEqual(response.json(), {'pooled': False})
+        else:
+            self.assertTrue(response.json()['pooled'])
+            self.assertGreaterEqual(response.json()['in_use'], 1)
+
+
+class AsyncReadEndpointTests(TestCase):
+    """
+    Tests that the async dashboard and task reads answer like their DRF views.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.user = User.objects.create_user(username='asyncuser', password='password123')
+        response = self.client.post(
+            reverse('token_obtain_pair'),
+            {'username': 'asyncuser', 'password': 'password123'},
+            content_type='application/json'
+        )
+        self.access_token = response.json()['access']
+        self.client.defaults['HTTP_AUTHORIZATION'] = f'Bearer {self.access_token}'
+
+        today = timezone.localdate()
+        work = Category.objects.create(user=self.user, name='Work')
+        app = AppWebsite.objects.create(user=self.user, name='IDE')
+        for i in range(5):
+            task = Task.objects.create(
+                user=self.user, title=f'Async task {i}', status='DONE' if i % 2 else 'PENDING',
+                priority=i % 3 + 1, due_date=today, duration_minutes=30, category=work, app_website=app,
+            )
+            Subtask.objects.create(task=task, title=f'Step {i}')
+
+    def test_requires_authentication_and_get(self):
+        response = Client().get(reverse('task-list-async'))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(response['WWW-Authenticate'], 'Bearer realm="api"')
+        self.assertEqual(self.client.post(reverse('task-list-async')).status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+
+    def test_task_list_matches_sync_list(self):
+        for query in ('?page_size=2&page=2&expand=category', '?status=pending', '?pagination=cursor&page_size=2'):
+            expected = self.client.get(reverse('task-list') + query).json()
+            response = self.client.get(reverse('task-list-async') + query)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.json()['results'], expected['results'])
+            self.assertEqual(response.json().get('count'), expected.get('count'))
+
+    @override_settings(LIST_CONDITIONAL_GET=True)
+    def test_task_list_answers_conditional_get(self):
+        etag = self.client.get(reverse('task-list-async'))['ETag']
+        response = self.client.get(reverse('task-list-async'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_task_detail_is_scoped_to_the_user(self):
+        task = Task.objects.filter(user=self.user).first()
+        response = self.client.get(reverse('task-detail-async', args=[task.pk]))
+        self.assertEqual(response.json(), self.client.get(reverse('task-detail', args=[task.pk])).json())
+
+        other = Task.objects.create(user=User.objects.create_user(username='other'), title='Not mine')
+        response = self.client.get(reverse('task-detail-async', args=[other.pk]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    @patch('api.views.suggest_task_for_user', return_value='Plan the week')
+    def test_dashboard_matches_sync_view(self, _suggest):
+        for source in ('rollups', 'live'):
+            with self.settings(DASHBOARD_METRICS_SOURCE=source):
+                cache.clear()
+                expected = self.client.get(reverse('dashboard_metrics')).json()
+                cache.clear()
+                self.assertEqual(self.client.get(reverse('dashboard_metrics_async')).json(), expected)
+
+    async def test_async_client_reads_without_a_sync_query(self):
+        # A sync ORM call inside the view would raise SynchronousOnlyOperation.
+        headers = {'Authorization': f'Bearer {self.access_token}'}
+        for url in (reverse('dashboard_metrics_async'), reverse('task-list-async')):
+            response = await self.async_client.get(url, headers=headers)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    async def test_async_search_checks_the_fts_table_off_the_event_loop(self):
+        headers = {'Authorization': f'Bearer {self.access_token}'}
+        # The first search on a connection introspects its tables.
+        with patch.dict('api.search._fts_available', clear=True):
+            response = await self.async_client.get(reverse('task-list-async') + '?search=async', headers=headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['count'], 5)
+
+
+@override_settings(AUTH_USER_CACHE_TTL=60)
+class SparseFieldsetTests(TestCase):
+    """
+    Tests for trimming list and detail responses with ?fields= and ?omit=.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.user = User.objects.create_user(username='fieldsuser', password='password123')
+        response = self.client.post(
+            reverse('token_obtain_pair'),
+            {'username': 'fieldsuser', 'password': 'password123'},
+            content_type='application/json'
+        )
+        self.client.defaults['HTTP_AUTHORIZATION'] = f"Bearer {response.json()['access']}"
+        self.category = Category.objects.create(user=self.user, name='Work', description='Long text')
+        for i in range(3):
+            task = Task.objects.create(user=self.user, title=f'Task {i}', description='x' * 500, category=self.category)
+            Subtask.objects.create(task=task, title=f'Step {i}')
+        self.client.get(reverse('user_profile'))  # cache the JWT user
+
+    def test_fields_trims_payload_columns_and_prefetch(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('task-list') + '?fields=id,title,due_date,status')
+        self.assertEqual(
+            [set(task) for task in response.json()['results']], [{'id', 'title', 'due_date', 'status'}] * 3
+        )
+        # A count and the page, without the subtask prefetch or the description column.
+        self.assertEqual(len(queries), 2)
+        self.assertNotIn('description', queries[-1]['sql'])
+
+        response = self.client.get(reverse('task-list') + '?search=task&fields=id,title')
+        self.assertEqual(response.json()['count'], 3)
+
+    def test_omit_drops_fields_and_keeps_expansion(self):
+        response = self.client.get(reverse('task-list') + '?omit=description,subtasks&expand=category,project')
+        task = response.json()['results'][0]
+        self.assertNotIn('description', task)
+        self.assertNotIn('subtasks', task)
+        self.assertEqual(task['category_name'], 'Work')
+
+        response = self.client.get(reverse('task-list') + '?omit=category&expand=category')
+        self.assertNotIn('category_name', response.json()['results'][0])
+
+    def test_detail_and_taxonomy_and_notification_lists(self):
+        task = Task.objects.filter(user=self.user).first()
+        response = self.client.get(reverse('task-detail', args=[task.pk]) + '?fields=title')
+        self.assertEqual(response.json(), {'title': task.title})
+
+        response = self.client.get(reverse('category-list') + '?fields=id,name')
+        self.assertEqual(response.json()['results'][0], {'id': self.category.pk, 'name': 'Work'})
+
+        Notification.objects.create(user=self.user, message='Hi')
+        response = self.client.get(reverse('notification-list') + '?fields=id,message,is_read')
+        self.assertEqual(set(response.json()['results'][0]), {'id', 'message', 'is_read'})
+
+    def test_writes_return_every_field(self):
+        task = Task.objects.filter(user=self.user).first()
+        response = self.client.patch(
+            reverse('task-detail', args=[task.pk]) + '?fields=title',
+            json.dumps({'status': 'DONE'}), content_type='application/json'
+        )
+        self.assertIn('subtasks', response.json())
+
+    def test_async_list_honours_fields(self):
+        response = self.client.get(reverse('task-list-async') + '?fields=id,title')
+        self.assertEqual([set(task) for task in response.json()['results']], [{'id', 'title'}] * 3)
+
+
+@override_settings(AUTH_USER_CACHE_TTL=60)
+class ProjectStatsTests(TestCase):
+    """
+    Tests for the opt-in ?stats=true task progress of the project list.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.user = User.objects.create_user(username='projectuser', password='password123')
+        response = self.client.post(
+            reverse('token_obtain_pair'),
+            {'username': 'projectuser', 'password': 'password123'},
+            content_type='application/json'
+        )
+        self.client.defaults['HTTP_AUTHORIZATION'] = f"Bearer {response.json()['access']}"
+        self.today = timezone.localdate()
+        self.launch = Project.objects.create(user=self.user, name='Launch')
+        self.empty = Project.objects.create(user=self.user, name='Someday')
+        done = Task.objects.create(user=self.user, title='Spec', status='DONE', duration_minutes=60, project=self.launch)
+        late = Task.objects.create(
+            user=self.user, title='Build', status='PENDING', duration_minutes=120,
+            due_date=self.today - timedelta(days=2), project=self.launch,
+        )
+        Task.objects.create(user=self.user, title='Ship', status='PENDING', due_date=self.today, project=self.launch)
+        Task.objects.create(user=self.user, title='Loose end', status='PENDING', duration_minutes=30)
+        Subtask.objects.create(task=done, title='Draft', completed=True)
+        Subtask.objects.create(task=late, title='Backend', completed=True)
+        Subtask.objects.create(task=late, title='Frontend')
+        self.client.get(reverse('user_profile'))  # cache the JWT user
+
+    def test_stats_for_every_project_in_one_query(self):
+        # A count and the annotated page, however many tasks and subtasks there are.
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('project-list'), {'stats': 'true'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        stats = {project['name']: project['stats'] for project in response.json()['results']}
+        self.assertEqual(stats['Launch'], {
+            'total_tasks': 3, 'done_tasks': 1, 'pending_tasks': 2, 'overdue_tasks': 1,
+            'total_minutes': 180, 'remaining_minutes': 120,
+            'total_subtasks': 3, 'done_subtasks': 2,
+            'progress': 33, 'subtask_completion': 0.6667,
+        })
+        self.assertEqual(stats['Someday'], {
+            'total_tasks': 0, 'done_tasks': 0, 'pending_tasks': 0, 'overdue_tasks': 0,
+            'total_minutes': 0, 'remaining_minutes': 0,
+            'total_subtasks': 0, 'done_subtasks': 0,
+            'progress': 0, 'subtask_completion': None,
+        })
+
+    def test_stats_are_opt_in(self):
+        response = self.client.get(reverse('project-list'))
+        self.assertNotIn('stats', response.json()['results'][0])
+
+    @override_settings(LIST_CONDITIONAL_GET=True)
+    def test_task_writes_change_the_stats_etag(self):
+        url = reverse('project-list') + '?stats=true'
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_304_NOT_MODIFIED)
+
+        Subtask.objects.create(task=Task.objects.get(title='Ship'), title='Announce')
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        launch = next(project for project in response.json()['results'] if project['name'] == 'Launch')
+        self.assertEqual(launch['stats']['total_subtasks'], 4)
+
+
+class RendererTests(TestCase):
+    """
+    Tests for the orjson and MessagePack renderers and parsers.
+    """
+
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create_user(username='renderuser', password='password123')
+        response = self.client.post(
+            reverse('token_obtain_pair'),
+            {'username': 'renderuser', 'password': 'password123'},
+            content_type='application/json'
+        )
+        self.client.defaults['HTTP_AUTHORIZATION'] = f"Bearer {response.json()['access']}"
+        self.task = Task.objects.create(user=self.user, title='Render me', due_date=timezone.localdate())
+
+    def test_json_dates_match_drf_iso_format(self):
+        task = self.client.get(reverse('task-detail', args=[self.task.pk])).json()
+        expected = dict(TaskSerializer(self.task).data)
+        # Serializer data stays JSON-ready for caches and events, not only for the renderer.
+        self.assertIsInstance(expected['created_at'], str)
+        self.assertEqual(task['created_at'], expected['created_at'])
+        self.assertTrue(task['created_at'].endswith('Z'))
+        self.assertEqual(task['due_date'], self.task.due_date.isoformat())
+        # Dates the views leave unformatted are written the same way.
+        self.assertEqual(renderers.dumps({'at': self.task.created_at}), f'{{"at":"{expected["created_at"]}"}}'.encode())
+
+    def test_msgpack_is_negotiated_for_reads_and_writes(self):
+        response = self.client.get(reverse('task-detail', args=[self.task.pk]), HTTP_ACCEPT='application/msgpack')
+        self.assertEqual(response['Content-Type'], 'application/msgpack')
+        task = msgpack.unpackb(response.content)
+        self.assertEqual(task['title'], 'Render me')
+        self.assertTrue(task['created_at'].endswith('Z'))
+
+        response = self.client.post(
+            reverse('task-list'), msgpack.packb({'title': 'Packed', 'priority': 2}),
+            content_type='application/msgpack', HTTP_ACCEPT='application/msgpack',
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(msgpack.unpackb(response.content)['title'], 'Packed')
+
+    def test_malformed_json_is_a_400(self):
+        response = self.client.post(reverse('task-list'), '{"title":', content_type='application/json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('JSON parse error', response.json()['detail'])
@@ -18,6 +18,11 @@ from .views import (
     confirm_password_reset,
     suggest_task,
     DashboardMetricsView,
+    dashboard_metrics_async,
+    task_list_async,
+    task_detail_async,
+    event_stream,
+    db_pool_stats,
     TaskViewSet,
     NotificationViewSet,
     CategoryViewSet,
@@ -94,6 +99,17 @@ urlpatterns = [
     # Dashboard metrics
     path('dashboard-metrics/', DashboardMetricsView.as_view(), name='dashboard_metrics'),
 
+    # Async versions of the dashboard and task reads, for ASGI workers
+    path('async/dashboard-metrics/', dashboard_metrics_async, name='dashboard_metrics_async'),
+    path('async/tasks/', task_list_async, name='task-list-async'),
+    path('async/tasks/<int:pk>/', task_detail_async, name='task-detail-async'),
+
+    # Server-sent notification and task events
+    path('events/', event_stream, name='event_stream'),
+
+    # Database connection pool metrics of the serving worker (staff only)
+    path('health/db-pool/', db_pool_stats, name='db_pool_stats'),
+
     # Optional test token endpoint
     # path('test-token/', TestTokenObtainPairView.as_view(), name='test_token_obtain_pair'),
 ]
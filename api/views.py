@@ -1,13 +1,12 @@
 from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import api_view, permission_classes, action
 from django.contrib.auth import get_user_model
-from django.db.models import Q, Sum
-from django.db.models.functions import Coalesce
 from django.utils import timezone
-from datetime import timedelta
-from .ai_helper import suggest_task_for_user
+from .suggestions import get_suggestion, suggest_task_for_user
 import logging
+from functools import wraps
 from rest_framework.views import APIView
+from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 from rest_framework.permissions import AllowAny, IsAuthenticatedOrReadOnly
@@ -16,21 +15,38 @@ from django.contrib.auth.tokens import default_token_generator
 from django.utils.encoding import force_bytes
 from django.utils.http import urlsafe_base64_decode, urlsafe_base64_encode
 from django.core.mail import send_mail
-from django.http import JsonResponse
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, HttpResponseNotAllowed, JsonResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.exceptions import InvalidToken
 from django.views.decorators.csrf import csrf_exempt
 
+from .authentication import CachedJWTAuthentication
+
 # Import serializers and models
 from .serializers import (
     UserSerializer,
     UserRegisterSerializer,
     ChangePasswordSerializer,
     NotificationSerializer,
+    NotificationIdsSerializer,
     TaskSerializer,
+    TaskBulkSerializer,
+    OccurrenceWindowSerializer,
+    CalendarQuerySerializer,
+    DashboardPeriodSerializer,
+    TaskOccurrenceSerializer,
     CategorySerializer,
     AppWebsiteSerializer,
     ProjectSerializer,
 )
-from .models import Notification, Task, Category, AppWebsite, Project
+from .models import Notification, Task, TaskOccurrence, Category, AppWebsite, Project
+from .pagination import NotificationPagination, OccurrencePagination, TaskPagination
+from .search import search_tasks
+from .bulk import apply_task_operations
+from . import dashboard_cache, db_pool, events, fieldsets, metrics, periods, planner, recurrence, renderers, watermarks
 
 User = get_user_model()
 logger = logging.getLogger(__name__)
@@ -42,6 +58,12 @@ logger = logging.getLogger(__name__)
 def hello_world(request):
     return Response({'message': 'Hello, world!'})
 
+@api_view(['GET'])
+@permission_classes([permissions.IsAdminUser])
+def db_pool_stats(request):
+    stats = db_pool.pool_stats()
+    return Response({'pooled': stats is not None, **(stats or {})})
+
 class RegisterView(APIView):
     permission_classes = [permissions.AllowAny]
 
@@ -145,16 +167,44 @@ def confirm_password_reset(request):
 
 # --- Task Management Views ---
 
-class TaskViewSet(viewsets.ModelViewSet):
+class TaskViewSet(fieldsets.SparseFieldsetMixin, watermarks.ConditionalListMixin, viewsets.ModelViewSet):
+    watermark_resource = watermarks.TASKS
     queryset = Task.objects.all()
     serializer_class = TaskSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = TaskPagination
+
+    def get_expand(self):
+        """Related objects requested via ?expand=category,project,app_website (and not left out by ?fields=)."""
+        expand = self.request.query_params.get('expand', '')
+        return [
+            name for name in expand.split(',')
+            if name in TaskSerializer.EXPANDABLE_FIELDS and self.serializes(name)
+        ]
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['expand'] = self.get_expand()
+        return context
+
+    def get_columns(self, model):
+        columns = super().get_columns(model)
+        # Expanded relations are only read for their name.
+        return columns and columns + [f'{name}__name' for name in self.get_expand()]
 
     def get_queryset(self):
+        # Load subtasks in one extra query per page, and join expanded relations
+        # instead of looking each one up per task.
         user_tasks = self.queryset.filter(user=self.request.user)
+        if self.serializes('subtasks'):
+            user_tasks = user_tasks.prefetch_related('subtasks')
+        expand = self.get_expand()
+        if expand:
+            user_tasks = user_tasks.select_related(*expand)
+
         search_query = self.request.query_params.get('search', None)
         if search_query:
-            user_tasks = user_tasks.filter(Q(title__icontains=search_query) | Q(description__icontains=search_query))
+            user_tasks = search_tasks(user_tasks, search_query)
 
         status_filter = self.request.query_params.get('status', None)
         if status_filter:
@@ -173,6 +223,9 @@ class TaskViewSet(viewsets.ModelViewSet):
             today = timezone.now().date()
             user_tasks = user_tasks.filter(due_date=today)
 
+        if search_query:
+            # Best matches first; keyset pagination applies its own ordering.
+            return user_tasks.order_by('-search_rank', 'due_date', 'priority', '-created_at')
         return user_tasks.order_by('due_date', 'priority', '-created_at')
 
     def perform_create(self, serializer):
@@ -181,15 +234,73 @@ class TaskViewSet(viewsets.ModelViewSet):
     def perform_update(self, serializer):
         serializer.save()
 
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk(self, request):
+        """Create, partially update and delete many tasks in one all-or-nothing batch."""
+        serializer = TaskBulkSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        results, errors = apply_task_operations(request.user, serializer.validated_data, self.get_serializer_context())
+        if errors:
+            return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+        return Response({'results': results}, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=['get'], url_path='occurrences')
+    def occurrences(self, request):
+        """
+        Occurrences of one-off and recurring tasks between ?start= and ?end=, for
+        planner views, in pages of ?page_size= (see OccurrencePagination).
+        """
+        window = OccurrenceWindowSerializer(data=request.query_params)
+        window.is_valid(raise_exception=True)
+        start, end = window.validated_data['start'], window.validated_data['end']
+        paginator = OccurrencePagination()
+        page = paginator.paginate_queryset(
+            recurrence.expand(Task.objects.filter(user=request.user), start, end), request, view=self,
+        )
+        return Response(
+            {'start': start, 'end': end, **paginator.get_paginated_response(page).data}, status=status.HTTP_200_OK,
+        )
+
+    @action(detail=False, methods=['get'], url_path='calendar')
+    def calendar(self, request):
+        """Per-day pending/done/overdue counts and planned minutes between ?start= and ?end=."""
+        query = CalendarQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        start, end = query.validated_data['start'], query.validated_data['end']
+        days = planner.calendar_days(
+            Task.objects.filter(user=request.user), start, end, timezone.localdate(), top=query.validated_data['top'],
+        )
+        return Response({'start': start, 'end': end, 'days': days}, status=status.HTTP_200_OK)
+
+    @action(detail=True, methods=['post'], url_path='occurrences')
+    def occurrence(self, request, pk=None):
+        """Mark one date of a recurring task DONE or SKIPPED, or back to PENDING."""
+        task = self.get_object()
+        serializer = TaskOccurrenceSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        day, occurrence_status = serializer.validated_data['date'], serializer.validated_data['status']
+        if task.recurrence_pattern == 'NONE' or not recurrence.is_occurrence(task, day):
+            return Response({'date': ['The task does not recur on this date.']}, status=status.HTTP_400_BAD_REQUEST)
+
+        if occurrence_status == 'PENDING':
+            TaskOccurrence.objects.filter(task=task, date=day).delete()
+        else:
+            TaskOccurrence.objects.update_or_create(task=task, date=day, defaults={'status': occurrence_status})
+        watermarks.bump([request.user.pk], watermarks.TASKS)
+        events.publish(request.user.pk, 'task.updated', {'id': task.pk})
+        return Response({'task': task.pk, 'date': day, 'status': occurrence_status}, status=status.HTTP_200_OK)
+
 # --- Notification Views ---
 
-class NotificationViewSet(viewsets.ModelViewSet):
+class NotificationViewSet(fieldsets.SparseFieldsetMixin, watermarks.ConditionalListMixin, viewsets.ModelViewSet):
+    watermark_resource = watermarks.NOTIFICATIONS
     queryset = Notification.objects.all()
     serializer_class = NotificationSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = NotificationPagination
 
     def get_queryset(self):
-        return self.queryset.filter(user=self.request.user).order_by('-created_at')
+        return self.queryset.filter(user=self.request.user).order_by('-created_at', '-id')
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
@@ -204,9 +315,177 @@ class NotificationViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(notification)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
+    @action(detail=False, methods=['get'], url_path='unread-count')
+    def unread_count(self, request):
+        """Number of unread notifications, counted from the partial unread index."""
+        count = Notification.objects.filter(user=request.user, is_read=False).count()
+        return Response({'unread': count}, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=['post'], url_path='mark-read')
+    def mark_read(self, request):
+        """Mark the given notification ids as read in one UPDATE."""
+        serializer = NotificationIdsSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        updated = self.mark_unread_as_read(
+            Notification.objects.filter(user=request.user, pk__in=serializer.validated_data['ids'])
+        )
+        return Response({'updated': updated}, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=['post'], url_path='mark-all-read')
+    def mark_all_read(self, request):
+        """Mark every unread notification as read in one UPDATE."""
+        updated = self.mark_unread_as_read(Notification.objects.filter(user=request.user))
+        return Response({'updated': updated}, status=status.HTTP_200_OK)
+
+    def mark_unread_as_read(self, notifications):
+        updated = notifications.filter(is_read=False).update(is_read=True, read_at=timezone.now())
+        if updated:
+            # update() skips signals, so move the list's ETag watermark and notify streams here.
+            watermarks.bump([self.request.user.pk], watermarks.NOTIFICATIONS)
+            events.publish(self.request.user.pk, 'notifications.read', {'updated': updated})
+        return updated
+
+# --- Server-Sent Events ---
+
+def authenticate_event_stream(request):
+    """
+    The user of a JWT from the Authorization header or the access_token cookie
+    (browsers' EventSource cannot send headers), or None.
+    """
+    authentication = CachedJWTAuthentication()
+    header = authentication.get_header(request)
+    raw_token = authentication.get_raw_token(header) if header else request.COOKIES.get('access_token')
+    if not raw_token:
+        return None
+    try:
+        return authentication.get_user(authentication.get_validated_token(raw_token))
+    except (InvalidToken, AuthenticationFailed):
+        return None
+
+
+async def event_stream(request):
+    """
+    Streams the user's notification and task events as text/event-stream.
+    Only served over ASGI: a WSGI server would drain the endless stream on
+    one of its workers per client.
+    """
+    if request.method != 'GET':
+        return HttpResponseNotAllowed(['GET'])
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse({'detail': 'Event streams need the ASGI server (SERVER_MODE=asgi).'}, status=501)
+    user = await sync_to_async(authenticate_event_stream)(request)
+    if user is None:
+        return JsonResponse({'detail': 'Authentication credentials were not provided or are invalid.'}, status=401)
+    response = StreamingHttpResponse(events.stream(user.pk), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # Stop nginx from buffering the stream
+    return response
+
+# --- Async read endpoints ---
+# Async twins of the dashboard and task list/detail GETs. Under an ASGI worker
+# a request waiting on the database only holds a coroutine, not a thread.
+# Cache reads stay synchronous: Django's async cache methods just hand the same
+# call to a thread.
+
+async def authenticate_async(request):
+    """The user of the request's JWT Authorization header, or None."""
+    authentication = CachedJWTAuthentication()
+    header = authentication.get_header(request)
+    raw_token = authentication.get_raw_token(header) if header else None
+    if not raw_token:
+        return None
+    try:
+        return await authentication.aget_user(authentication.get_validated_token(raw_token))
+    except (InvalidToken, AuthenticationFailed):
+        return None
+
+
+def async_read_view(view):
+    """Allows GET only and passes the authenticated user on, as IsAuthenticated would."""
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        if request.method != 'GET':
+            return HttpResponseNotAllowed(['GET'])
+        user = await authenticate_async(request)
+        if user is None:
+            response = JsonResponse({'detail': 'Authentication credentials were not provided or are invalid.'}, status=401)
+            response['WWW-Authenticate'] = 'Bearer realm="api"'
+            return response
+        request.user = user
+        return await view(request, *args, **kwargs)
+    return wrapper
+
+
+def json_response(data, status=200):
+    """A JSON response encoded like the DRF views' (see api.renderers)."""
+    return HttpResponse(renderers.dumps(data), content_type='application/json', status=status)
+
+
+@async_read_view
+async def dashboard_metrics_async(request):
+    """DashboardMetricsView.get() through the async ORM; periods run the sync path in a thread."""
+    user = request.user
+    today = timezone.localdate()
+    view = DashboardMetricsView()
+
+    async def build_payload():
+        return view.summary_payload(await metrics.adashboard_summary(user, today))
+
+    if any(param in request.GET for param in view.period_params):
+        query = DashboardPeriodSerializer(data=request.GET)
+        if not query.is_valid():
+            return json_response(query.errors, status=400)
+        response_data = await sync_to_async(view.build_period_payload)(user, today, **query.validated_data)
+    else:
+        response_data = await dashboard_cache.acached_payload(user.pk, today, build_payload)
+    ai_insights = await dashboard_cache.acached_ai_insight(
+        user.pk, today, sync_to_async(lambda: view.build_ai_insights(user)),
+    )
+    return json_response({**response_data, "aiInsights": ai_insights + response_data["aiInsights"]})
+
+
+def async_task_view(request, action, **kwargs):
+    """A TaskViewSet bound to `request`, for its queryset, filters and serializer."""
+    drf_request = Request(request)
+    drf_request.user = request.user
+    return TaskViewSet(request=drf_request, action=action, format_kwarg=None, args=(), kwargs=kwargs)
+
+
+async def task_queryset(view):
+    """
+    The view's filtered queryset, built in a thread: filters like ?search= may
+    query while building it (search checks for its FTS table on first use).
+    """
+    return await sync_to_async(lambda: view.filter_queryset(view.get_queryset()))()
+
+
+@async_read_view
+async def task_list_async(request):
+    """TaskViewSet.list(), with the same filters, pagination and conditional GET."""
+    view = async_task_view(request, 'list')
+    etag, last_modified = watermarks.list_validators(request, view.watermark_resource, 'application/json')
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        paginator = view.paginator
+        page = await paginator.apaginate_queryset(await task_queryset(view), view.request, view=view)
+        response = json_response(paginator.get_paginated_response(view.get_serializer(page, many=True).data).data)
+    return watermarks.stamp(response, etag, last_modified)
+
+
+@async_read_view
+async def task_detail_async(request, pk):
+    """TaskViewSet.retrieve()."""
+    view = async_task_view(request, 'retrieve', pk=pk)
+    try:
+        task = await (await task_queryset(view)).aget(pk=pk)
+    except Task.DoesNotExist:
+        return JsonResponse({'detail': 'No Task matches the given query.'}, status=404)
+    return json_response(view.get_serializer(task).data)
+
 # --- Category Views ---
 
-class CategoryViewSet(viewsets.ModelViewSet):
+class CategoryViewSet(fieldsets.SparseFieldsetMixin, watermarks.ConditionalListMixin, viewsets.ModelViewSet):
+    watermark_resource = watermarks.CATEGORIES
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -219,7 +498,8 @@ class CategoryViewSet(viewsets.ModelViewSet):
 
 # --- AppWebsite Views ---
 
-class AppWebsiteViewSet(viewsets.ModelViewSet):
+class AppWebsiteViewSet(fieldsets.SparseFieldsetMixin, watermarks.ConditionalListMixin, viewsets.ModelViewSet):
+    watermark_resource = watermarks.APP_WEBSITES
     queryset = AppWebsite.objects.all()
     serializer_class = AppWebsiteSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -232,13 +512,33 @@ class AppWebsiteViewSet(viewsets.ModelViewSet):
 
 # --- Project Views ---
 
-class ProjectViewSet(viewsets.ModelViewSet):
+class ProjectViewSet(fieldsets.SparseFieldsetMixin, watermarks.ConditionalListMixin, viewsets.ModelViewSet):
     queryset = Project.objects.all()
     serializer_class = ProjectSerializer
     permission_classes = [permissions.IsAuthenticated]
 
+    def with_stats(self):
+        """Whether the list was asked for task progress stats via ?stats=true."""
+        return self.action == 'list' and self.request.query_params.get('stats', '').lower() in ('true', '1', 'yes')
+
+    @property
+    def watermark_resource(self):
+        # Stats move with every task and subtask write; project writes bump the tasks watermark too.
+        return watermarks.TASKS if self.with_stats() else watermarks.PROJECTS
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['stats'] = self.with_stats()
+        return context
+
     def get_queryset(self):
-        return self.queryset.filter(user=self.request.user)
+        user_projects = self.queryset.filter(user=self.request.user)
+        if self.with_stats():
+            # Grouped queries drop Meta.ordering, which pagination relies on.
+            user_projects = user_projects.annotate(
+                **metrics.project_stats_expressions(timezone.localdate())
+            ).order_by(*Project._meta.ordering, 'pk')
+        return user_projects
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
@@ -266,134 +566,142 @@ def suggest_task(request):
 @permission_classes([IsAuthenticatedOrReadOnly])
 def get_ai_suggestion(request):
     user = request.user if request.user.is_authenticated else None
-    suggestion = suggest_task_for_user(user)
+    suggestion = get_suggestion(user)
     return Response(suggestion)
 
 # --- Dashboard Metrics View ---
 
 class DashboardMetricsView(APIView):
     permission_classes = [permissions.IsAuthenticated]
+    # Any of these switches from today's numbers to a period (see DashboardPeriodSerializer).
+    period_params = ('period', 'date', 'start_date', 'end_date')
 
     def get(self, request, *args, **kwargs):
         user = request.user
-        today = timezone.now().date()
-        yesterday = today - timedelta(days=1)
+        today = timezone.localdate()
 
-        try:
-            work_category = Category.objects.get(user=user, name='Work')
-            focus_category = Category.objects.get(user=user, name='Focus')
-            work_category_id = work_category.id
-            focus_category_id = focus_category.id
-        except Category.DoesNotExist:
-            work_category_id = None
-            focus_category_id = None
-
-        completed_tasks_today = Task.objects.filter(
-            user=user,
-            status='DONE',
-            updated_at__date=today,
-            duration_minutes__isnull=False
-        )
-        completed_tasks_yesterday = Task.objects.filter(
-            user=user,
-            status='DONE',
-            updated_at__date=yesterday,
-            duration_minutes__isnull=False
-        )
+        if any(param in request.query_params for param in self.period_params):
+            query = DashboardPeriodSerializer(data=request.query_params)
+            query.is_valid(raise_exception=True)
+            response_data = self.build_period_payload(user, today, **query.validated_data)
+        else:
+            response_data = dashboard_cache.cached_payload(user.pk, today, lambda: self.build_payload(user, today))
+        ai_insights = dashboard_cache.cached_ai_insight(user.pk, today, lambda: self.build_ai_insights(user))
+        response_data = {**response_data, "aiInsights": ai_insights + response_data["aiInsights"]}
 
-        total_work_minutes_today = 0
-        if work_category_id:
-            total_work_minutes_today += completed_tasks_today.filter(
-                category=work_category_id
-            ).aggregate(Sum('duration_minutes'))['duration_minutes__sum'] or 0
-        if focus_category_id:
-            total_work_minutes_today += completed_tasks_today.filter(
-                category=focus_category_id
-            ).aggregate(Sum('duration_minutes'))['duration_minutes__sum'] or 0
+        return Response(response_data, status=status.HTTP_200_OK)
+
+    def build_ai_insights(self, user):
+        """Returns (insights, cacheable); failures are not cached so the next request retries."""
+        try:
+            suggested_task = suggest_task_for_user(user)
+        except Exception as e:
+            logger.error(f"Error calling AI helper: {e}", exc_info=True)
+            return [{
+                "icon": "Lightbulb",
+                "text": "AI is unable to generate a suggestion at this time."
+            }], False
+        if not suggested_task:
+            return [], True
+        return [{
+            "icon": "Lightbulb",
+            "text": f"AI suggests: {suggested_task}"
+        }], True
+
+    def build_payload(self, user, today):
+        return self.summary_payload(metrics.dashboard_summary(user, today))
+
+    def build_period_payload(self, user, today, period, start, end):
+        """The dashboard of [start, end] compared with the period before, plus bucketed series."""
+        result = periods.period_metrics(user, period, start, end, today)
+        current, previous = result['current'], result['previous']
+        response_data = self.summary_payload({
+            'work_minutes_today': current['work_minutes'],
+            'work_minutes_yesterday': previous['work_minutes'],
+            'focus_minutes_today': current['focus_minutes'],
+            'minutes_by_category': current['minutes_by_category'],
+            'minutes_by_app': current['minutes_by_app'],
+            'tasks_due_today': current['tasks_due'],
+            'days': result['days'],
+            'label': result['label'],
+        })
+        response_data['period'] = {
+            'kind': period,
+            'start': start,
+            'end': end,
+            'previousStart': result['previous_start'],
+            'previousEnd': result['previous_end'],
+        }
+        response_data['series'] = result['series']
+        response_data['comparison'] = {
+            name: {'current': current[key], 'previous': previous[key]}
+            for name, key in (
+                ('workMinutes', 'work_minutes'),
+                ('focusMinutes', 'focus_minutes'),
+                ('completions', 'completed'),
+                ('tasksDue', 'tasks_due'),
+            )
+        }
+        return response_data
+
+    def summary_payload(self, summary):
+        total_work_minutes_today = summary['work_minutes_today']
+        total_work_minutes_yesterday = summary['work_minutes_yesterday']
+        focus_minutes_today = summary['focus_minutes_today']
+        minutes_by_category = summary['minutes_by_category']
+        minutes_by_app = summary['minutes_by_app']
+        tasks_due_today_count = summary['tasks_due_today']
+        # Insights name the dashboard's period, "today" unless a period was requested.
+        label = summary.get('label', 'today')
 
         work_hours_display = {
             "hours": total_work_minutes_today // 60,
             "minutes": total_work_minutes_today % 60
         }
 
-        total_work_minutes_yesterday = 0
-        if work_category_id:
-            total_work_minutes_yesterday += completed_tasks_yesterday.filter(
-                category=work_category_id
-            ).aggregate(Sum('duration_minutes'))['duration_minutes__sum'] or 0
-        if focus_category_id:
-            total_work_minutes_yesterday += completed_tasks_yesterday.filter(
-                category=focus_category_id
-            ).aggregate(Sum('duration_minutes'))['duration_minutes__sum'] or 0
-
         work_hours_trend = "neutral"
         if total_work_minutes_today > total_work_minutes_yesterday:
             work_hours_trend = "increase"
         elif total_work_minutes_today < total_work_minutes_yesterday:
             work_hours_trend = "decrease"
 
-        daily_target_minutes = 480
+        daily_target_minutes = 480 * summary.get('days', 1)
         percent_of_target = (total_work_minutes_today / daily_target_minutes) * 100 if daily_target_minutes > 0 else 0
         percent_of_target = round(min(percent_of_target, 100))
 
-        focus_minutes_today = 0
-        if focus_category_id:
-            focus_minutes_today = completed_tasks_today.filter(
-                category=focus_category_id
-            ).aggregate(Sum('duration_minutes'))['duration_minutes__sum'] or 0
-
         focus_percent = (focus_minutes_today / total_work_minutes_today * 100) if total_work_minutes_today > 0 else 0
         focus_percent = round(focus_percent)
 
-        daily_summary_minutes_by_category = completed_tasks_today.values('category__name').annotate(
-            minutes=Coalesce(Sum('duration_minutes'), 0)
-        ).order_by('category__name')
-
+        category_labels = sorted(minutes_by_category)
         daily_summary_data = {
-            'labels': [item['category__name'] for item in daily_summary_minutes_by_category if item['category__name']],
-            'data': [item['minutes'] for item in daily_summary_minutes_by_category],
+            'labels': category_labels,
+            'data': [minutes_by_category[name] for name in category_labels],
         }
 
-        productive_apps_today = completed_tasks_today.values('app_website__name').annotate(
-            minutes=Coalesce(Sum('duration_minutes'), 0)
-        ).order_by('-minutes')[:5]
-
         productive_apps = [{
-            "name": item['app_website__name'],
-            "minutes": item['minutes']
-        } for item in productive_apps_today if item['app_website__name']]
+            "name": name,
+            "minutes": minutes
+        } for name, minutes in sorted(minutes_by_app.items(), key=lambda item: -item[1])[:5]]
 
         ai_insights = []
 
-        try:
-            suggested_task = suggest_task_for_user(user)
-            if suggested_task:
-                ai_insights.append({
-                    "icon": "Lightbulb",
-                    "text": f"AI suggests: {suggested_task}"
-                })
-        except Exception as e:
-            ai_insights.append({
-                "icon": "Lightbulb",
-                "text": "AI is unable to generate a suggestion at this time."
-            })
-            logger.error(f"Error calling AI helper: {e}", exc_info=True)
-
         if total_work_minutes_today > 0:
             if work_hours_trend == "increase":
                 ai_insights.append({
                     "icon": "TrendingUp",
-                    "text": "You're building momentum! Keep up the great work."
+                    "text": "You're building momentum! Keep up the great work." if label == 'today'
+                    else f"More work done {label} than in the period before. Keep up the great work!"
                 })
             elif work_hours_trend == "decrease":
                 ai_insights.append({
                     "icon": "TrendingDown",
-                    "text": "A slightly slower day, consider a short break to recharge."
+                    "text": "A slightly slower day, consider a short break to recharge." if label == 'today'
+                    else f"Less work done {label} than in the period before, consider a short break to recharge."
                 })
             else:
                 ai_insights.append({
                     "icon": "CheckCircle",
-                    "text": "Your productivity is consistent today. Great job!"
+                    "text": f"Your productivity is consistent {label}. Great job!"
                 })
         else:
             ai_insights.append({
@@ -401,16 +709,11 @@ class DashboardMetricsView(APIView):
                 "text": "Complete a task to get your first insight!"
             })
 
-        tasks_due_today_count = Task.objects.filter(
-            user=user,
-            due_date=today,
-            status='PENDING'
-        ).count()
-
         if tasks_due_today_count > 0:
             ai_insights.append({
                 "icon": "Clock",
-                "text": f"You have {tasks_due_today_count} tasks due today. Prioritize wisely!"
+                "text": f"You have {tasks_due_today_count} tasks due today. Prioritize wisely!" if label == 'today'
+                else f"{tasks_due_today_count} tasks due {label} are still pending. Prioritize wisely!"
             })
 
         response_data = {
@@ -423,8 +726,7 @@ class DashboardMetricsView(APIView):
             "aiInsights": ai_insights,
             "tasksDueToday": tasks_due_today_count
         }
-
-        return Response(response_data, status=status.HTTP_200_OK)
+        return response_data
 
 
 # --- Cookie-based Authentication Views (Optional) ---
@@ -483,7 +785,3 @@ class CookieLogoutView(APIView):
 
 class MyTokenObtainPairView(TokenObtainPairView):
     permission_classes = [AllowAny]
-
-    def post(self, request, *args, **kwargs):
-        print('MyTokenObtainPairView POST called with:', request.data)
-        return super().post(request, *args, **kwargs)
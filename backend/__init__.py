@@ -1,7 +1,13 @@
 # backend/__init__.py
 from __future__ import absolute_import, unicode_literals
 
-# Import Celery app
-from .celery import app as celery_app
-
 __all__ = ('celery_app',)
+
+
+def __getattr__(name):
+    # Celery is imported on first use rather than with Django: web workers only
+    # need it to queue a task, and `celery -A backend` finds backend.celery itself.
+    if name == 'celery_app':
+        from .celery import app
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
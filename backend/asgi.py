@@ -11,6 +11,9 @@ import os
 
 from django.core.asgi import get_asgi_application
 
+from backend.env import load_env
+
+load_env()
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
 
 application = get_asgi_application()
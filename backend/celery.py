@@ -3,6 +3,9 @@ import os
 from celery import Celery
 from celery.schedules import crontab
 
+from .env import load_env
+
+load_env()
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
 
 app = Celery('backend')
@@ -23,6 +26,10 @@ app.conf.beat_schedule = {
         'task': 'api.tasks.send_overdue_task_reminders',
         'schedule': crontab(hour=9, minute=0),  # Every day at 9:00 AM
     },
+    'precompute-ai-suggestions': {
+        'task': 'api.tasks.precompute_ai_suggestions',
+        'schedule': crontab(hour=6, minute=0),  # Every day at 6:00 AM
+    },
 }
 
 @app.task(bind=True)
@@ -0,0 +1,15 @@
+# backend/env.py
+import os
+
+
+def load_env():
+    """
+    Load .env.local (or .env) from the working directory into os.environ.
+
+    Called by the entry points (manage.py, wsgi, asgi, celery) before settings
+    are imported, so importing backend.settings itself has no side effects.
+    """
+    env_file = '.env.local' if os.path.exists('.env.local') else '.env'
+    if os.path.exists(env_file):
+        from dotenv import load_dotenv
+        load_dotenv(env_file)
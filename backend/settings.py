@@ -2,12 +2,8 @@ import os
 from pathlib import Path
 from datetime import timedelta
 import dj_database_url
-from dotenv import load_dotenv
 
-# ---- Load environment variables only if .env file exists ---- #
-env_file = '.env.local' if os.path.exists('.env.local') else '.env'
-if os.path.exists(env_file):
-    load_dotenv(env_file)
+# .env files are loaded by the entry points (backend.env.load_env), not here.
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -74,20 +70,35 @@ TEMPLATES = [
 WSGI_APPLICATION = 'backend.wsgi.application'
 
 # ---- DATABASE ---- #
-
-print("DATABASE_URL being used:", os.environ.get("DATABASE_URL"))  # Debug print to confirm env var loaded
-
 DATABASE_URL = os.environ.get('DATABASE_URL')
+# Connections pooled per process (web and Celery workers alike); 0 turns pooling
+# off and keeps one persistent, health-checked connection per worker thread instead.
+DB_POOL_MAX_SIZE = int(os.environ.get('DB_POOL_MAX_SIZE', 10))
+DB_POOL_MIN_SIZE = int(os.environ.get('DB_POOL_MIN_SIZE', 2))
+# Seconds a request waits for a free pooled connection before failing.
+DB_POOL_TIMEOUT = float(os.environ.get('DB_POOL_TIMEOUT', 10))
+# Pooled connections are replaced after this many seconds, so a failover is fully drained.
+DB_POOL_MAX_LIFETIME = float(os.environ.get('DB_POOL_MAX_LIFETIME', 1800))
 
 if DATABASE_URL:
     DATABASES = {
         'default': dj_database_url.config(
             default=DATABASE_URL,
-            conn_max_age=600,
+            conn_max_age=0 if DB_POOL_MAX_SIZE else 600,
+            conn_health_checks=True,
             ssl_require=True,  # Keep this for SSL
         )
     }
     # Remove redundant manual sslmode setting to avoid conflicts
+    # With CONN_HEALTH_CHECKS the pool pings each connection on checkout, so one
+    # broken by a failover is replaced instead of failing the request.
+    if DB_POOL_MAX_SIZE and DATABASES['default']['ENGINE'] == 'django.db.backends.postgresql':
+        DATABASES['default']['OPTIONS']['pool'] = {
+            'min_size': min(DB_POOL_MIN_SIZE, DB_POOL_MAX_SIZE),
+            'max_size': DB_POOL_MAX_SIZE,
+            'timeout': DB_POOL_TIMEOUT,
+            'max_lifetime': DB_POOL_MAX_LIFETIME,
+        }
 else:
     # Local fallback
     DATABASES = {
@@ -122,15 +133,91 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # ---- REST FRAMEWORK ---- #
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
     'DEFAULT_PAGINATION_CLASS': 'api.pagination.SafePageNumberPagination',
     'PAGE_SIZE': 3,
+    # orjson by default; MessagePack when the client asks for application/msgpack.
+    'DEFAULT_RENDERER_CLASSES': (
+        'api.renderers.ORJSONRenderer',
+        'api.renderers.MessagePackRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'api.renderers.ORJSONParser',
+        'api.renderers.MessagePackParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
 }
 
+# ---- DASHBOARD ---- #
+# 'rollups' reads the precomputed DailyTaskRollup table, 'live' aggregates the Task table directly.
+DASHBOARD_METRICS_SOURCE = os.environ.get('DASHBOARD_METRICS_SOURCE', 'rollups')
+# Seconds a user's dashboard payload stays cached; task and category writes invalidate it sooner.
+DASHBOARD_CACHE_TTL = int(os.environ.get('DASHBOARD_CACHE_TTL', 300))
+# The AI insight is cached separately and only expires with its own TTL.
+DASHBOARD_AI_CACHE_TTL = int(os.environ.get('DASHBOARD_AI_CACHE_TTL', 3600))
+# Metric buckets of past days only change when an edit reaches back, so they are kept for a week.
+DASHBOARD_HISTORY_CACHE_TTL = int(os.environ.get('DASHBOARD_HISTORY_CACHE_TTL', 7 * 24 * 3600))
+# Longest custom ?start_date=/?end_date= range the dashboard metrics accept.
+DASHBOARD_MAX_PERIOD_DAYS = int(os.environ.get('DASHBOARD_MAX_PERIOD_DAYS', 366))
+
+# ---- CACHE ---- #
+# Per-process memory by default; set REDIS_CACHE_URL to share the cache between workers.
+REDIS_CACHE_URL = os.environ.get('REDIS_CACHE_URL')
+if REDIS_CACHE_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_CACHE_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'dashboard',
+        }
+    }
+# Whether every web worker and Celery see the same cache. Without it an entry one
+# process drops stays in the others, so features that rely on that are off.
+SHARED_CACHE = bool(REDIS_CACHE_URL)
+
+# ---- CONDITIONAL LISTS ---- #
+# Answer If-None-Match / If-Modified-Since on list endpoints with 304 from cached
+# per-user write watermarks. Needs SHARED_CACHE: a write in another process
+# cannot move this process's watermark.
+LIST_CONDITIONAL_GET = os.environ.get('LIST_CONDITIONAL_GET', str(SHARED_CACHE)) == 'True'
+# Seconds a watermark lives; an expired one restarts at now, so a missed bump heals.
+LIST_WATERMARK_TTL = int(os.environ.get('LIST_WATERMARK_TTL', 3600))
+
+# ---- TASKS ---- #
+# Upper bound on create/update/delete operations in one POST /api/tasks/bulk/ request.
+TASK_BULK_MAX_OPERATIONS = int(os.environ.get('TASK_BULK_MAX_OPERATIONS', 1000))
+# Widest date window GET /api/tasks/occurrences/ expands recurring tasks over.
+RECURRENCE_MAX_WINDOW_DAYS = int(os.environ.get('RECURRENCE_MAX_WINDOW_DAYS', 92))
+# Widest date window of GET /api/tasks/calendar/, which returns per-day counts.
+CALENDAR_MAX_WINDOW_DAYS = int(os.environ.get('CALENDAR_MAX_WINDOW_DAYS', 366))
+# Users per committed chunk of the daily overdue reminder job.
+OVERDUE_REMINDER_CHUNK_SIZE = int(os.environ.get('OVERDUE_REMINDER_CHUNK_SIZE', 500))
+# Users per Celery subtask of the daily productivity summary email.
+PRODUCTIVITY_SUMMARY_CHUNK_SIZE = int(os.environ.get('PRODUCTIVITY_SUMMARY_CHUNK_SIZE', 1000))
+
+# ---- SERVER-SENT EVENTS ---- #
+# In-process pub/sub by default, which only reaches streams served by the same
+# process; set EVENT_BUS_REDIS_URL when running several ASGI workers.
+EVENT_BUS_REDIS_URL = os.environ.get('EVENT_BUS_REDIS_URL')
+EVENT_BUS_BACKEND = os.environ.get(
+    'EVENT_BUS_BACKEND',
+    'api.events.RedisEventBus' if EVENT_BUS_REDIS_URL else 'api.events.InProcessEventBus',
+)
+# Seconds between keep-alive comments on an idle /api/events/ stream.
+EVENT_STREAM_KEEPALIVE = int(os.environ.get('EVENT_STREAM_KEEPALIVE', 15))
+
 # ---- SIMPLE JWT ---- #
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=60),
@@ -142,6 +229,10 @@ SIMPLE_JWT = {
     'SIGNING_KEY': SECRET_KEY,
     'AUTH_HEADER_TYPES': ('Bearer',),
 }
+# Seconds an authenticated user's row is served from the cache; saving the user drops it sooner.
+# Requires SHARED_CACHE: other workers would keep authenticating a deactivated user
+# or an old password for the whole TTL, so without one it defaults to 0 (no caching).
+AUTH_USER_CACHE_TTL = int(os.environ.get('AUTH_USER_CACHE_TTL', 60 if SHARED_CACHE else 0))
 
 # ---- CORS & CSRF ---- #
 CORS_ALLOWED_ORIGINS = [
@@ -167,6 +258,23 @@ DEFAULT_FROM_EMAIL = os.environ.get("DEFAULT_FROM_EMAIL", "no-reply@yourapp.com"
 
 # ---- OPENAI API KEY ---- #
 OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY")
+# None uses the OpenAI default; point it at any compatible server.
+OPENAI_BASE_URL = os.environ.get("OPENAI_BASE_URL")
+AI_SUGGESTION_MODEL = os.environ.get("AI_SUGGESTION_MODEL", "gpt-3.5-turbo")
+# Seconds one suggestion call may take before it is abandoned; calls are never retried.
+AI_SUGGESTION_TIMEOUT = float(os.environ.get("AI_SUGGESTION_TIMEOUT", 3))
+# Suggestions are precomputed by Celery daily; keep them a little longer than a day.
+AI_SUGGESTION_CACHE_TTL = int(os.environ.get("AI_SUGGESTION_CACHE_TTL", 26 * 3600))
+# A request that finds no suggestion queues at most one refresh per user in this many seconds.
+AI_SUGGESTION_PENDING_TTL = int(os.environ.get("AI_SUGGESTION_PENDING_TTL", 300))
+# The daily precompute covers users who touched a task within this many days.
+AI_SUGGESTION_ACTIVE_DAYS = int(os.environ.get("AI_SUGGESTION_ACTIVE_DAYS", 7))
+# Users per Celery subtask of the daily precompute.
+AI_SUGGESTION_CHUNK_SIZE = int(os.environ.get("AI_SUGGESTION_CHUNK_SIZE", 200))
+# Failures within AI_CIRCUIT_RESET_SECONDS that open the circuit, and seconds before a probe call is let through.
+# The circuit is per process unless SHARED_CACHE.
+AI_CIRCUIT_FAILURE_THRESHOLD = int(os.environ.get("AI_CIRCUIT_FAILURE_THRESHOLD", 3))
+AI_CIRCUIT_RESET_SECONDS = int(os.environ.get("AI_CIRCUIT_RESET_SECONDS", 60))
 
 # ---- SECURITY BEST PRACTICES ---- #
 SECURE_SSL_REDIRECT = not DEBUG
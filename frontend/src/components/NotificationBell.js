@@ -1,21 +1,16 @@
 // src/components/NotificationBell.js
-import React, { useMemo } from 'react';
+import React from 'react';
 import { useAuthContext } from '../context/AuthContext';
 import { useNotificationContext } from '../context/NotificationContext'; // Correct import
 import { useToast } from '@chakra-ui/react';
 
 function NotificationBell({ onBellClick }) {
   const { isAuthenticated } = useAuthContext();
-  const { notifications } = useNotificationContext();
+  const { unreadCount: serverUnreadCount } = useNotificationContext();
 
   const toast = useToast();
 
-  const unreadCount = useMemo(() => {
-    if (isAuthenticated && Array.isArray(notifications)) {
-      return notifications.filter(notification => !notification.is_read).length;
-    }
-    return 0;
-  }, [notifications, isAuthenticated]);
+  const unreadCount = isAuthenticated ? serverUnreadCount : 0;
 
   const handleClick = () => {
     if (!isAuthenticated) {
@@ -1,5 +1,6 @@
 import React, { createContext, useContext, useState, useEffect, useCallback, useMemo } from 'react';
 import { apiClient } from '../services/api';
+import { subscribeToEvents } from '../services/events';
 import { useAuthContext } from './AuthContext';
 
 const NotificationContext = createContext(null);
@@ -9,7 +10,22 @@ export const NotificationProvider = ({ children }) => {
   const [notifications, setNotifications] = useState([]);
   const [notificationsLoading, setNotificationsLoading] = useState(false);
   const [notificationsError, setNotificationsError] = useState(null);
+  const [unreadCount, setUnreadCount] = useState(0);
 
+  /** Unread badge count, without loading the inbox itself */
+  const fetchUnreadCount = useCallback(async () => {
+    if (!isAuthenticated || isGuest) {
+      setUnreadCount(0);
+      return;
+    }
+    try {
+      const response = await apiClient.get('/notifications/unread-count/');
+      setUnreadCount(response.data.unread);
+    } catch (err) {
+      console.error("NotificationContext: Error fetching unread count:", err);
+      if (err.response?.status === 401) handleLogout();
+    }
+  }, [isAuthenticated, isGuest, handleLogout]);
 
   const fetchNotifications = useCallback(async () => {
     if (!isAuthenticated || isGuest) {
@@ -20,7 +36,8 @@ export const NotificationProvider = ({ children }) => {
     setNotificationsLoading(true);
     setNotificationsError(null);
     try {
-      const response = await apiClient.get('/notifications/');
+      // Newest page of the inbox via keyset paging; the badge uses fetchUnreadCount.
+      const response = await apiClient.get('/notifications/', { params: { pagination: 'cursor', count: 'false' } });
       const data = Array.isArray(response.data)
         ? response.data
         : Array.isArray(response.data.results)
@@ -41,13 +58,30 @@ export const NotificationProvider = ({ children }) => {
     if (!isAuthenticated) return;
     setNotifications(prev => prev.map(n => (n.id === id ? { ...n, is_read: true } : n)));
     try {
-      await apiClient.put(`/notifications/${id}/mark_read/`);
+      await apiClient.patch(`/notifications/${id}/read/`);
+      fetchUnreadCount();
     } catch (err) {
       setNotificationsError('Failed to mark notification as read.');
       if (err.response?.status === 401) handleLogout();
       fetchNotifications(); // rollback
     }
-  }, [isAuthenticated, handleLogout, fetchNotifications]);
+  }, [isAuthenticated, handleLogout, fetchNotifications, fetchUnreadCount]);
+
+  /** Mark every notification as read in one request (optimistic) */
+  const markAllNotificationsRead = useCallback(async () => {
+    if (!isAuthenticated) return;
+    setNotifications(prev => prev.map(n => ({ ...n, is_read: true })));
+    setUnreadCount(0);
+    try {
+      await apiClient.post('/notifications/mark-all-read/');
+    } catch (err) {
+      setNotificationsError('Failed to mark notifications as read.');
+      if (err.response?.status === 401) handleLogout();
+      fetchNotifications(); // rollback
+      fetchUnreadCount();
+      throw err;
+    }
+  }, [isAuthenticated, handleLogout, fetchNotifications, fetchUnreadCount]);
 
   /** Delete a single notification (optimistic) */
   const onDeleteNotification = useCallback(async (id) => {
@@ -66,8 +100,22 @@ export const NotificationProvider = ({ children }) => {
   useEffect(() => {
     if (isAuthenticated && !isGuest) {
       fetchNotifications();
+      fetchUnreadCount();
     }
-  }, [isAuthenticated, isGuest, fetchNotifications]);
+  }, [isAuthenticated, isGuest, fetchNotifications, fetchUnreadCount]);
+
+  /** Live updates pushed by the server instead of re-polling */
+  useEffect(() => {
+    if (!isAuthenticated || isGuest) return undefined;
+    return subscribeToEvents((event) => {
+      if (event.type === 'notification.created') {
+        setNotifications(prev => (prev.some(n => n.id === event.data.id) ? prev : [event.data, ...prev]));
+        setUnreadCount(count => count + 1);
+      } else if (event.type === 'notifications.read') {
+        fetchUnreadCount();
+      }
+    });
+  }, [isAuthenticated, isGuest, fetchUnreadCount]);
 
   const contextValue = useMemo(() => ({
     notifications,
@@ -76,7 +124,10 @@ export const NotificationProvider = ({ children }) => {
     notificationsError,
     setNotificationsError,
     fetchNotifications,
+    unreadCount,
+    fetchUnreadCount,
     markNotificationRead,
+    markAllNotificationsRead,
     onDeleteNotification,
   }), [
     notifications,
@@ -84,7 +135,10 @@ export const NotificationProvider = ({ children }) => {
     notificationsLoading,
     notificationsError,
     fetchNotifications,
+    unreadCount,
+    fetchUnreadCount,
     markNotificationRead,
+    markAllNotificationsRead,
     onDeleteNotification
   ]);
 
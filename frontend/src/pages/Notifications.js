@@ -16,7 +16,8 @@ const NotificationsPage = () => {
   const { isGuest } = useAuthContext();
   const {
     notifications, setNotifications, notificationsLoading, notificationsError,
-    setNotificationsError, fetchNotifications, markNotificationRead, onDeleteNotification
+    setNotificationsError, fetchNotifications, unreadCount, markNotificationRead, markAllNotificationsRead,
+    onDeleteNotification
   } = useNotificationContext();
 
   const [showUnreadOnly, setShowUnreadOnly] = useState(false);
@@ -45,14 +46,12 @@ const NotificationsPage = () => {
     }
   }, [notificationsError, notificationsLoading, setNotificationsError]);
 
-  /** Batch: Mark all as read (optimistic) */
+  /** Batch: Mark all as read (optimistic); older pages may hold unread ones, so go by the server's count */
   const handleMarkAllAsRead = async () => {
-    const unreadIds = notifications.filter(n => !n.is_read).map(n => n.id);
-    if (unreadIds.length === 0) return;
+    if (unreadCount === 0) return;
     prevNotificationsRef.current = [...notifications];
-    setNotifications(prev => prev.map(n => ({ ...n, is_read: true })));
     try {
-      await Promise.all(unreadIds.map(id => markNotificationRead(id)));
+      await markAllNotificationsRead();
       toast({ title: 'All notifications marked as read.', status: 'success', duration: 2500, isClosable: true });
     } catch {
       setNotifications(prevNotificationsRef.current);
@@ -88,7 +87,7 @@ const NotificationsPage = () => {
               <Tooltip label="Mark all as read"><Button
                 onClick={handleMarkAllAsRead}
                 colorScheme="green" size="sm"
-                isDisabled={!notifications.some(n => !n.is_read)}
+                isDisabled={unreadCount === 0}
               >Mark All as Read</Button></Tooltip>
               <Tooltip label="Clear all notifications"><Button
                 onClick={handleClearAll}
@@ -0,0 +1,68 @@
+// src/services/events.js
+import { apiClient, getAccessToken } from './api';
+
+const RECONNECT_DELAY_MS = 5000;
+
+/**
+ * Parse one server-sent event block ("event: ...\ndata: ...").
+ * Returns null for comments such as keep-alives.
+ */
+function parseEvent(block) {
+  let type = 'message';
+  const data = [];
+  block.split('\n').forEach((line) => {
+    if (line.startsWith('event: ')) type = line.slice(7);
+    else if (line.startsWith('data: ')) data.push(line.slice(6));
+  });
+  if (data.length === 0) return null;
+  try {
+    return { type, data: JSON.parse(data.join('\n')) };
+  } catch {
+    return null;
+  }
+}
+
+/**
+ * Subscribe to the user's server-pushed events (notification.created,
+ * notifications.read, task.created/updated/deleted, tasks.changed).
+ * Uses fetch rather than EventSource so the bearer token can be sent.
+ * Reconnects after errors, unless the server does not offer event streams;
+ * returns a function that stops the subscription.
+ */
+export function subscribeToEvents(onEvent) {
+  const controller = new AbortController();
+  const url = new URL('events/', apiClient.defaults.baseURL).toString();
+
+  const connect = async () => {
+    while (!controller.signal.aborted) {
+      try {
+        const response = await fetch(url, {
+          headers: { Authorization: `Bearer ${getAccessToken()}`, Accept: 'text/event-stream' },
+          signal: controller.signal,
+        });
+        // 501: the backend runs under WSGI, which does not serve event streams.
+        if (response.status === 501) return;
+        if (!response.ok || !response.body) throw new Error(`Event stream failed: ${response.status}`);
+
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        for (;;) {
+          const { value, done } = await reader.read();
+          if (done) break;
+          buffer += decoder.decode(value, { stream: true });
+          const blocks = buffer.split('\n\n');
+          buffer = blocks.pop();
+          blocks.map(parseEvent).filter(Boolean).forEach(onEvent);
+        }
+      } catch (err) {
+        if (controller.signal.aborted) return;
+        console.warn('Event stream disconnected:', err.message);
+      }
+      await new Promise((resolve) => setTimeout(resolve, RECONNECT_DELAY_MS));
+    }
+  };
+
+  connect();
+  return () => controller.abort();
+}
@@ -42,3 +42,19 @@ export function deleteTaskAPI(taskId) {
 export function patchTaskStatusAPI(taskId, status) {
   return apiClient.patch(`/tasks/${taskId}/`, { status });
 }
+
+/**
+ * Create, update and delete many tasks in one request.
+ * @param {Object} operations - { create: [taskData], update: [{ id, ...fields }], delete: [taskId] }
+ */
+export function bulkTasksAPI(operations) {
+  return apiClient.post('/tasks/bulk/', operations);
+}
+
+/**
+ * Per-day task counts for a date range, computed on the server.
+ * @param {Object} params - { start, end, top } with dates as YYYY-MM-DD; top lists that many tasks per day
+ */
+export function fetchCalendarAPI(params) {
+  return apiClient.get('/tasks/calendar/', { params });
+}
@@ -30,5 +30,15 @@ python manage.py migrate --noinput
 python manage.py collectstatic --noinput
 
 # ---- Start Gunicorn ---- #
-echo "Starting Gunicorn..."
-gunicorn backend.wsgi:application --bind 0.0.0.0:$PORT
+# SERVER_MODE=asgi (default): Uvicorn workers serve the ASGI app, so /api/events/
+# streams and the /api/async/ reads do not tie up a worker each.
+# SERVER_MODE=wsgi: classic sync workers, one request per worker at a time.
+# /api/events/ answers 501 there, as each stream would hold a worker for good;
+# clients then go without live updates.
+if [ "${SERVER_MODE:-asgi}" = "wsgi" ]; then
+  echo "Starting Gunicorn (WSGI)..."
+  gunicorn backend.wsgi:application --bind 0.0.0.0:$PORT
+else
+  echo "Starting Gunicorn (ASGI)..."
+  gunicorn backend.asgi:application --worker-class uvicorn.workers.UvicornWorker --bind 0.0.0.0:$PORT
+fi